@@ -0,0 +1,49 @@
+"""Add keyset pagination indexes
+
+Revision ID: 7807da7d592a
+Revises: 3c1426cc6846
+Create Date: 2026-10-17 09:15:12.408351+00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7807da7d592a'
+down_revision = '3c1426cc6846'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Built concurrently so large tables stay writable during the migration
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_requirements_created_at_id',
+            'requirements',
+            [sa.text('created_at DESC'), sa.text('id DESC')],
+            postgresql_where=sa.text('deleted_at IS NULL'),
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            'ix_requirements_posted_at_id',
+            'requirements',
+            [sa.text('posted_at DESC'), sa.text('id DESC')],
+            postgresql_where=sa.text('is_posted AND deleted_at IS NULL'),
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            'ix_candidates_created_at_id',
+            'candidates',
+            [sa.text('created_at DESC'), sa.text('id DESC')],
+            postgresql_where=sa.text('deleted_at IS NULL'),
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_candidates_created_at_id', table_name='candidates', postgresql_concurrently=True)
+        op.drop_index('ix_requirements_posted_at_id', table_name='requirements', postgresql_concurrently=True)
+        op.drop_index('ix_requirements_created_at_id', table_name='requirements', postgresql_concurrently=True)
@@ -0,0 +1,72 @@
+"""Add full-text and trigram search indexes
+
+Revision ID: 031c065c62f5
+Revises: 7807da7d592a
+Create Date: 2026-10-17 10:40:27.519204+00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '031c065c62f5'
+down_revision = '7807da7d592a'
+branch_labels = None
+depends_on = None
+
+# Must match SearchSpec.document() in app/services/search.py
+REQUIREMENT_DOCUMENT = (
+    "(setweight(to_tsvector('english'::regconfig, coalesce(position_title, '')), 'A')"
+    " || setweight(to_tsvector('english'::regconfig, coalesce(job_description, '')), 'C'))"
+)
+CANDIDATE_DOCUMENT = (
+    "(setweight(to_tsvector('simple'::regconfig, coalesce(first_name, '')), 'A')"
+    " || setweight(to_tsvector('simple'::regconfig, coalesce(last_name, '')), 'A'))"
+)
+
+
+def upgrade() -> None:
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    
+    # Built concurrently so large tables stay writable during the migration
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_requirements_search_document',
+            'requirements',
+            [sa.text(REQUIREMENT_DOCUMENT)],
+            postgresql_using='gin',
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            'ix_requirements_requirement_number_trgm',
+            'requirements',
+            ['requirement_number'],
+            postgresql_using='gin',
+            postgresql_ops={'requirement_number': 'gin_trgm_ops'},
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            'ix_candidates_search_document',
+            'candidates',
+            [sa.text(CANDIDATE_DOCUMENT)],
+            postgresql_using='gin',
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            'ix_candidates_email_trgm',
+            'candidates',
+            ['email'],
+            postgresql_using='gin',
+            postgresql_ops={'email': 'gin_trgm_ops'},
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_candidates_email_trgm', table_name='candidates', postgresql_concurrently=True)
+        op.drop_index('ix_candidates_search_document', table_name='candidates', postgresql_concurrently=True)
+        op.drop_index('ix_requirements_requirement_number_trgm', table_name='requirements', postgresql_concurrently=True)
+        op.drop_index('ix_requirements_search_document', table_name='requirements', postgresql_concurrently=True)
+    # pg_trgm is left installed; other objects may depend on it
@@ -0,0 +1,39 @@
+"""Add number counters for gapless requirement numbers
+
+Revision ID: 73a24e29546c
+Revises: 031c065c62f5
+Create Date: 2026-10-17 11:20:44.172930+00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '73a24e29546c'
+down_revision = '031c065c62f5'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'number_counters',
+        sa.Column('name', sa.String(length=50), nullable=False),
+        sa.Column('last_value', sa.BigInteger(), nullable=False, server_default='0'),
+        sa.PrimaryKeyConstraint('name'),
+    )
+    
+    # Continue after the highest number already handed out, deleted rows included
+    op.execute(
+        """
+        INSERT INTO number_counters (name, last_value)
+        SELECT 'requirement_number',
+               coalesce(max(substring(requirement_number FROM '^REQ-([0-9]+)$')::bigint), 0)
+        FROM requirements
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('number_counters')
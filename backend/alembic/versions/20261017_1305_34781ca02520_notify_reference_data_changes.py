@@ -0,0 +1,45 @@
+"""Notify on reference data changes
+
+Revision ID: 34781ca02520
+Revises: 73a24e29546c
+Create Date: 2026-10-17 13:05:51.336402+00:00
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '34781ca02520'
+down_revision = '73a24e29546c'
+branch_labels = None
+depends_on = None
+
+REFERENCE_TABLES = ('departments', 'job_levels', 'locations')
+
+
+def upgrade() -> None:
+    # Fires once per statement so bulk edits send a single notification
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION notify_reference_data_changed() RETURNS trigger AS $$
+        BEGIN
+            PERFORM pg_notify('reference_data_changed', TG_TABLE_NAME);
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    for table in REFERENCE_TABLES:
+        op.execute(
+            f"""
+            CREATE TRIGGER {table}_notify_changed
+            AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON {table}
+            FOR EACH STATEMENT EXECUTE FUNCTION notify_reference_data_changed()
+            """
+        )
+
+
+def downgrade() -> None:
+    for table in REFERENCE_TABLES:
+        op.execute(f'DROP TRIGGER IF EXISTS {table}_notify_changed ON {table}')
+    op.execute('DROP FUNCTION IF EXISTS notify_reference_data_changed()')
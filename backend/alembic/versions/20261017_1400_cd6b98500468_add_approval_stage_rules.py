@@ -0,0 +1,85 @@
+"""Add approval stage rules for the approval workflow
+
+Revision ID: cd6b98500468
+Revises: 34781ca02520
+Create Date: 2026-10-17 14:00:12.804417+00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'cd6b98500468'
+down_revision = '34781ca02520'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'approval_stage_rules',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('stage', sa.String(length=50), nullable=False),
+        sa.Column('department_id', sa.UUID(), nullable=True),
+        sa.Column('job_level_id', sa.UUID(), nullable=True),
+        sa.Column('currency', sa.String(length=3), nullable=True),
+        sa.Column('salary_from', sa.Numeric(14, 2), nullable=True),
+        sa.Column('approver_role', sa.String(length=50), nullable=False, server_default='approver'),
+        sa.Column('approver_id', sa.UUID(), nullable=True),
+        sa.Column('is_active', sa.Boolean(), nullable=False, server_default=sa.true()),
+        sa.PrimaryKeyConstraint('id'),
+        sa.ForeignKeyConstraint(['department_id'], ['departments.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['job_level_id'], ['job_levels.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['approver_id'], ['users.id'], ondelete='SET NULL'),
+    )
+    
+    # Keep the existing single department head sign-off; further stages are configured per deployment
+    op.execute(
+        """
+        INSERT INTO approval_stage_rules (stage, approver_role) VALUES
+            ('DEPARTMENT_HEAD', 'approver')
+        """
+    )
+    
+    # Workers recompile their cached rules when the table changes
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION notify_approval_rules_changed() RETURNS trigger AS $$
+        BEGIN
+            PERFORM pg_notify('approval_rules_changed', TG_TABLE_NAME);
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER approval_stage_rules_notify_changed
+        AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON approval_stage_rules
+        FOR EACH STATEMENT EXECUTE FUNCTION notify_approval_rules_changed()
+        """
+    )
+    
+    # Approver lookup goes role -> members
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_user_roles_role_id_user_id',
+            'user_roles',
+            ['role_id', 'user_id'],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_user_roles_role_id_user_id',
+            table_name='user_roles',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+    op.execute('DROP TRIGGER IF EXISTS approval_stage_rules_notify_changed ON approval_stage_rules')
+    op.execute('DROP FUNCTION IF EXISTS notify_approval_rules_changed()')
+    op.drop_table('approval_stage_rules')
@@ -0,0 +1,37 @@
+"""Add pending approvals index
+
+Revision ID: 5e0a9c7b31d2
+Revises: cd6b98500468
+Create Date: 2026-10-17 14:45:37.102958+00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5e0a9c7b31d2'
+down_revision = 'cd6b98500468'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Inbox pages and the pending count scan only this approver's pending rows
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_approvals_pending_approver_submitted_at',
+            'approvals',
+            ['approver_id', sa.text('submitted_at DESC'), sa.text('id DESC')],
+            postgresql_where=sa.text("status = 'PENDING'"),
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_approvals_pending_approver_submitted_at',
+            table_name='approvals',
+            postgresql_concurrently=True,
+        )
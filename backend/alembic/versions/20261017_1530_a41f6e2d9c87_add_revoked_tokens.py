@@ -0,0 +1,36 @@
+"""Add revoked tokens
+
+Revision ID: a41f6e2d9c87
+Revises: 5e0a9c7b31d2
+Create Date: 2026-10-17 15:30:04.517283+00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a41f6e2d9c87'
+down_revision = '5e0a9c7b31d2'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Token IDs (jti) and token family IDs that must no longer be accepted;
+    # rows are only needed until the tokens they cover expire
+    op.create_table(
+        'revoked_tokens',
+        sa.Column('token_id', sa.UUID(), nullable=False),
+        sa.Column('expires_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('user_id', sa.UUID(), nullable=True),
+        sa.Column('reason', sa.String(length=20), nullable=False),
+        sa.Column('revoked_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.PrimaryKeyConstraint('token_id'),
+    )
+    op.create_index('ix_revoked_tokens_expires_at', 'revoked_tokens', ['expires_at'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_revoked_tokens_expires_at', table_name='revoked_tokens')
+    op.drop_table('revoked_tokens')
@@ -4,7 +4,7 @@ API v1 router
 from fastapi import APIRouter
 
 # Import route modules
-from app.api.v1.endpoints import auth, requirements, reference_data, candidates, users, approvals, public, postings
+from app.api.v1.endpoints import auth, requirements, reference_data, candidates, users, approvals, public, postings, events
 
 api_router = APIRouter()
 
@@ -17,3 +17,4 @@ api_router.include_router(reference_data.router, tags=["Reference Data"])
 api_router.include_router(candidates.router, tags=["Candidates"])
 api_router.include_router(users.router, tags=["Users"])
 api_router.include_router(public.router, tags=["Public"])
+api_router.include_router(events.router, tags=["Events"])
@@ -2,21 +2,25 @@
 Approval workflow endpoints for requirement approvals
 """
 from datetime import datetime
-from typing import Any, List
+from typing import Any, List, Literal
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy import select, and_
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy import select, and_, exists, func
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.deps import get_current_user, require_role
-from app.core.database import get_db
-from app.models.approval import Approval, ApprovalStatus, ApprovalStage
-from app.models.requirement import Requirement, RequirementStatus
+from app.core.config import settings
+from app.core.deps import get_current_principal, require_role
+from app.core.principal import Principal
+from app.core.database import get_db, get_read_db
+from app.models.approval import Approval, ApprovalStatus
+from app.models.requirement import Requirement
 from app.models.user import User
 from app.schemas.requirement import RequirementResponse
-from pydantic import BaseModel
-from sqlalchemy.orm import selectinload
+from app.services.approval_workflow import WorkflowError, approval_workflow
+from app.utils.pagination import CountMode, fetch_page
+from pydantic import BaseModel, Field
+from sqlalchemy.orm import contains_eager, selectinload
 
 router = APIRouter()
 
@@ -41,6 +45,57 @@ class ApprovalResponse(BaseModel):
         from_attributes = True
 
 
+class BatchApprovalRequest(BaseModel):
+    """Request schema for approving or rejecting many requirements at once"""
+    requirement_ids: List[UUID] = Field(..., min_length=1, max_length=settings.APPROVAL_BATCH_MAX_SIZE)
+    action: Literal["approve", "reject"]
+    comments: str | None = None
+
+
+class BatchApprovalItem(BaseModel):
+    """Outcome for one requirement of a batch"""
+    requirement_id: UUID
+    result: Literal["approved", "rejected", "locked", "not_pending"]
+    next_stage: str | None = None  # Set when approving opened the next stage
+    requirement_status: str | None = None  # Set when the requirement itself changed status
+
+
+class BatchApprovalResponse(BaseModel):
+    """Response schema for a batch approval"""
+    processed: int
+    skipped: int
+    items: List[BatchApprovalItem]
+
+
+class PendingApprovalCount(BaseModel):
+    """Response schema for the pending approvals badge"""
+    count: int
+
+
+class InboxItem(BaseModel):
+    """Slim pending approval row of the approver inbox"""
+    approval_id: UUID
+    approval_stage: str
+    submitted_at: datetime
+    requirement_id: UUID
+    requirement_number: str
+    position_title: str
+    priority: str
+    submitter_name: str | None = None
+    submitter_email: str | None = None
+
+
+class InboxResponse(BaseModel):
+    """Response schema for a page of the approver inbox"""
+    items: List[InboxItem]
+    total: int | None
+    total_is_estimate: bool = False
+    page: int
+    page_size: int
+    total_pages: int | None
+    next_cursor: str | None = None
+
+
 class PendingApprovalItem(BaseModel):
     """Response schema for pending approval with requirement details"""
     approval_id: UUID
@@ -56,23 +111,25 @@ class PendingApprovalItem(BaseModel):
 
 @router.get("/pending", response_model=List[PendingApprovalItem])
 async def get_pending_approvals(
-    db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_principal),
 ) -> Any:
     """
     Get all pending approvals for the current user.
     Returns requirements that need approval from the logged-in user.
     """
-    # Get pending approvals with related requirement data
+    # Get pending approvals of live requirements with related requirement data
     result = await db.execute(
         select(Approval)
+        .join(Requirement, Requirement.id == Approval.requirement_id)
         .options(
-            selectinload(Approval.requirement).selectinload(Requirement.hiring_manager)
+            contains_eager(Approval.requirement).selectinload(Requirement.hiring_manager)
         )
         .where(
             and_(
                 Approval.approver_id == current_user.id,
-                Approval.status == ApprovalStatus.PENDING
+                Approval.status == ApprovalStatus.PENDING,
+                Requirement.deleted_at.is_(None)
             )
         )
         .order_by(Approval.submitted_at.desc())
@@ -82,25 +139,117 @@ async def get_pending_approvals(
     # Transform to response format
     pending_items = []
     for approval in approvals:
-        if approval.requirement and not approval.requirement.deleted_at:
-            hiring_manager = approval.requirement.hiring_manager
-            pending_items.append({
-                "approval_id": approval.id,
-                "approval_stage": approval.approval_stage.value,
-                "submitted_at": approval.submitted_at,
-                "requirement": approval.requirement,
-                "submitter_name": hiring_manager.full_name if hiring_manager else None,
-                "submitter_email": hiring_manager.email if hiring_manager else None
-            })
+        hiring_manager = approval.requirement.hiring_manager
+        pending_items.append({
+            "approval_id": approval.id,
+            "approval_stage": approval.approval_stage.value,
+            "submitted_at": approval.submitted_at,
+            "requirement": approval.requirement,
+            "submitter_name": hiring_manager.full_name if hiring_manager else None,
+            "submitter_email": hiring_manager.email if hiring_manager else None
+        })
     
     return pending_items
 
 
+@router.get("/pending/count", response_model=PendingApprovalCount)
+async def count_pending_approvals(
+    db: AsyncSession = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_principal),
+) -> Any:
+    """
+    Count the current user's pending approvals (navigation badge).
+    
+    The partial pending approvals index finds the user's pending rows;
+    each is checked against its requirement by primary key so approvals
+    of deleted requirements are not counted.
+    """
+    count = await db.scalar(
+        select(func.count())
+        .select_from(Approval)
+        .where(
+            Approval.approver_id == current_user.id,
+            Approval.status == ApprovalStatus.PENDING,
+            exists().where(
+                Requirement.id == Approval.requirement_id,
+                Requirement.deleted_at.is_(None),
+            ),
+        )
+    )
+    return {"count": count}
+
+
+@router.get("/inbox", response_model=InboxResponse)
+async def get_approval_inbox(
+    skip: int = Query(0, ge=0),
+    limit: int = Query(50, ge=1, le=100),
+    cursor: str | None = Query(None, description="Cursor from a previous page (keyset pagination)"),
+    count: CountMode = Query(CountMode.EXACT, description="Total count: exact, estimate or none"),
+    db: AsyncSession = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_principal),
+) -> Any:
+    """
+    Get a page of the current user's pending approvals, newest first.
+    
+    Returns only the columns the inbox list shows; open the requirement
+    for its details. Pass the returned next_cursor as cursor to page by
+    keyset instead of skip/limit.
+    """
+    query = (
+        select(
+            Approval.id,
+            Approval.approval_stage,
+            Approval.submitted_at,
+            Requirement.id.label("requirement_id"),
+            Requirement.requirement_number,
+            Requirement.position_title,
+            Requirement.priority,
+            User.first_name,
+            User.last_name,
+            User.email,
+        )
+        .join(Requirement, Requirement.id == Approval.requirement_id)
+        .outerjoin(User, User.id == Requirement.hiring_manager_id)
+        .where(
+            Approval.approver_id == current_user.id,
+            Approval.status == ApprovalStatus.PENDING,
+            Requirement.deleted_at.is_(None),
+        )
+    )
+    
+    page = await fetch_page(
+        db,
+        query,
+        sort_column=Approval.submitted_at,
+        id_column=Approval.id,
+        limit=limit,
+        skip=skip,
+        cursor=cursor,
+        count=count,
+    )
+    page.items = [
+        {
+            "approval_id": row.id,
+            "approval_stage": row.approval_stage.value,
+            "submitted_at": row.submitted_at,
+            "requirement_id": row.requirement_id,
+            "requirement_number": row.requirement_number,
+            "position_title": row.position_title,
+            "priority": row.priority,
+            "submitter_name": f"{row.first_name} {row.last_name}" if row.email else None,
+            "submitter_email": row.email,
+        }
+        for row in page.items
+    ]
+    
+    return page.to_response(skip, limit)
+
+
 @router.get("/{requirement_id}/approvals", response_model=List[ApprovalResponse])
 async def get_requirement_approvals(
     requirement_id: UUID,
-    db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_principal),
 ) -> Any:
     """Get all approvals for a requirement"""
     result = await db.execute(
@@ -117,53 +266,29 @@ async def approve_requirement(
     requirement_id: UUID,
     action: ApprovalActionRequest,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(require_role("approver")),
+    current_user: Principal = Depends(require_role("approver")),
 ) -> Any:
     """Approve a requirement at current stage"""
-    # Find pending approval for this user
-    result = await db.execute(
-        select(Approval).where(
-            and_(
-                Approval.requirement_id == requirement_id,
-                Approval.approver_id == current_user.id,
-                Approval.status == ApprovalStatus.PENDING
-            )
+    # Decide this user's pending stage; the next one opens or the requirement is approved
+    try:
+        decisions = await approval_workflow.decide(
+            db, [requirement_id], current_user.id, approve=True, comments=action.comments
+        )
+    except WorkflowError as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=str(e)
         )
-    )
-    approval = result.scalar_one_or_none()
     
-    if not approval:
+    if not decisions:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="No pending approval found for this user"
         )
     
-    # Update approval
-    approval.status = ApprovalStatus.APPROVED
-    approval.reviewed_at = datetime.utcnow()
-    approval.comments = action.comments
-    
-    # Check if all approvals are complete
-    all_approvals_result = await db.execute(
-        select(Approval).where(Approval.requirement_id == requirement_id)
-    )
-    all_approvals = all_approvals_result.scalars().all()
-    
-    all_approved = all(a.status == ApprovalStatus.APPROVED or a.id == approval.id for a in all_approvals)
-    
-    # Update requirement status if all approved
-    if all_approved:
-        req_result = await db.execute(
-            select(Requirement).where(Requirement.id == requirement_id)
-        )
-        requirement = req_result.scalar_one()
-        requirement.status = RequirementStatus.APPROVED
-        requirement.approved_at = datetime.utcnow()
-    
     await db.commit()
-    await db.refresh(approval)
     
-    return approval
+    return decisions[requirement_id].approval
 
 
 @router.post("/{requirement_id}/reject", response_model=ApprovalResponse)
@@ -171,40 +296,102 @@ async def reject_requirement(
     requirement_id: UUID,
     action: ApprovalActionRequest,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(require_role("approver")),
+    current_user: Principal = Depends(require_role("approver")),
 ) -> Any:
     """Reject a requirement at current stage"""
-    # Find pending approval for this user
-    result = await db.execute(
-        select(Approval).where(
-            and_(
-                Approval.requirement_id == requirement_id,
-                Approval.approver_id == current_user.id,
-                Approval.status == ApprovalStatus.PENDING
-            )
-        )
+    decisions = await approval_workflow.decide(
+        db, [requirement_id], current_user.id, approve=False, comments=action.comments
     )
-    approval = result.scalar_one_or_none()
     
-    if not approval:
+    if not decisions:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="No pending approval found for this user"
         )
     
-    # Update approval
-    approval.status = ApprovalStatus.REJECTED
-    approval.reviewed_at = datetime.utcnow()
-    approval.comments = action.comments
+    await db.commit()
     
-    # Update requirement status
-    req_result = await db.execute(
-        select(Requirement).where(Requirement.id == requirement_id)
-    )
-    requirement = req_result.scalar_one()
-    requirement.status = RequirementStatus.REJECTED
+    return decisions[requirement_id].approval
+
+
+@router.post("/batch", response_model=BatchApprovalResponse)
+async def batch_approve_requirements(
+    batch: BatchApprovalRequest,
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(require_role("approver")),
+) -> Any:
+    """
+    Approve or reject many requirements in one transaction
+    
+    The current user's pending approvals for the requirements are locked
+    with SKIP LOCKED, so requirements another request is deciding right
+    now come back as 'locked' instead of waiting. Requirements without a
+    pending approval for this user come back as 'not_pending'. Each
+    locked approval then goes through the approval workflow, opening the
+    next configured stage or finishing the requirement.
+    """
+    requirement_ids = list(dict.fromkeys(batch.requirement_ids))
+    
+    # Lock this approver's pending approvals in one statement
+    locked = (await db.execute(
+        select(Approval.id, Approval.requirement_id)
+        .where(
+            Approval.requirement_id.in_(requirement_ids),
+            Approval.approver_id == current_user.id,
+            Approval.status == ApprovalStatus.PENDING,
+        )
+        .with_for_update(skip_locked=True)
+    )).all()
+    locked_requirements = {row.requirement_id for row in locked}
+    
+    # Tell requirements held by another transaction from those with nothing pending
+    busy: set[UUID] = set()
+    unlocked = [rid for rid in requirement_ids if rid not in locked_requirements]
+    if unlocked:
+        busy = set(await db.scalars(
+            select(Approval.requirement_id).where(
+                Approval.requirement_id.in_(unlocked),
+                Approval.approver_id == current_user.id,
+                Approval.status == ApprovalStatus.PENDING,
+            )
+        ))
+    
+    decisions = {}
+    if locked_requirements:
+        try:
+            decisions = await approval_workflow.decide(
+                db,
+                list(locked_requirements),
+                current_user.id,
+                approve=batch.action == "approve",
+                comments=batch.comments,
+            )
+        except WorkflowError as e:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=str(e)
+            )
     
     await db.commit()
-    await db.refresh(approval)
     
-    return approval
+    decided = "approved" if batch.action == "approve" else "rejected"
+    items = []
+    for rid in requirement_ids:
+        decision = decisions.get(rid)
+        if decision:
+            items.append(BatchApprovalItem(
+                requirement_id=rid,
+                result=decided,
+                next_stage=decision.next_stage.value if decision.next_stage else None,
+                requirement_status=decision.requirement_status.value if decision.requirement_status else None,
+            ))
+        else:
+            items.append(BatchApprovalItem(
+                requirement_id=rid, result="locked" if rid in busy else "not_pending"
+            ))
+    
+    return BatchApprovalResponse(
+        processed=len(decisions),
+        skipped=len(requirement_ids) - len(decisions),
+        items=items,
+    )
@@ -1,6 +1,6 @@
 """Authentication API endpoints."""
 import logging
-from datetime import timedelta
+from datetime import datetime, timedelta, timezone
 from typing import Any
 
 from fastapi import APIRouter, Depends, HTTPException, status
@@ -10,7 +10,17 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.core import security
 from app.core.config import settings
 from app.core.database import get_db
-from app.core.deps import get_current_user
+from app.core.deps import get_current_principal, get_current_user, get_token_payload
+from app.core.principal import Principal
+from app.core.revocation import (
+    REASON_LOGOUT,
+    REASON_REUSED,
+    REASON_ROTATED,
+    family_expires_at,
+    revoke,
+    rotated_within,
+    token_denylist,
+)
 from app.models.user import User
 from app.services.user_service import UserService
 from app.schemas.user import UserCreate, UserResponse
@@ -81,18 +91,23 @@ async def login(
     # Update last login
     await user_service.update_last_login(user.id)
     
+    # Both tokens belong to a new family, so logout can revoke the session
+    family = security.new_token_id()
+    
     # Create access token
     access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = security.create_access_token(
         subject=str(user.id),
-        expires_delta=access_token_expires
+        expires_delta=access_token_expires,
+        family=family
     )
     
     # Create refresh token
     refresh_token_expires = timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
     refresh_token = security.create_refresh_token(
         subject=str(user.id),
-        expires_delta=refresh_token_expires
+        expires_delta=refresh_token_expires,
+        family=family
     )
     
     logger.info(f"Successful login for user: {form_data.username} (ID: {user.id}, Roles: {[r.name for r in user.roles]})")
@@ -109,17 +124,33 @@ async def refresh_token(
     token_data: TokenRefresh,
     db: AsyncSession = Depends(get_db)
 ) -> Any:
-    """Refresh access token using refresh token."""
+    """
+    Exchange a refresh token for new access and refresh tokens.
+    
+    Each refresh token works once. Presenting one that was already
+    exchanged means it was copied, so its whole family (the login
+    session) is revoked and the user must sign in again. Within
+    REFRESH_TOKEN_REUSE_GRACE_SECONDS of the exchange a repeat is taken
+    for a client refreshing from concurrent requests and only rejected.
+    """
     try:
         payload = security.decode_token(token_data.refresh_token)
         user_id = payload.get("sub")
+        token_id = payload.get("jti")
+        family = payload.get("fam")
         
-        if not user_id:
+        if not user_id or payload.get("type") != "refresh" or not token_id or not family:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Invalid refresh token"
             )
         
+        if token_denylist.is_revoked(family):
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Refresh token has been revoked"
+            )
+        
         # Verify user exists and is active
         user_service = UserService(db)
         user = await user_service.get(user_id)
@@ -130,20 +161,40 @@ async def refresh_token(
                 detail="User not found or inactive"
             )
         
+        # Rotate: the first exchange of a token wins, any later one is reuse
+        expires_at = datetime.fromtimestamp(payload["exp"], timezone.utc)
+        if not await revoke(db, token_id, expires_at, REASON_ROTATED, user.id):
+            if await rotated_within(db, token_id, settings.REFRESH_TOKEN_REUSE_GRACE_SECONDS):
+                raise HTTPException(
+                    status_code=status.HTTP_401_UNAUTHORIZED,
+                    detail="Refresh token was already exchanged"
+                )
+            await revoke(db, family, family_expires_at(), REASON_REUSED, user.id)
+            await db.commit()
+            logger.warning(f"Refresh token reuse detected for user {user.id}; session revoked")
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Refresh token reuse detected. Please sign in again."
+            )
+        
         # Create new access token
         access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
         access_token = security.create_access_token(
             subject=str(user.id),
-            expires_delta=access_token_expires
+            expires_delta=access_token_expires,
+            family=family
         )
         
         # Create new refresh token
         refresh_token_expires = timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
         new_refresh_token = security.create_refresh_token(
             subject=str(user.id),
-            expires_delta=refresh_token_expires
+            expires_delta=refresh_token_expires,
+            family=family
         )
         
+        await db.commit()
+        
         return {
             "access_token": access_token,
             "refresh_token": new_refresh_token,
@@ -169,7 +220,17 @@ async def get_current_user_info(
 
 @router.post("/logout")
 async def logout(
-    current_user: User = Depends(get_current_user)
+    payload: dict[str, Any] = Depends(get_token_payload),
+    current_user: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_db)
 ) -> Any:
-    """Logout current user (client should discard tokens)."""
+    """Logout current user, revoking this access token and its login session's refresh tokens."""
+    family = payload.get("fam")
+    if family:
+        await revoke(db, family, family_expires_at(), REASON_LOGOUT, current_user.id)
+    if payload.get("jti"):
+        expires_at = datetime.fromtimestamp(payload["exp"], timezone.utc)
+        await revoke(db, payload["jti"], expires_at, REASON_LOGOUT, current_user.id)
+    await db.commit()
+    
     return {"message": "Successfully logged out"}
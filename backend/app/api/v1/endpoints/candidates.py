@@ -2,20 +2,32 @@
 from typing import Any
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlalchemy import select, func, or_
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from sqlalchemy import Select, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.database import get_db
-from app.core.deps import get_current_user
-from app.models.user import User
+from app.core.database import get_db, get_read_db, reads_pinned_to_primary, replica_router
+from app.core.deps import get_current_principal, require_role
+from app.core.events import Event, event, publish
+from app.core.principal import Principal
 from app.models.candidate import Candidate
 from app.schemas.candidate import (
     CandidateCreate,
     CandidateUpdate,
     CandidateResponse,
     CandidateListResponse,
+    CandidateImportResponse,
 )
+from app.services.candidate_import import (
+    CandidateImportError,
+    CandidateImportService,
+    ImportFormat,
+    detect_format,
+)
+from app.services.search import CANDIDATE_SEARCH, apply_search
+from app.services.skill_matching import skill_index
+from app.utils.export import ExportFormat, export_response
+from app.utils.pagination import CountMode, apply_keyset, fetch_page
 
 # Constants
 CANDIDATE_NOT_FOUND = CANDIDATE_NOT_FOUND
@@ -23,76 +35,178 @@ CANDIDATE_NOT_FOUND = CANDIDATE_NOT_FOUND
 router = APIRouter(prefix="/candidates", tags=["candidates"])
 
 
+def filter_candidates(
+    status: str | None,
+    requirement_id: str | None,
+    search: str | None,
+) -> tuple[Select, Any]:
+    """Build the candidate query shared by the list and export endpoints"""
+    query = select(Candidate).where(Candidate.deleted_at.is_(None))
+    rank = None
+    
+    if status:
+        query = query.where(Candidate.status == status)
+    
+    if requirement_id:
+        query = query.where(Candidate.requirement_id == UUID(requirement_id))
+    
+    if search:
+        query, rank = apply_search(query, CANDIDATE_SEARCH, search)
+    
+    return query, rank
+
+
+def candidate_event(
+    event_type: str, candidate: Candidate, changed: list[str] | None = None
+) -> Event:
+    """Describe a candidate change for recruiters and hiring managers"""
+    data = {
+        "candidate_id": candidate.id,
+        "requirement_id": candidate.requirement_id,
+        "status": candidate.status,
+    }
+    if changed is not None:
+        data["changed"] = changed
+    return event(event_type, data, roles=("recruiter", "hiring_manager"))
+
+
+async def announce_import(db: AsyncSession, imported: int) -> None:
+    """Publish one event for a bulk import; workers reload their skill index"""
+    if imported:
+        await publish(db, [event(
+            "candidates.imported", {"imported": imported}, roles=("recruiter", "hiring_manager")
+        )])
+        await db.commit()
+
+
 @router.get("", response_model=CandidateListResponse)
 async def list_candidates(
     skip: int = Query(0, ge=0),
     limit: int = Query(50, ge=1, le=100),
+    cursor: str | None = Query(None, description="Cursor from a previous page (keyset pagination)"),
+    count: CountMode = Query(CountMode.EXACT, description="Total count: exact, estimate or none"),
     status: str | None = None,
     requirement_id: str | None = None,
     search: str | None = None,
-    db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_principal),
 ) -> Any:
-    """Get list of candidates with pagination and filters."""
-    query = select(Candidate).where(Candidate.deleted_at.is_(None))
+    """
+    Get list of candidates with pagination and filters.
     
-    # Apply filters
-    if status:
-        query = query.where(Candidate.status == status)
+    Pass the returned next_cursor as cursor to page by keyset instead of
+    skip/limit; skip is ignored when a cursor is given. count=estimate
+    returns the planner's row estimate instead of counting every match.
     
-    if requirement_id:
-        query = query.where(Candidate.requirement_id == UUID(requirement_id))
+    search matches first and last names by word prefix, or any part of
+    the email address; results are ranked by relevance.
+    """
+    query, rank = filter_candidates(status, requirement_id, search)
     
-    if search:
-        query = query.where(
-            or_(
-                Candidate.first_name.ilike(f"%{search}%"),
-                Candidate.last_name.ilike(f"%{search}%"),
-                Candidate.email.ilike(f"%{search}%")
-            )
-        )
+    # Get paginated results with their total
+    page = await fetch_page(
+        db,
+        query,
+        sort_column=Candidate.created_at,
+        id_column=Candidate.id,
+        limit=limit,
+        skip=skip,
+        cursor=cursor,
+        count=count,
+        estimate_table=None if status or requirement_id or search else "candidates",
+        rank=rank,
+    )
+    
+    return page.to_response(skip, limit)
+
+
+@router.get("/export")
+async def export_candidates(
+    request: Request,
+    export_format: ExportFormat = Query(
+        ExportFormat.CSV, alias="format", description="csv or ndjson"
+    ),
+    status: str | None = None,
+    requirement_id: str | None = None,
+    search: str | None = None,
+    current_user: Principal = Depends(get_current_principal),
+) -> Any:
+    """
+    Export every candidate matching the list filters as CSV or NDJSON.
     
-    # Get total count
-    count_query = select(func.count()).select_from(query.subquery())
-    total_result = await db.execute(count_query)
-    total = total_result.scalar_one()
+    Rows are streamed newest first from a server-side cursor; list
+    columns are semicolon-separated in CSV, so exports re-import as is.
+    """
+    query, _ = filter_candidates(status, requirement_id, search)
+    query = apply_keyset(query, Candidate.created_at, Candidate.id, None)
     
-    # Get paginated results
-    query = query.order_by(Candidate.created_at.desc())
-    query = query.offset(skip).limit(limit)
-    result = await db.execute(query)
-    candidates = result.scalars().all()
-    
-    return {
-        "items": candidates,
-        "total": total,
-        "page": skip // limit + 1,
-        "page_size": limit,
-        "total_pages": (total + limit - 1) // limit,
-    }
+    session_maker = await replica_router.session_maker(reads_pinned_to_primary(request))
+    
+    return export_response(session_maker, query, CandidateResponse, export_format, "candidates")
 
 
 @router.post("", response_model=CandidateResponse, status_code=status.HTTP_201_CREATED)
 async def create_candidate(
     candidate_in: CandidateCreate,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
 ) -> Any:
     """Create new candidate."""
     candidate = Candidate(**candidate_in.model_dump())
     
     db.add(candidate)
+    await db.flush()
+    await publish(db, [candidate_event("candidate.created", candidate)])
     await db.commit()
-    await db.refresh(candidate)
+    skill_index.update(candidate.id, candidate.skills)
     
     return candidate
 
 
+@router.post("/bulk", response_model=CandidateImportResponse)
+async def import_candidates(
+    request: Request,
+    import_format: ImportFormat | None = Query(
+        None, alias="format", description="csv or jsonl; defaults to the request Content-Type"
+    ),
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(require_role("recruiter")),
+) -> Any:
+    """
+    Import candidates from a CSV or JSONL request body. Requires 'recruiter' role.
+    
+    Send the file as the raw body (text/csv or application/x-ndjson). CSV
+    needs a header row naming CandidateCreate fields; list columns such as
+    skills are semicolon-separated, or a JSON object as exports write it.
+    The upload is streamed and imported in committed chunks; invalid rows
+    are skipped and reported by row number.
+    """
+    import_format = import_format or detect_format(request.headers.get("content-type"))
+    if not import_format:
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail="Upload must be CSV (text/csv) or JSONL (application/x-ndjson)"
+        )
+    
+    service = CandidateImportService(db)
+    try:
+        report = await service.run(request.stream(), import_format)
+    except CandidateImportError as e:
+        await announce_import(db, service.report.imported)
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"{e} ({service.report.imported} rows imported before the error)"
+        )
+    
+    await announce_import(db, report.imported)
+    return report
+
+
 @router.get("/{candidate_id}", response_model=CandidateResponse)
 async def get_candidate(
     candidate_id: UUID,
-    db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_principal),
 ) -> Any:
     """Get candidate by ID."""
     query = select(Candidate).where(
@@ -116,7 +230,7 @@ async def update_candidate(
     candidate_id: UUID,
     candidate_in: CandidateUpdate,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
 ) -> Any:
     """Update candidate."""
     query = select(Candidate).where(
@@ -137,8 +251,10 @@ async def update_candidate(
     for field, value in update_data.items():
         setattr(candidate, field, value)
     
+    await publish(db, [candidate_event("candidate.updated", candidate, list(update_data))])
     await db.commit()
-    await db.refresh(candidate)
+    if "skills" in update_data:
+        skill_index.update(candidate.id, candidate.skills)
     
     return candidate
 
@@ -147,7 +263,7 @@ async def update_candidate(
 async def delete_candidate(
     candidate_id: UUID,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
 ) -> None:
     """Delete candidate (soft delete)."""
     query = select(Candidate).where(
@@ -167,4 +283,6 @@ async def delete_candidate(
     from datetime import datetime, timezone
     candidate.deleted_at = datetime.now(timezone.utc)
     
+    await publish(db, [candidate_event("candidate.deleted", candidate)])
     await db.commit()
+    skill_index.remove(candidate.id)
@@ -0,0 +1,62 @@
+"""
+Live event stream endpoints
+"""
+import asyncio
+import time
+from collections.abc import AsyncIterable
+from typing import Any
+
+from fastapi import APIRouter, Depends
+from fastapi.sse import EventSourceResponse, ServerSentEvent
+
+from app.core.deps import get_current_principal, get_token_payload
+from app.core.events import event_hub
+from app.core.principal import Principal
+from app.core.revocation import token_denylist
+
+router = APIRouter(prefix="/events", tags=["events"])
+
+# Client reconnect delay after a dropped stream, in milliseconds
+RECONNECT_DELAY_MS = 3000
+
+# How often an idle stream re-checks its token against the denylist, in seconds
+REVOCATION_CHECK_SECONDS = 5
+
+
+@router.get("/stream", response_class=EventSourceResponse)
+async def stream_events(
+    current_user: Principal = Depends(get_current_principal),
+    token: dict[str, Any] = Depends(get_token_payload),
+) -> AsyncIterable[ServerSentEvent]:
+    """
+    Stream approval, posting and candidate changes as Server-Sent Events.
+    
+    Each event is named after the change (e.g. requirement.approved,
+    candidate.updated) and carries the IDs and new state, filtered to
+    what the current user's roles may see. A 'resync' event means events
+    may have been missed; refetch the affected lists. Keep-alive comments
+    are sent while idle.
+    
+    The stream ends when the access token expires or is revoked (logout,
+    refresh token reuse); the client reconnects with its current token.
+    """
+    expires_at = float(token["exp"])
+    token_ids = (token.get("jti"), token.get("fam"))
+    subscription = event_hub.subscribe(current_user)
+    try:
+        yield ServerSentEvent(event="ready", data={"user_id": str(current_user.id)}, retry=RECONNECT_DELAY_MS)
+        while True:
+            item = None
+            remaining = expires_at - time.time()
+            if remaining > 0:
+                try:
+                    item = await asyncio.wait_for(subscription.get(), min(remaining, REVOCATION_CHECK_SECONDS))
+                except asyncio.TimeoutError:
+                    pass
+            # Checked after the wait too, so nothing is sent once the token is dead
+            if time.time() >= expires_at or token_denylist.is_revoked(*token_ids):
+                return
+            if item is not None:
+                yield ServerSentEvent(event=item.type, data=item.data)
+    finally:
+        event_hub.unsubscribe(subscription)
@@ -4,18 +4,25 @@ from typing import Any, List
 from uuid import UUID
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlalchemy import select, func, or_
+from sqlalchemy import select, func
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.database import get_db
-from app.core.deps import get_current_user, require_role
-from app.models.user import User
+from app.core.database import get_db, get_read_db
+from app.core.deps import get_current_principal, require_role
+from app.core.principal import Principal
 from app.models.requirement import Requirement, RequirementStatus, PostingStatus
 from app.schemas.requirement import (
     RequirementResponse,
     RequirementListResponse,
     UpdatePostingRequest,
 )
+from app.services.posting_service import (
+    invalidate_posting_caches,
+    load_posting_stats,
+    notify_posting_changed,
+)
+from app.services.search import REQUIREMENT_SEARCH, apply_search
+from app.utils.pagination import CountMode, fetch_page
 
 router = APIRouter(prefix="/postings", tags=["postings"])
 
@@ -24,23 +31,33 @@ router = APIRouter(prefix="/postings", tags=["postings"])
 async def list_postings(
     skip: int = Query(0, ge=0),
     limit: int = Query(50, ge=1, le=100),
+    cursor: str | None = Query(None, description="Cursor from a previous page (keyset pagination)"),
+    count: CountMode = Query(CountMode.EXACT, description="Total count: exact, estimate or none"),
     posting_status: str | None = None,
     department: str | None = None,
     channel: str | None = None,
     search: str | None = None,
-    db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_principal),
 ) -> Any:
     """
     Get list of all job postings.
     Only returns requirements that have been posted (is_posted = True).
     Accessible to all authenticated users.
+    
+    Pass the returned next_cursor as cursor to page by keyset instead of
+    skip/limit; skip is ignored when a cursor is given. count=estimate
+    returns the planner's row estimate instead of counting every match.
+    
+    search matches words of the title and description by prefix, or any
+    part of the requirement number; results are ranked by relevance.
     """
     # Base query - only posted requirements
     query = select(Requirement).where(
         Requirement.deleted_at.is_(None),
         Requirement.is_posted == True  # noqa: E712
     )
+    rank = None
     
     # Apply filters
     if posting_status:
@@ -56,97 +73,30 @@ async def list_postings(
         )
     
     if search:
-        query = query.where(
-            or_(
-                Requirement.position_title.ilike(f"%{search}%"),
-                Requirement.requirement_number.ilike(f"%{search}%"),
-                Requirement.job_description.ilike(f"%{search}%")
-            )
-        )
+        query, rank = apply_search(query, REQUIREMENT_SEARCH, search)
+    
+    # Get paginated results with their total, ordered by posted date (newest first)
+    page = await fetch_page(
+        db,
+        query,
+        sort_column=Requirement.posted_at,
+        id_column=Requirement.id,
+        limit=limit,
+        skip=skip,
+        cursor=cursor,
+        count=count,
+        rank=rank,
+    )
     
-    # Get total count
-    count_query = select(func.count()).select_from(query.subquery())
-    total_result = await db.execute(count_query)
-    total = total_result.scalar_one()
-    
-    # Get paginated results, ordered by posted date (newest first)
-    query = query.offset(skip).limit(limit).order_by(Requirement.posted_at.desc())
-    result = await db.execute(query)
-    requirements = result.scalars().all()
-    
-    return {
-        "items": requirements,
-        "total": total,
-        "page": skip // limit + 1,
-        "page_size": limit,
-        "total_pages": (total + limit - 1) // limit,
-    }
+    return page.to_response(skip, limit)
 
 
 @router.get("/stats")
 async def get_posting_stats(
-    db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
 ) -> Any:
     """Get statistics about job postings."""
-    
-    # Count by posting status
-    active_count = await db.scalar(
-        select(func.count())
-        .select_from(Requirement)
-        .where(
-            Requirement.deleted_at.is_(None),
-            Requirement.is_posted == True,  # noqa: E712
-            Requirement.posting_status == PostingStatus.ACTIVE
-        )
-    )
-    
-    paused_count = await db.scalar(
-        select(func.count())
-        .select_from(Requirement)
-        .where(
-            Requirement.deleted_at.is_(None),
-            Requirement.is_posted == True,  # noqa: E712
-            Requirement.posting_status == PostingStatus.PAUSED
-        )
-    )
-    
-    closed_count = await db.scalar(
-        select(func.count())
-        .select_from(Requirement)
-        .where(
-            Requirement.deleted_at.is_(None),
-            Requirement.is_posted == True,  # noqa: E712
-            Requirement.posting_status == PostingStatus.CLOSED
-        )
-    )
-    
-    draft_count = await db.scalar(
-        select(func.count())
-        .select_from(Requirement)
-        .where(
-            Requirement.deleted_at.is_(None),
-            Requirement.is_posted == True,  # noqa: E712
-            Requirement.posting_status == PostingStatus.DRAFT
-        )
-    )
-    
-    total_posted = await db.scalar(
-        select(func.count())
-        .select_from(Requirement)
-        .where(
-            Requirement.deleted_at.is_(None),
-            Requirement.is_posted == True  # noqa: E712
-        )
-    )
-    
-    return {
-        "total_posted": total_posted or 0,
-        "active": active_count or 0,
-        "paused": paused_count or 0,
-        "closed": closed_count or 0,
-        "draft": draft_count or 0,
-    }
+    return await load_posting_stats()
 
 
 @router.put("/{requirement_id}/status", response_model=RequirementResponse)
@@ -154,7 +104,7 @@ async def update_posting_status(
     requirement_id: UUID,
     update_data: UpdatePostingRequest,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
 ) -> Any:
     """
     Update posting status (pause, reactivate, close).
@@ -182,7 +132,7 @@ async def update_posting_status(
         )
     
     # Check permissions: must be assigned recruiter or admin
-    is_admin = any(role.name == "admin" for role in current_user.roles)
+    is_admin = current_user.has_role("admin")
     is_assigned_recruiter = requirement.recruiter_id == current_user.id
     
     if not (is_admin or is_assigned_recruiter):
@@ -199,25 +149,26 @@ async def update_posting_status(
     if update_data.channels is not None:
         requirement.posting_channels = update_data.channels
     
+    # Edit a copy of the details; reassigning it is what marks the JSON
+    # column dirty (in-place changes would not be written)
+    posting_details = dict(requirement.posting_details or {})
+    
     # Update benefits if provided
     if update_data.benefits is not None:
-        if requirement.posting_details is None:
-            requirement.posting_details = {}
-        requirement.posting_details["benefits"] = update_data.benefits
+        posting_details["benefits"] = update_data.benefits
     
     # Update custom description if provided
     if update_data.custom_description is not None:
-        if requirement.posting_details is None:
-            requirement.posting_details = {}
-        requirement.posting_details["custom_description"] = update_data.custom_description
+        posting_details["custom_description"] = update_data.custom_description
     
     # Update application instructions if provided
     if update_data.application_instructions is not None:
-        if requirement.posting_details is None:
-            requirement.posting_details = {}
-        requirement.posting_details["application_instructions"] = update_data.application_instructions
+        posting_details["application_instructions"] = update_data.application_instructions
+    
+    requirement.posting_details = posting_details
     
+    await notify_posting_changed(db)
     await db.commit()
-    await db.refresh(requirement)
+    invalidate_posting_caches()
     
     return requirement
@@ -1,56 +1,61 @@
 """
 Reference Data API endpoints for departments, job levels, and locations
 """
-from typing import List
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
 
-from app.core.database import async_session_maker
-from app.models.organization import Department, JobLevel, Location
+from app.core.config import settings
+from app.core.database import get_db
+from app.core.deps import require_role
+from app.core.pg_notify import notify
+from app.core.principal import Principal
+from app.services.careers_snapshot import snapshot_response
+from app.services.reference_data import (
+    DEPARTMENTS,
+    JOB_LEVELS,
+    LOCATIONS,
+    REFERENCE_DATA_CHANNEL,
+    reference_data_cache,
+)
 
 router = APIRouter(prefix="/reference-data")
 
 
-async def get_db() -> AsyncSession:
-    async with async_session_maker() as session:
-        yield session
+async def _cached_response(request: Request, name: str) -> Response:
+    """Serve a cached reference list, revalidated by ETag"""
+    entry = await reference_data_cache.get(name)
+    return snapshot_response(request, entry, max_age=settings.REFERENCE_DATA_MAX_AGE_SECONDS)
 
 
 @router.get("/departments")
-async def list_departments(db: AsyncSession = Depends(get_db)):
+async def list_departments(request: Request):
     """Get all active departments"""
-    result = await db.execute(
-        select(Department).where(Department.is_active == True).order_by(Department.name)
-    )
-    departments = result.scalars().all()
-    return [
-        {"id": str(dept.id), "name": dept.name, "code": dept.code}
-        for dept in departments
-    ]
+    return await _cached_response(request, DEPARTMENTS)
 
 
 @router.get("/job-levels")
-async def list_job_levels(db: AsyncSession = Depends(get_db)):
+async def list_job_levels(request: Request):
     """Get all active job levels"""
-    result = await db.execute(
-        select(JobLevel).where(JobLevel.is_active == True).order_by(JobLevel.level_order)
-    )
-    levels = result.scalars().all()
-    return [
-        {"id": str(level.id), "name": level.name, "code": level.code, "level_order": level.level_order}
-        for level in levels
-    ]
+    return await _cached_response(request, JOB_LEVELS)
 
 
 @router.get("/locations")
-async def list_locations(db: AsyncSession = Depends(get_db)):
+async def list_locations(request: Request):
     """Get all active locations"""
-    result = await db.execute(
-        select(Location).where(Location.is_active == True).order_by(Location.country, Location.city)
-    )
-    locations = result.scalars().all()
-    return [
-        {"id": str(loc.id), "name": loc.name, "city": loc.city, "country": loc.country}
-        for loc in locations
-    ]
+    return await _cached_response(request, LOCATIONS)
+
+
+@router.post("/refresh", status_code=status.HTTP_204_NO_CONTENT)
+async def refresh_reference_data(
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(require_role("admin")),
+) -> None:
+    """
+    Reload reference data on every worker. Requires 'admin' role.
+    
+    Table changes already trigger a reload; use this after restoring
+    data with triggers disabled.
+    """
+    await notify(db, REFERENCE_DATA_CHANNEL, "refresh")
+    await db.commit()
+    reference_data_cache.invalidate()
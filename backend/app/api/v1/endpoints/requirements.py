@@ -3,16 +3,17 @@ from datetime import datetime, timezone
 from typing import Any, List
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlalchemy import select, func
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from sqlalchemy import Select, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.database import get_db
-from app.core.deps import get_current_user, require_role
+from app.core.database import get_db, get_read_db, reads_pinned_to_primary, replica_router
+from app.core.deps import get_current_principal, require_role
+from app.core.events import event, publish
+from app.core.principal import Principal
 from app.models.user import User
-from app.models.role import Role
+from app.models.candidate import Candidate
 from app.models.requirement import Requirement, RequirementStatus, PostingStatus
-from app.models.approval import Approval, ApprovalStatus, ApprovalStage
 from app.schemas.requirement import (
     RequirementCreate,
     RequirementUpdate,
@@ -21,8 +22,22 @@ from app.schemas.requirement import (
     PostJobRequest,
     UpdatePostingRequest,
     JobPostingResponse,
+    CandidateMatch,
+    CandidateMatchListResponse,
 )
 from app.schemas.approval import ApprovalAction, ApprovalReject, ApprovalResponse
+from app.services.approval_workflow import WorkflowError, approval_workflow
+from app.services.posting_service import (
+    build_job_posting,
+    invalidate_posting_caches,
+    notify_posting_changed,
+    posting_projection,
+)
+from app.services.numbering import next_requirement_numbers
+from app.services.search import REQUIREMENT_SEARCH, apply_search
+from app.services.skill_matching import skill_index
+from app.utils.export import ExportFormat, export_response
+from app.utils.pagination import CountMode, apply_keyset, fetch_page
 
 # Constants
 REQUIREMENT_NOT_FOUND = REQUIREMENT_NOT_FOUND
@@ -30,60 +45,91 @@ REQUIREMENT_NOT_FOUND = REQUIREMENT_NOT_FOUND
 router = APIRouter(prefix="/requirements", tags=["requirements"])
 
 
+def filter_requirements(status: str | None, search: str | None) -> tuple[Select, Any]:
+    """Build the requirement query shared by the list and export endpoints"""
+    query = select(Requirement).where(Requirement.deleted_at.is_(None))
+    rank = None
+    
+    if status:
+        query = query.where(Requirement.status == status)
+    
+    if search:
+        query, rank = apply_search(query, REQUIREMENT_SEARCH, search)
+    
+    return query, rank
+
+
 @router.get("", response_model=RequirementListResponse)
 async def list_requirements(
     skip: int = Query(0, ge=0),
     limit: int = Query(50, ge=1, le=100),
+    cursor: str | None = Query(None, description="Cursor from a previous page (keyset pagination)"),
+    count: CountMode = Query(CountMode.EXACT, description="Total count: exact, estimate or none"),
     status: str | None = None,
     search: str | None = None,
-    db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_principal),
 ) -> Any:
-    """Get list of requirements with pagination and filters."""
-    query = select(Requirement).where(Requirement.deleted_at.is_(None))
+    """
+    Get list of requirements with pagination and filters.
     
-    # Apply filters
-    if status:
-        query = query.where(Requirement.status == status)
+    Pass the returned next_cursor as cursor to page by keyset instead of
+    skip/limit; skip is ignored when a cursor is given. count=estimate
+    returns the planner's row estimate instead of counting every match.
     
-    if search:
-        query = query.where(
-            Requirement.position_title.ilike(f"%{search}%") |
-            Requirement.requirement_number.ilike(f"%{search}%")
-        )
-    
-    # Get total count
-    count_query = select(func.count()).select_from(query.subquery())
-    total_result = await db.execute(count_query)
-    total = total_result.scalar_one()
-    
-    # Get paginated results
-    query = query.offset(skip).limit(limit).order_by(Requirement.created_at.desc())
-    result = await db.execute(query)
-    requirements = result.scalars().all()
-    
-    return {
-        "items": requirements,
-        "total": total,
-        "page": skip // limit + 1,
-        "page_size": limit,
-        "total_pages": (total + limit - 1) // limit,
-    }
+    search matches words of the title and description by prefix, or any
+    part of the requirement number; results are ranked by relevance.
+    """
+    query, rank = filter_requirements(status, search)
+    
+    # Get paginated results with their total
+    page = await fetch_page(
+        db,
+        query,
+        sort_column=Requirement.created_at,
+        id_column=Requirement.id,
+        limit=limit,
+        skip=skip,
+        cursor=cursor,
+        count=count,
+        estimate_table=None if status or search else "requirements",
+        rank=rank,
+    )
+    
+    return page.to_response(skip, limit)
+
+
+@router.get("/export")
+async def export_requirements(
+    request: Request,
+    export_format: ExportFormat = Query(ExportFormat.CSV, alias="format", description="csv or ndjson"),
+    status: str | None = None,
+    search: str | None = None,
+    current_user: Principal = Depends(get_current_principal),
+) -> Any:
+    """
+    Export every requirement matching the list filters as CSV or NDJSON.
+    
+    Rows are streamed newest first from a server-side cursor; list
+    columns are semicolon-separated in CSV.
+    """
+    query, _ = filter_requirements(status, search)
+    query = apply_keyset(query, Requirement.created_at, Requirement.id, None)
+    
+    session_maker = await replica_router.session_maker(reads_pinned_to_primary(request))
+    
+    return export_response(session_maker, query, RequirementResponse, export_format, "requirements")
 
 
 @router.post("", response_model=RequirementResponse, status_code=status.HTTP_201_CREATED)
 async def create_requirement(
     requirement_data: RequirementCreate,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(require_role("hiring_manager")),
+    current_user: Principal = Depends(require_role("hiring_manager")),
 ) -> Any:
     """Create a new requirement. Requires 'hiring_manager' role."""
-    # Generate requirement number
-    count_result = await db.execute(
-        select(func.count()).select_from(Requirement)
-    )
-    count = count_result.scalar_one()
-    requirement_number = f"REQ-{count + 1:05d}"
+    # Reserve the next requirement number (released again on rollback)
+    [requirement_number] = await next_requirement_numbers(db)
     
     requirement = Requirement(
         requirement_number=requirement_number,
@@ -116,7 +162,6 @@ async def create_requirement(
     
     db.add(requirement)
     await db.commit()
-    await db.refresh(requirement)
     
     return requirement
 
@@ -124,8 +169,8 @@ async def create_requirement(
 @router.get("/{requirement_id}", response_model=RequirementResponse)
 async def get_requirement(
     requirement_id: UUID,
-    db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_principal),
 ) -> Any:
     """Get requirement by ID."""
     result = await db.execute(
@@ -145,12 +190,77 @@ async def get_requirement(
     return requirement
 
 
+@router.get("/{requirement_id}/matches", response_model=CandidateMatchListResponse)
+async def match_candidates(
+    requirement_id: UUID,
+    top_k: int = Query(20, ge=1, le=100, description="Number of best matches"),
+    db: AsyncSession = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_principal),
+) -> Any:
+    """
+    Rank candidates by how well their skills cover the requirement's skills.
+    
+    Rare skills count for more than common ones; the score is the share of
+    the requirement's weighted skills a candidate has, from 0 to 1.
+    Candidates with no matching skill are left out.
+    """
+    required_skills = await db.scalar(
+        select(Requirement.required_skills).where(
+            Requirement.id == requirement_id,
+            Requirement.deleted_at.is_(None)
+        )
+    )
+    if required_skills is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=REQUIREMENT_NOT_FOUND
+        )
+    
+    matches = await skill_index.match(required_skills, top_k)
+    
+    # Contact details for the top matches only
+    result = await db.execute(
+        select(
+            Candidate.id,
+            Candidate.first_name,
+            Candidate.last_name,
+            Candidate.email,
+            Candidate.status,
+            Candidate.current_title,
+        ).where(
+            Candidate.id.in_([match.candidate_id for match in matches]),
+            Candidate.deleted_at.is_(None)
+        )
+    )
+    candidates = {row.id: row for row in result}
+    
+    return CandidateMatchListResponse(
+        requirement_id=requirement_id,
+        required_skills=required_skills,
+        items=[
+            CandidateMatch(
+                candidate_id=match.candidate_id,
+                first_name=candidate.first_name,
+                last_name=candidate.last_name,
+                email=candidate.email,
+                status=candidate.status,
+                current_title=candidate.current_title,
+                score=match.score,
+                matched_skills=match.matched_skills,
+                missing_skills=match.missing_skills,
+            )
+            for match in matches
+            if (candidate := candidates.get(match.candidate_id)) is not None
+        ],
+    )
+
+
 @router.put("/{requirement_id}", response_model=RequirementResponse)
 async def update_requirement(
     requirement_id: UUID,
     requirement_data: RequirementUpdate,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(require_role("hiring_manager")),
+    current_user: Principal = Depends(require_role("hiring_manager")),
 ) -> Any:
     """Update a requirement. Requires 'hiring_manager' or 'recruiter' role."""
     result = await db.execute(
@@ -172,8 +282,12 @@ async def update_requirement(
     for field, value in update_data.items():
         setattr(requirement, field, value)
     
+    if requirement.is_posted:
+        await notify_posting_changed(db)
     await db.commit()
-    await db.refresh(requirement)
+    
+    if requirement.is_posted:
+        invalidate_posting_caches()
     
     return requirement
 
@@ -182,7 +296,7 @@ async def update_requirement(
 async def delete_requirement(
     requirement_id: UUID,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(require_role("hiring_manager")),
+    current_user: Principal = Depends(require_role("hiring_manager")),
 ) -> None:
     """Soft delete a requirement. Requires 'hiring_manager' role."""
     result = await db.execute(
@@ -200,7 +314,12 @@ async def delete_requirement(
         )
     
     requirement.soft_delete()
+    if requirement.is_posted:
+        await notify_posting_changed(db)
     await db.commit()
+    
+    if requirement.is_posted:
+        invalidate_posting_caches()
 
 
 # ===========================
@@ -211,12 +330,12 @@ async def delete_requirement(
 async def submit_requirement(
     requirement_id: UUID,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(require_role("hiring_manager")),
+    current_user: Principal = Depends(require_role("hiring_manager")),
 ) -> Any:
     """
     Submit requirement for approval.
     
-    Creates approval record for Department Head.
+    Creates the pending approval of the first configured stage.
     Status: DRAFT → SUBMITTED
     """
     # Get requirement
@@ -241,47 +360,16 @@ async def submit_requirement(
             detail=f"Cannot submit requirement with status: {requirement.status}"
         )
     
-    # For MVP: Auto-assign to first admin/approver user
-    # In production: Query based on department hierarchy
-    
-    # Find a user with admin or approver role
-    approver_result = await db.execute(
-        select(User)
-        .join(User.roles)
-        .where(Role.name.in_(["admin", "approver"]))
-        .limit(1)
-    )
-    approver = approver_result.scalar_one_or_none()
-    
-    # Fallback: use the requirement creator's manager or just pick first active admin
-    if not approver:
-        approver_result = await db.execute(
-            select(User).where(User.is_superuser == True, User.is_active == True).limit(1)
-        )
-        approver = approver_result.scalar_one_or_none()
-    
-    if not approver:
+    # Route to the first configured stage
+    try:
+        await approval_workflow.submit(db, requirement)
+    except WorkflowError as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="No approver found. Please contact administrator."
+            detail=str(e)
         )
     
-    # Create approval record
-    approval = Approval(
-        requirement_id=requirement.id,
-        approver_id=approver.id,
-        approval_stage=ApprovalStage.DEPARTMENT_HEAD,
-        status=ApprovalStatus.PENDING,
-        submitted_at=datetime.now(timezone.utc)
-    )
-    
-    # Update requirement status
-    requirement.status = RequirementStatus.SUBMITTED
-    requirement.submitted_at = datetime.now(timezone.utc)
-    
-    db.add(approval)
     await db.commit()
-    await db.refresh(requirement)
     
     return requirement
 
@@ -291,13 +379,13 @@ async def approve_requirement(
     requirement_id: UUID,
     action: ApprovalAction,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
 ) -> Any:
     """
     Approve a requirement.
     
     Approver must have pending approval for this requirement.
-    Status: SUBMITTED → APPROVED
+    Status: SUBMITTED → APPROVED after the last stage
     """
     # Get requirement with approvals
     result = await db.execute(
@@ -314,33 +402,24 @@ async def approve_requirement(
             detail=REQUIREMENT_NOT_FOUND
         )
     
-    # Find pending approval for current user
-    approval_result = await db.execute(
-        select(Approval).where(
-            Approval.requirement_id == requirement_id,
-            Approval.approver_id == current_user.id,
-            Approval.status == ApprovalStatus.PENDING
+    # Decide this user's pending stage; later stages open as configured
+    try:
+        decisions = await approval_workflow.decide(
+            db, [requirement_id], current_user.id, approve=True, comments=action.comments
+        )
+    except WorkflowError as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=str(e)
         )
-    )
-    approval = approval_result.scalar_one_or_none()
     
-    if not approval:
+    if not decisions:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="No pending approval found for this user"
         )
     
-    # Update approval
-    approval.status = ApprovalStatus.APPROVED
-    approval.comments = action.comments
-    approval.reviewed_at = datetime.now(timezone.utc)
-    
-    # Update requirement status
-    requirement.status = RequirementStatus.APPROVED
-    requirement.approved_at = datetime.now(timezone.utc)
-    
     await db.commit()
-    await db.refresh(requirement)
     
     return requirement
 
@@ -350,7 +429,7 @@ async def reject_requirement(
     requirement_id: UUID,
     action: ApprovalReject,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
 ) -> Any:
     """
     Reject a requirement.
@@ -373,32 +452,18 @@ async def reject_requirement(
             detail=REQUIREMENT_NOT_FOUND
         )
     
-    # Find pending approval for current user
-    approval_result = await db.execute(
-        select(Approval).where(
-            Approval.requirement_id == requirement_id,
-            Approval.approver_id == current_user.id,
-            Approval.status == ApprovalStatus.PENDING
-        )
+    # Reject this user's pending stage
+    decisions = await approval_workflow.decide(
+        db, [requirement_id], current_user.id, approve=False, comments=action.comments  # Required field
     )
-    approval = approval_result.scalar_one_or_none()
     
-    if not approval:
+    if not decisions:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="No pending approval found for this user"
         )
     
-    # Update approval
-    approval.status = ApprovalStatus.REJECTED
-    approval.comments = action.comments  # Required field
-    approval.reviewed_at = datetime.now(timezone.utc)
-    
-    # Update requirement status
-    requirement.status = RequirementStatus.REJECTED
-    
     await db.commit()
-    await db.refresh(requirement)
     
     return requirement
 
@@ -408,7 +473,7 @@ async def assign_recruiter(
     requirement_id: UUID,
     recruiter_id: UUID,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(require_role("hiring_manager")),
+    current_user: Principal = Depends(require_role("hiring_manager")),
 ) -> Any:
     """
     Assign a recruiter to an approved requirement.
@@ -454,7 +519,6 @@ async def assign_recruiter(
     requirement.assigned_at = datetime.now(timezone.utc)
     
     await db.commit()
-    await db.refresh(requirement)
     
     return requirement
 
@@ -463,7 +527,7 @@ async def assign_recruiter(
 async def activate_requirement(
     requirement_id: UUID,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(require_role("recruiter")),
+    current_user: Principal = Depends(require_role("recruiter")),
 ) -> Any:
     """
     Activate a requirement to start sourcing candidates.
@@ -511,7 +575,6 @@ async def activate_requirement(
     requirement.status = RequirementStatus.ACTIVE
     
     await db.commit()
-    await db.refresh(requirement)
     
     return requirement
 
@@ -523,7 +586,7 @@ async def post_job(
     requirement_id: UUID,
     post_data: PostJobRequest,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(require_role("recruiter")),
+    current_user: Principal = Depends(require_role("recruiter")),
 ) -> Any:
     """
     Post a job to selected channels. Requires 'recruiter' role.
@@ -588,8 +651,20 @@ async def post_job(
     if requirement.status == RequirementStatus.APPROVED:
         requirement.status = RequirementStatus.ACTIVE
     
+    await publish(db, [event(
+        "posting.published",
+        {
+            "requirement_id": requirement.id,
+            "requirement_number": requirement.requirement_number,
+            "status": requirement.status.value,
+            "job_posting_url": requirement.job_posting_url,
+        },
+        roles=("recruiter",),
+        user_ids=(requirement.hiring_manager_id,),
+    )])
+    await notify_posting_changed(db)
     await db.commit()
-    await db.refresh(requirement)
+    invalidate_posting_caches()
     
     return requirement
 
@@ -599,7 +674,7 @@ async def update_job_posting(
     requirement_id: UUID,
     update_data: UpdatePostingRequest,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(require_role("recruiter")),
+    current_user: Principal = Depends(require_role("recruiter")),
 ) -> Any:
     """
     Update job posting details. Requires 'recruiter' role.
@@ -648,8 +723,8 @@ async def update_job_posting(
     if update_data.channels is not None:
         requirement.posting_channels = update_data.channels
     
-    # Update posting details
-    posting_details = requirement.posting_details or {}
+    # Update a copy of the posting details so the JSON column is marked dirty
+    posting_details = dict(requirement.posting_details or {})
     
     if update_data.benefits is not None:
         posting_details["benefits"] = update_data.benefits
@@ -663,8 +738,9 @@ async def update_job_posting(
     
     requirement.posting_details = posting_details
     
+    await notify_posting_changed(db)
     await db.commit()
-    await db.refresh(requirement)
+    invalidate_posting_caches()
     
     return requirement
 
@@ -672,50 +748,27 @@ async def update_job_posting(
 @router.get("/{requirement_id}/posting-preview", response_model=JobPostingResponse)
 async def get_posting_preview(
     requirement_id: UUID,
-    db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_principal),
 ) -> Any:
     """
     Get a preview of how the job posting will look.
     Requires authentication.
     """
-    # Get requirement with relationships
+    # Get posting columns with department and location names in one statement
     result = await db.execute(
-        select(Requirement).where(
+        posting_projection().where(
             Requirement.id == requirement_id,
             Requirement.deleted_at.is_(None)
         )
     )
-    requirement = result.scalar_one_or_none()
+    row = result.one_or_none()
     
-    if not requirement:
+    if not row:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=REQUIREMENT_NOT_FOUND
         )
     
-    # Build posting response
-    posting_details = requirement.posting_details or {}
-    
-    return {
-        "id": requirement.id,
-        "requirement_number": requirement.requirement_number,
-        "position_title": requirement.position_title,
-        "department_name": requirement.department.name if requirement.department else "N/A",
-        "location_name": requirement.location.name if requirement.location else "N/A",
-        "employment_type": requirement.employment_type.value,
-        "work_mode": requirement.work_mode.value,
-        "job_description": posting_details.get("custom_description") or requirement.job_description,
-        "required_qualifications": requirement.required_qualifications,
-        "required_skills": requirement.required_skills or [],
-        "min_salary": float(requirement.min_salary) if requirement.min_salary else None,
-        "max_salary": float(requirement.max_salary) if requirement.max_salary else None,
-        "currency": requirement.currency,
-        "is_posted": requirement.is_posted,
-        "posting_status": requirement.posting_status.value,
-        "posting_channels": requirement.posting_channels or [],
-        "job_posting_url": requirement.job_posting_url,
-        "posted_at": requirement.posted_at,
-        "benefits": posting_details.get("benefits"),
-        "application_instructions": posting_details.get("application_instructions"),
-    }
+    return build_job_posting(row)
+    
\ No newline at end of file
@@ -5,15 +5,16 @@ from typing import List, Optional
 from uuid import UUID
 from datetime import datetime
 from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlalchemy import select, delete
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
-from app.core.database import get_db
-from app.core.deps import get_current_user, require_role
-from app.core.security import get_password_hash
+from app.core.database import get_db, get_read_db
+from app.core.deps import get_current_principal, require_role
+from app.core.principal import Principal, invalidate_principal, notify_principal_changed
+from app.core.security import get_password_hash_async
 from app.models.user import User
-from app.models.role import Role, user_roles
+from app.models.role import Role
 from app.schemas.user import UserResponse, UserCreate, UserUpdate
 
 
@@ -24,8 +25,8 @@ router = APIRouter()
 async def list_users(
     role: Optional[str] = Query(None, description="Filter by role name"),
     is_active: Optional[bool] = Query(None, description="Filter by active status"),
-    db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_principal)
 ):
     """
     Get list of users
@@ -54,8 +55,8 @@ async def list_users(
 @router.get("/users/{user_id}", response_model=UserResponse)
 async def get_user(
     user_id: str,
-    db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_principal)
 ):
     """
     Get a specific user by ID
@@ -78,7 +79,7 @@ async def create_user(
     user_data: UserCreate,
     role_ids: Optional[List[UUID]] = None,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(require_role("admin"))
+    current_user: Principal = Depends(require_role("admin"))
 ):
     """
     Create a new user (admin only)
@@ -106,7 +107,16 @@ async def create_user(
             detail="Username already taken"
         )
     
+    # Resolve roles first so the user is inserted together with them
+    roles = []
+    if role_ids:
+        role_result = await db.execute(
+            select(Role).where(Role.id.in_(role_ids))
+        )
+        roles = list(role_result.scalars().all())
+    
     # Create user
+    password_hash = await get_password_hash_async(user_data.password)
     user = User(
         email=user_data.email,
         username=user_data.username,
@@ -116,34 +126,14 @@ async def create_user(
         employee_id=user_data.employee_id,
         job_title=user_data.job_title,
         department_id=user_data.department_id,
-        password_hash=get_password_hash(user_data.password),
+        password_hash=password_hash,
         is_active=True,
-        email_verified=False
+        email_verified=False,
+        roles=roles,
     )
     
     db.add(user)
-    await db.flush()
-    
-    # Assign roles if provided
-    if role_ids:
-        for role_id in role_ids:
-            # Verify role exists
-            role_result = await db.execute(
-                select(Role).where(Role.id == role_id)
-            )
-            role = role_result.scalar_one_or_none()
-            if role:
-                user.roles.append(role)
-    
     await db.commit()
-    await db.refresh(user)
-    
-    # Load roles for response
-    await db.execute(
-        select(User)
-        .options(selectinload(User.roles))
-        .where(User.id == user.id)
-    )
     
     return user
 
@@ -153,7 +143,7 @@ async def update_user(
     user_id: UUID,
     user_data: UserUpdate,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(require_role("admin"))
+    current_user: Principal = Depends(require_role("admin"))
 ):
     """
     Update user information (admin only)
@@ -200,8 +190,9 @@ async def update_user(
     if user_data.is_active is not None:
         user.is_active = user_data.is_active
     
+    await notify_principal_changed(db, user_id)
     await db.commit()
-    await db.refresh(user)
+    invalidate_principal(user_id)
     
     return user
 
@@ -211,7 +202,7 @@ async def update_user_roles(
     user_id: UUID,
     role_ids: List[UUID],
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(require_role("admin"))
+    current_user: Principal = Depends(require_role("admin"))
 ):
     """
     Update user's roles (admin only)
@@ -228,34 +219,26 @@ async def update_user_roles(
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     
-    # Remove all existing roles
-    await db.execute(
-        delete(user_roles).where(user_roles.c.user_id == user_id)
-    )
-    
-    # Add new roles
-    for role_id in role_ids:
+    # Replace the role collection; the flush only touches changed rows
+    roles = []
+    if role_ids:
         role_result = await db.execute(
-            select(Role).where(Role.id == role_id)
+            select(Role).where(Role.id.in_(role_ids))
         )
-        role = role_result.scalar_one_or_none()
-        if not role:
-            raise HTTPException(
-                status_code=404,
-                detail=f"Role with ID {role_id} not found"
-            )
-        user.roles.append(role)
+        roles = list(role_result.scalars().all())
     
-    await db.commit()
-    await db.refresh(user)
+    missing = set(role_ids) - {role.id for role in roles}
+    if missing:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Role with ID {next(iter(missing))} not found"
+        )
     
-    # Reload with roles
-    result = await db.execute(
-        select(User)
-        .options(selectinload(User.roles))
-        .where(User.id == user_id)
-    )
-    user = result.scalar_one_or_none()
+    user.roles = roles
+    
+    await notify_principal_changed(db, user_id)
+    await db.commit()
+    invalidate_principal(user_id)
     
     return user
 
@@ -264,7 +247,7 @@ async def update_user_roles(
 async def delete_user(
     user_id: UUID,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(require_role("admin"))
+    current_user: Principal = Depends(require_role("admin"))
 ):
     """
     Delete a user (admin only)
@@ -286,15 +269,17 @@ async def delete_user(
         raise HTTPException(status_code=404, detail="User not found")
     
     await db.delete(user)
+    await notify_principal_changed(db, user_id)
     await db.commit()
+    invalidate_principal(user_id)
     
     return None
 
 
 @router.get("/roles", response_model=List[dict])
 async def list_roles(
-    db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_principal)
 ):
     """
     Get list of all available roles
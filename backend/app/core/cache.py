@@ -0,0 +1,104 @@
+"""
+In-process caching primitives
+"""
+import time
+from collections import OrderedDict
+from typing import Any, Generic, Hashable, Optional, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+_MISSING = object()
+
+
+class TTLCache(Generic[K, V]):
+    """
+    Bounded LRU mapping whose entries expire after a time-to-live
+    
+    All operations are O(1). The cache is meant to be used from the event
+    loop thread, so it does not take any locks.
+    
+    Usage:
+        cache: TTLCache[str, dict] = TTLCache(maxsize=1000, ttl=60)
+        cache.set("key", {"value": 1})
+        cache.get("key")
+    """
+    
+    def __init__(self, maxsize: int, ttl: float):
+        """
+        Args:
+            maxsize: Maximum number of entries kept before evicting the least recently used
+            ttl: Default time-to-live in seconds for new entries
+        """
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: OrderedDict[K, tuple[float, V]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+    
+    def get(self, key: K, default: Optional[V] = None) -> Optional[V]:
+        """
+        Get a live entry and mark it as most recently used
+        
+        Args:
+            key: Cache key
+            default: Value returned when the key is missing or expired
+            
+        Returns:
+            Cached value or default
+        """
+        entry: Any = self._data.get(key, _MISSING)
+        if entry is _MISSING:
+            self.misses += 1
+            return default
+        
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._data[key]
+            self.misses += 1
+            return default
+        
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+    
+    def set(self, key: K, value: V, ttl: Optional[float] = None) -> None:
+        """
+        Store an entry, evicting the least recently used one if full
+        
+        Args:
+            key: Cache key
+            value: Value to store
+            ttl: Optional per-entry time-to-live overriding the default
+        """
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        self._data[key] = (expires_at, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+    
+    def pop(self, key: K) -> Optional[V]:
+        """
+        Remove an entry
+        
+        Args:
+            key: Cache key
+            
+        Returns:
+            Removed value or None if it was not cached
+        """
+        entry = self._data.pop(key, None)
+        return entry[1] if entry else None
+    
+    def clear(self) -> None:
+        """Remove all entries"""
+        self._data.clear()
+    
+    def __contains__(self, key: object) -> bool:
+        entry = self._data.get(key)  # type: ignore[call-overload]
+        return entry is not None and entry[0] > time.monotonic()
+    
+    def __len__(self) -> int:
+        return len(self._data)
@@ -1,10 +1,10 @@
 """
 Application configuration settings
 """
-from typing import List
+from typing import Annotated, Dict, List, Literal
 
 from pydantic import Field, field_validator
-from pydantic_settings import BaseSettings, SettingsConfigDict
+from pydantic_settings import BaseSettings, NoDecode, SettingsConfigDict
 
 
 class Settings(BaseSettings):
@@ -34,6 +34,47 @@ class Settings(BaseSettings):
     DATABASE_POOL_SIZE: int = 20
     DATABASE_MAX_OVERFLOW: int = 10
     
+    # Read replicas (optional; reads fall back to the primary)
+    DATABASE_READ_URLS: Annotated[List[str], NoDecode] = []
+    DATABASE_READ_POOL_SIZE: int = 10
+    DATABASE_REPLICA_MAX_LAG_SECONDS: float = 5.0
+    DATABASE_REPLICA_LAG_CHECK_SECONDS: float = 2.0
+    READ_YOUR_WRITES_SECONDS: int = 10  # Reads stick to the primary after a write
+    # The stickiness cookie is sent back by the SPA's credentialed requests
+    # (withCredentials, allowed by CORS for BACKEND_CORS_ORIGINS); use "none"
+    # when the SPA and API are on different sites (the cookie is then Secure)
+    READ_YOUR_WRITES_COOKIE_SAMESITE: Literal["lax", "strict", "none"] = "lax"
+    
+    @field_validator("DATABASE_READ_URLS", mode="before")
+    @classmethod
+    def assemble_read_urls(cls, v: str | List[str]) -> List[str]:
+        """Parse replica URLs from a comma-separated string or list"""
+        if isinstance(v, str):
+            return [url.strip() for url in v.split(",") if url.strip()]
+        return v
+    
+    # Job postings
+    POSTING_STATS_CACHE_TTL_SECONDS: int = 30
+    CAREERS_SNAPSHOT_TTL_SECONDS: int = 300
+    CAREERS_SNAPSHOT_MAX_ENTRIES: int = 512
+    CAREERS_CACHE_MAX_AGE_SECONDS: int = 60
+    
+    # Reference data (cached in process, revalidated by ETag)
+    REFERENCE_DATA_MAX_AGE_SECONDS: int = 0
+    
+    # Batch approvals (requirement IDs per request)
+    APPROVAL_BATCH_MAX_SIZE: int = 500
+    
+    # Live events (Server-Sent Events; queued per stream before it is told to resync)
+    EVENT_STREAM_QUEUE_SIZE: int = 100
+    
+    # Candidate bulk import
+    CANDIDATE_IMPORT_CHUNK_SIZE: int = 1000
+    CANDIDATE_IMPORT_MAX_ERRORS: int = 1000
+    
+    # Exports (rows fetched per server-side cursor round trip)
+    EXPORT_BATCH_SIZE: int = 1000
+    
     # Redis
     REDIS_URL: str = "redis://localhost:6379/0"
     REDIS_CACHE_TTL: int = 300  # 5 minutes
@@ -41,7 +82,13 @@ class Settings(BaseSettings):
     # JWT Authentication
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 15
     REFRESH_TOKEN_EXPIRE_DAYS: int = 7
+    REFRESH_TOKEN_REUSE_GRACE_SECONDS: int = 30  # Repeat exchanges this soon are not treated as reuse
     ALGORITHM: str = "HS256"
+    TOKEN_CACHE_MAX_SIZE: int = 10000  # Verified tokens remembered until they expire
+    
+    # Principal cache (authenticated user snapshots)
+    PRINCIPAL_CACHE_TTL_SECONDS: int = 60
+    PRINCIPAL_CACHE_MAX_SIZE: int = 10000
     
     # Password Policy
     PASSWORD_MIN_LENGTH: int = 8
@@ -50,6 +97,11 @@ class Settings(BaseSettings):
     PASSWORD_REQUIRE_DIGIT: bool = True
     PASSWORD_REQUIRE_SPECIAL: bool = True
     
+    # Password hashing pool (bcrypt runs off the event loop)
+    PASSWORD_HASH_WORKERS: int = 4
+    PASSWORD_HASH_QUEUE_SIZE: int = 64
+    PASSWORD_HASH_TIMEOUT_SECONDS: float = 5.0
+    
     # Email
     SMTP_HOST: str = "smtp.gmail.com"
     SMTP_PORT: int = 587
@@ -74,10 +126,14 @@ class Settings(BaseSettings):
     RATE_LIMIT_PER_MINUTE: int = 100
     
     # Logging
-    LOG_LEVEL: str = "DEBUG"  # DEBUG, INFO, WARNING, ERROR, CRITICAL
-    LOG_FORMAT: str = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+    LOG_LEVEL: str = "INFO"  # DEBUG, INFO, WARNING, ERROR, CRITICAL
+    LOG_FORMAT: str = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"  # or "json"
     LOG_FILE_ENABLED: bool = True
     LOG_FILE_PATH: str = "logs/app.log"
+    LOG_FILE_MAX_BYTES: int = 10485760  # 10MB per file before rotating
+    LOG_FILE_BACKUP_COUNT: int = 5
+    LOG_QUEUE_SIZE: int = 10000  # Records waiting for the writer thread; newer ones are dropped
+    LOG_SAMPLE_RATES: Dict[str, float] = {}  # Logger name -> share of records below WARNING kept, e.g. {"app.access": 0.1}
     
     # Sentry
     SENTRY_DSN: str = ""
@@ -1,12 +1,26 @@
 """
 Database configuration and session management
 """
-from typing import AsyncGenerator
+import asyncio
+import itertools
+import logging
+import time
+from typing import AsyncGenerator, Optional
 
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from fastapi import Request, Response
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import declarative_base
 
 from app.core.config import settings
+from app.core.db_metrics import instrument_engine
+
+logger = logging.getLogger(__name__)
+
+# Cookie telling every worker to serve this client's reads from the primary
+READ_YOUR_WRITES_COOKIE = "db_primary_until"
+
+_SAFE_METHODS = {"GET", "HEAD", "OPTIONS"}
 
 # Create async engine
 engine = create_async_engine(
@@ -16,6 +30,7 @@ engine = create_async_engine(
     max_overflow=settings.DATABASE_MAX_OVERFLOW,
     pool_pre_ping=True,  # Verify connections before using
 )
+instrument_engine(engine)
 
 # Create async session factory
 async_session_maker = async_sessionmaker(
@@ -26,23 +41,167 @@ async_session_maker = async_sessionmaker(
     autoflush=False,
 )
 
+# Sessions for reads on the primary; transactions start as BEGIN ... READ ONLY
+read_only_session_maker = async_sessionmaker(
+    engine.execution_options(postgresql_readonly=True),
+    class_=AsyncSession,
+    expire_on_commit=False,
+    autoflush=False,
+)
+
+
+class _ModelBase:
+    """Options shared by every model"""
+    
+    # Server-generated columns (ids, timestamps) come back through RETURNING
+    # on INSERT and UPDATE, so handlers never need refresh() after a write
+    __mapper_args__ = {"eager_defaults": True}
+
+
 # Create declarative base for models
-Base = declarative_base()
+Base = declarative_base(cls=_ModelBase)
+
+
+class Replica:
+    """A read replica engine with its last measured replication lag"""
+    
+    def __init__(self, url: str):
+        self.engine: AsyncEngine = create_async_engine(
+            url,
+            echo=settings.DEBUG,
+            pool_size=settings.DATABASE_READ_POOL_SIZE,
+            max_overflow=settings.DATABASE_MAX_OVERFLOW,
+            pool_pre_ping=True,
+        )
+        instrument_engine(self.engine)
+        self.session_maker = async_sessionmaker(
+            self.engine.execution_options(postgresql_readonly=True),
+            class_=AsyncSession,
+            expire_on_commit=False,
+            autoflush=False,
+        )
+        self.lag: Optional[float] = None  # None until measured or after a failed check
+        self.checked_at = 0.0
+        self._lock = asyncio.Lock()
+    
+    async def current_lag(self) -> Optional[float]:
+        """
+        Get replication lag in seconds, re-measuring when the last check is stale
+        
+        Returns:
+            Lag in seconds, or None if the replica is unreachable
+        """
+        if time.monotonic() - self.checked_at < settings.DATABASE_REPLICA_LAG_CHECK_SECONDS:
+            return self.lag
+        
+        # One request measures; concurrent ones use the previous value
+        if self._lock.locked():
+            return self.lag
+        
+        async with self._lock:
+            try:
+                async with self.engine.connect() as conn:
+                    # Zero when replay has caught up with everything received,
+                    # so an idle primary does not read as growing lag
+                    self.lag = await conn.scalar(text(
+                        "SELECT CASE"
+                        " WHEN NOT pg_is_in_recovery() THEN 0"
+                        " WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0"
+                        " ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)"
+                        " END"
+                    ))
+            except Exception as e:
+                logger.warning(f"Replica lag check failed: {e}")
+                self.lag = None
+            self.checked_at = time.monotonic()
+        
+        return self.lag
+
 
+class ReplicaRouter:
+    """Round-robins reads over replicas that are within the allowed lag"""
+    
+    def __init__(self, urls: list[str]):
+        self.replicas = [Replica(url) for url in urls]
+        self._order = itertools.cycle(range(len(self.replicas))) if self.replicas else None
+    
+    async def session_maker(self, sticky_primary: bool = False) -> async_sessionmaker:
+        """
+        Pick the session factory for a read
+        
+        Args:
+            sticky_primary: True if the client wrote recently and must read its writes
+            
+        Returns:
+            A healthy replica's session factory, or the primary's read-only one
+        """
+        if sticky_primary or not self.replicas:
+            return read_only_session_maker
+        
+        for _ in range(len(self.replicas)):
+            replica = self.replicas[next(self._order)]
+            lag = await replica.current_lag()
+            if lag is not None and lag <= settings.DATABASE_REPLICA_MAX_LAG_SECONDS:
+                return replica.session_maker
+        
+        return read_only_session_maker
+    
+    async def dispose(self) -> None:
+        """Close every replica connection pool"""
+        for replica in self.replicas:
+            await replica.engine.dispose()
 
-async def get_db() -> AsyncGenerator[AsyncSession, None]:
+
+replica_router = ReplicaRouter(settings.DATABASE_READ_URLS)
+
+
+def reads_pinned_to_primary(request: Request) -> bool:
+    """
+    Check whether a client is inside its read-your-writes window
+    
+    Args:
+        request: Incoming request
+        
+    Returns:
+        True if the client wrote recently
     """
-    Dependency for getting async database sessions
+    until = request.cookies.get(READ_YOUR_WRITES_COOKIE)
+    try:
+        return until is not None and float(until) > time.time()
+    except ValueError:
+        return False
+
+
+async def get_db(request: Request, response: Response) -> AsyncGenerator[AsyncSession, None]:
+    """
+    Dependency for sessions that write
+    
+    Handlers commit their own work once. Anything still uncommitted when
+    the handler returns is committed here; a session whose transaction was
+    already committed (or never started) costs no further round trip.
     
     Usage:
         @app.get("/items")
         async def get_items(db: AsyncSession = Depends(get_db)):
             ...
     """
+    # Mutating requests pin the client's reads to the primary for a while,
+    # so it never reads a replica that has not replayed its write yet
+    if replica_router.replicas and request.method not in _SAFE_METHODS:
+        response.set_cookie(
+            READ_YOUR_WRITES_COOKIE,
+            str(int(time.time()) + settings.READ_YOUR_WRITES_SECONDS),
+            max_age=settings.READ_YOUR_WRITES_SECONDS,
+            httponly=True,
+            samesite=settings.READ_YOUR_WRITES_COOKIE_SAMESITE,
+            secure=settings.READ_YOUR_WRITES_COOKIE_SAMESITE == "none",
+        )
+    
     async with async_session_maker() as session:
         try:
             yield session
-            await session.commit()
+            if session.in_transaction():
+                await session.commit()
         except Exception:
             await session.rollback()
             raise
@@ -50,6 +209,24 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
             await session.close()
 
 
+async def get_read_db(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    """
+    Dependency for sessions that only read
+    
+    Served by a read replica when one is configured and within the allowed
+    lag, otherwise by the primary. Transactions are read-only and are
+    never committed; closing the session ends them.
+    
+    Usage:
+        @app.get("/items")
+        async def list_items(db: AsyncSession = Depends(get_read_db)):
+            ...
+    """
+    session_maker = await replica_router.session_maker(reads_pinned_to_primary(request))
+    async with session_maker() as session:
+        yield session
+
+
 async def init_db() -> None:
     """Initialize database - create all tables"""
     async with engine.begin() as conn:
@@ -58,4 +235,5 @@ async def init_db() -> None:
 
 async def close_db() -> None:
     """Close database connection pool"""
+    await replica_router.dispose()
     await engine.dispose()
@@ -0,0 +1,121 @@
+"""
+Per-request database round-trip counting
+
+Every statement, BEGIN, COMMIT and ROLLBACK sent on an instrumented engine
+is counted against the request being served, along with the time spent in
+statements. The round-trip and statement counts are returned in the
+X-DB-Round-Trips and X-DB-Queries response headers, so the cost of an
+endpoint can be read off any response without turning on SQL echo.
+"""
+import logging
+import time
+from contextvars import ContextVar
+from typing import Optional
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+logger = logging.getLogger(__name__)
+
+ROUND_TRIPS_HEADER = "X-DB-Round-Trips"
+QUERIES_HEADER = "X-DB-Queries"
+
+_QUERY_START = "db_metrics_query_start"
+
+
+class RequestDBStats:
+    """Database work done while serving one request"""
+    
+    __slots__ = ("round_trips", "queries", "query_seconds")
+    
+    def __init__(self):
+        self.round_trips = 0
+        self.queries = 0
+        self.query_seconds = 0.0
+
+
+# Shared object, so work done in child tasks reaches the request's stats
+_request_stats: ContextVar[Optional[RequestDBStats]] = ContextVar("db_request_stats", default=None)
+
+
+def _before_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    stats = _request_stats.get()
+    if stats is not None:
+        stats.round_trips += 1
+        stats.queries += 1
+        conn.info[_QUERY_START] = time.perf_counter()
+
+
+def _after_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    stats = _request_stats.get()
+    started = conn.info.pop(_QUERY_START, None)
+    if stats is not None and started is not None:
+        stats.query_seconds += time.perf_counter() - started
+
+
+def _count_transaction(conn) -> None:
+    stats = _request_stats.get()
+    if stats is not None:
+        stats.round_trips += 1
+
+
+def instrument_engine(engine: AsyncEngine) -> None:
+    """
+    Count the round trips of an engine against the current request
+    
+    Args:
+        engine: Async engine to instrument
+    """
+    sync_engine = engine.sync_engine
+    event.listen(sync_engine, "before_cursor_execute", _before_execute)
+    event.listen(sync_engine, "after_cursor_execute", _after_execute)
+    for name in ("begin", "commit", "rollback"):
+        event.listen(sync_engine, name, _count_transaction)
+
+
+def current_stats() -> Optional[RequestDBStats]:
+    """Get the database stats of the current request, if one is tracked"""
+    return _request_stats.get()
+
+
+def current_round_trips() -> int:
+    """Get the round trips made so far by the current request"""
+    stats = _request_stats.get()
+    return stats.round_trips if stats is not None else 0
+
+
+class DatabaseRoundTripMiddleware:
+    """
+    Start database stats per request and report them in headers
+    
+    The headers carry the counts at the moment the response starts;
+    dependency cleanup that runs after that (closing sessions) is only
+    included in the debug log line and in middleware running inside
+    this one.
+    """
+    
+    def __init__(self, app: ASGIApp):
+        self.app = app
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        stats = RequestDBStats()
+        token = _request_stats.set(stats)
+        
+        async def send_with_count(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                headers.append(ROUND_TRIPS_HEADER, str(stats.round_trips))
+                headers.append(QUERIES_HEADER, str(stats.queries))
+            await send(message)
+        
+        try:
+            await self.app(scope, receive, send_with_count)
+        finally:
+            _request_stats.reset(token)
+            logger.debug(f"{scope['method']} {scope['path']} - DB round trips: {stats.round_trips}")
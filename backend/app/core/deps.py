@@ -1,13 +1,15 @@
 """
 FastAPI dependencies for authentication and authorization
 """
-from typing import Optional
+from typing import Any, Optional
 
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.database import get_db
+from app.core.database import get_db, read_only_session_maker
+from app.core.principal import Principal, principal_cache
+from app.core.revocation import token_denylist
 from app.core.security import verify_token
 from app.models.user import User
 from app.services.user_service import UserService
@@ -16,22 +18,22 @@ from app.services.user_service import UserService
 security = HTTPBearer()
 
 
-async def get_current_user(
-    credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: AsyncSession = Depends(get_db),
-) -> User:
+async def get_token_payload(credentials: HTTPAuthorizationCredentials = Depends(security)) -> dict[str, Any]:
     """
-    Get current authenticated user from JWT token
+    Validate the bearer access token and return its claims
+    
+    Revocation is checked against the in-memory denylist, without a query.
+    Async so it runs on the event loop thread: the verified token cache and
+    the denylist are not locked and must not be touched from the threadpool.
     
     Args:
         credentials: HTTP Bearer credentials with JWT token
-        db: Database session
         
     Returns:
-        Current authenticated user
+        Decoded token claims
         
     Raises:
-        HTTPException: If token is invalid or user not found
+        HTTPException: If token is invalid or revoked
     """
     token = credentials.credentials
     
@@ -52,6 +54,30 @@ async def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
     
+    # Check the token and its login session were not revoked
+    if token_denylist.is_revoked(payload.get("jti"), payload.get("fam")):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Token has been revoked",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    
+    return payload
+
+
+def get_token_subject(payload: dict[str, Any] = Depends(get_token_payload)) -> str:
+    """
+    Get the subject of the validated access token
+    
+    Args:
+        payload: Decoded token claims
+        
+    Returns:
+        User ID from the token "sub" claim
+        
+    Raises:
+        HTTPException: If the token has no subject
+    """
     # Get user ID from token
     user_id: Optional[str] = payload.get("sub")
     if user_id is None:
@@ -61,6 +87,75 @@ async def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
     
+    return user_id
+
+
+def _ensure_active(principal: Principal) -> None:
+    """Reject inactive accounts"""
+    if not principal.is_active:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="User account is inactive",
+        )
+
+
+async def get_current_principal(
+    user_id: str = Depends(get_token_subject),
+) -> Principal:
+    """
+    Get a snapshot of the current authenticated user
+    
+    Served from the principal cache; the database is only queried on a
+    miss, using a short-lived session of its own.
+    
+    Args:
+        user_id: User ID from the validated access token
+        
+    Returns:
+        Current principal
+        
+    Raises:
+        HTTPException: If user not found or inactive
+    """
+    principal = principal_cache.get(user_id)
+    
+    if principal is None:
+        async with read_only_session_maker() as session:
+            user = await UserService(session).get_by_id(user_id)
+        
+        if user is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="User not found",
+            )
+        
+        principal = Principal.from_user(user)
+        principal_cache.set(user_id, principal)
+    
+    _ensure_active(principal)
+    return principal
+
+
+async def get_current_user(
+    user_id: str = Depends(get_token_subject),
+    db: AsyncSession = Depends(get_db),
+) -> User:
+    """
+    Get current authenticated user from JWT token
+    
+    Loads the full User entity. Prefer get_current_principal when only
+    the user ID or roles are needed.
+    
+    Args:
+        user_id: User ID from the validated access token
+        db: Database session
+        
+    Returns:
+        Current authenticated user
+        
+    Raises:
+        HTTPException: If token is invalid or user not found
+    """
     # Fetch user from database
     user_service = UserService(db)
     user = await user_service.get_by_id(user_id)
@@ -71,12 +166,11 @@ async def get_current_user(
             detail="User not found",
         )
     
-    if not user.is_active:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="User account is inactive",
-        )
+    # Refresh the cached snapshot while we have the entity at hand
+    principal = Principal.from_user(user)
+    principal_cache.set(user_id, principal)
     
+    _ensure_active(principal)
     return user
 
 
@@ -96,13 +190,13 @@ async def get_current_active_user(
 
 
 async def get_current_superuser(
-    current_user: User = Depends(get_current_user),
-) -> User:
+    current_user: Principal = Depends(get_current_principal),
+) -> Principal:
     """
     Get current superuser (admin only)
     
     Args:
-        current_user: Current authenticated user
+        current_user: Current authenticated principal
         
     Returns:
         Current superuser
@@ -124,7 +218,7 @@ def require_role(role_name: str):
     
     Usage:
         @router.get("/admin-only")
-        async def admin_endpoint(user: User = Depends(require_role("admin"))):
+        async def admin_endpoint(user: Principal = Depends(require_role("admin"))):
             ...
     
     Args:
@@ -133,11 +227,11 @@ def require_role(role_name: str):
     Returns:
         Dependency function
     """
-    async def role_checker(current_user: User = Depends(get_current_user)) -> User:
+    async def role_checker(
+        current_user: Principal = Depends(get_current_principal),
+    ) -> Principal:
         """Check if user has required role"""
-        user_roles = [role.name for role in current_user.roles]
-        
-        if role_name not in user_roles and not current_user.is_superuser:
+        if not current_user.has_role(role_name) and not current_user.is_superuser:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail=f"Insufficient permissions. Role '{role_name}' required.",
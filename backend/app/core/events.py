@@ -0,0 +1,196 @@
+"""
+Live state-change events for Server-Sent Event streams
+
+Writers publish events on their own transaction with pg_notify, so an
+event goes out only if the change commits. Every worker (the publishing
+one included) receives it through pg_listener and hands it to the local
+streams whose user may see it. Streams that fall behind, and all streams
+after the LISTEN connection was lost, get a resync event telling the
+client to refetch instead of trusting the feed.
+"""
+import asyncio
+import json
+import logging
+import uuid
+from dataclasses import dataclass, field
+from typing import Any, Iterable, Optional
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.principal import Principal
+
+logger = logging.getLogger(__name__)
+
+# Channel events are published on
+EVENTS_CHANNEL = "app_events"
+
+# Sent instead of events a stream may have missed
+RESYNC = "resync"
+
+# Roles that see every event
+ALL_EVENTS_ROLES = frozenset({"admin"})
+
+# Tags events published by this process, so handlers can skip their own
+WORKER_ID = uuid.uuid4().hex
+
+
+@dataclass(frozen=True)
+class Event:
+    """
+    A state change and who may see it
+    
+    An event is visible to holders of any of its roles and to the listed
+    users; with neither set it is visible to every signed-in user.
+    """
+    
+    type: str
+    data: dict[str, Any]
+    roles: frozenset[str] = frozenset()
+    user_ids: frozenset[str] = frozenset()
+    origin: str = WORKER_ID
+    
+    @property
+    def is_local(self) -> bool:
+        """Check if this worker published the event"""
+        return self.origin == WORKER_ID
+    
+    def visible_to(self, principal: Principal) -> bool:
+        """Check if a user may receive this event"""
+        if principal.is_superuser or principal.roles & ALL_EVENTS_ROLES:
+            return True
+        if not self.roles and not self.user_ids:
+            return True
+        return bool(principal.roles & self.roles) or str(principal.id) in self.user_ids
+    
+    def to_payload(self) -> str:
+        return json.dumps(
+            {
+                "type": self.type,
+                "data": self.data,
+                "roles": sorted(self.roles),
+                "users": sorted(self.user_ids),
+                "origin": self.origin,
+            },
+            separators=(",", ":"),
+            default=str,
+        )
+    
+    @classmethod
+    def from_payload(cls, payload: str) -> "Event":
+        raw = json.loads(payload)
+        return cls(
+            type=raw["type"],
+            data=raw["data"],
+            roles=frozenset(raw.get("roles", ())),
+            user_ids=frozenset(raw.get("users", ())),
+            origin=raw.get("origin", ""),
+        )
+
+
+def event(event_type: str, data: dict[str, Any], roles: Iterable[str] = (), user_ids: Iterable[Any] = ()) -> Event:
+    """
+    Build an event
+    
+    Args:
+        event_type: Event name, e.g. "requirement.approved"
+        data: Small JSON-serializable body (IDs and new state, not full records)
+        roles: Roles that may see it
+        user_ids: Users that may see it (None entries are ignored)
+        
+    Returns:
+        Event
+    """
+    return Event(
+        type=event_type,
+        data=data,
+        roles=frozenset(roles),
+        user_ids=frozenset(str(user_id) for user_id in user_ids if user_id is not None),
+    )
+
+
+async def publish(db: AsyncSession, events: Iterable[Event]) -> None:
+    """
+    Queue events on the session's transaction
+    
+    All events go out in one statement and are delivered when the
+    transaction commits.
+    
+    Args:
+        db: Database session
+        events: Events to publish
+    """
+    payloads = [e.to_payload() for e in events]
+    if not payloads:
+        return
+    await db.execute(
+        text("SELECT pg_notify(:channel, payload) FROM unnest(CAST(:payloads AS text[])) AS payload"),
+        {"channel": EVENTS_CHANNEL, "payloads": payloads},
+    )
+
+
+@dataclass(eq=False)
+class Subscription:
+    """One open stream's queue of events"""
+    
+    principal: Principal
+    queue: asyncio.Queue = field(default_factory=lambda: asyncio.Queue(settings.EVENT_STREAM_QUEUE_SIZE))
+    
+    def offer(self, item: Event) -> None:
+        """Queue an event, replacing the backlog with a resync if the client fell behind"""
+        try:
+            self.queue.put_nowait(item)
+        except asyncio.QueueFull:
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(Event(type=RESYNC, data={"reason": "lagging"}))
+    
+    async def get(self) -> Event:
+        return await self.queue.get()
+
+
+class EventHub:
+    """Fans events received on EVENTS_CHANNEL out to this worker's streams"""
+    
+    def __init__(self):
+        self._subscriptions: set[Subscription] = set()
+        self.delivered = 0
+    
+    @property
+    def subscribers(self) -> int:
+        return len(self._subscriptions)
+    
+    def subscribe(self, principal: Principal) -> Subscription:
+        """Open a subscription; pair every call with unsubscribe()"""
+        subscription = Subscription(principal)
+        self._subscriptions.add(subscription)
+        return subscription
+    
+    def unsubscribe(self, subscription: Subscription) -> None:
+        self._subscriptions.discard(subscription)
+    
+    def dispatch(self, payload: Optional[str]) -> None:
+        """
+        Deliver a notification to every stream allowed to see it
+        
+        Args:
+            payload: Event payload, or None after the LISTEN connection
+                reconnected and events may have been lost
+        """
+        if payload is None:
+            item = Event(type=RESYNC, data={"reason": "reconnected"})
+        else:
+            try:
+                item = Event.from_payload(payload)
+            except (ValueError, KeyError, TypeError):
+                logger.warning(f"Ignoring malformed event payload: {payload[:200]!r}")
+                return
+        
+        for subscription in list(self._subscriptions):
+            if item.type == RESYNC or item.visible_to(subscription.principal):
+                subscription.offer(item)
+                self.delivered += 1
+
+
+event_hub = EventHub()
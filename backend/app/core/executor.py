@@ -0,0 +1,120 @@
+"""
+Bounded worker pools for CPU-bound work called from async handlers
+"""
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, TypeVar
+
+T = TypeVar("T")
+
+
+class PoolSaturatedError(Exception):
+    """Raised when a bounded pool rejects or times out a job"""
+
+
+class BoundedExecutor:
+    """
+    Thread pool with a bounded backlog, a per-job timeout and metrics
+    
+    Jobs beyond max_workers + max_queue in flight are rejected immediately
+    instead of piling up, so a burst degrades into fast 503s rather than
+    unbounded latency for every caller.
+    """
+    
+    def __init__(self, name: str, max_workers: int, max_queue: int, timeout: float):
+        """
+        Args:
+            name: Pool name used for thread names and metrics
+            max_workers: Number of worker threads
+            max_queue: Jobs allowed to wait for a free worker
+            timeout: Seconds a caller waits (queueing included) before giving up
+        """
+        self.name = name
+        self.max_workers = max_workers
+        self.capacity = max_workers + max_queue
+        self.timeout = timeout
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=name)
+        
+        self.in_flight = 0
+        self.submitted = 0
+        self.completed = 0
+        self.rejected = 0
+        self.timed_out = 0
+        self.wait_seconds_total = 0.0
+        self.run_seconds_total = 0.0
+    
+    async def run(self, func: Callable[..., T], *args: Any) -> T:
+        """
+        Run a function on the pool and await its result
+        
+        Args:
+            func: Blocking function to run
+            *args: Positional arguments for func
+            
+        Returns:
+            Result of func
+            
+        Raises:
+            PoolSaturatedError: If the backlog is full or the timeout expires
+        """
+        if self.in_flight >= self.capacity:
+            self.rejected += 1
+            raise PoolSaturatedError(f"{self.name} pool is saturated")
+        
+        loop = asyncio.get_running_loop()
+        submitted_at = time.perf_counter()
+        
+        def job() -> tuple[T, float, float]:
+            started_at = time.perf_counter()
+            result = func(*args)
+            return result, started_at, time.perf_counter()
+        
+        self.in_flight += 1
+        self.submitted += 1
+        future = loop.run_in_executor(self._executor, job)
+        # Release the slot when the thread is done, not when the caller
+        # stops waiting, so timed-out jobs still count against capacity
+        future.add_done_callback(lambda f: self._on_done(f, submitted_at))
+        
+        try:
+            result, _, _ = await asyncio.wait_for(asyncio.shield(future), self.timeout)
+        except asyncio.TimeoutError:
+            self.timed_out += 1
+            raise PoolSaturatedError(f"{self.name} pool timed out after {self.timeout}s")
+        
+        return result
+    
+    def _on_done(self, future: "asyncio.Future[tuple[Any, float, float]]", submitted_at: float) -> None:
+        """Update counters when a job finishes (runs on the event loop)"""
+        self.in_flight -= 1
+        if future.cancelled() or future.exception() is not None:
+            return
+        _, started_at, finished_at = future.result()
+        self.completed += 1
+        self.wait_seconds_total += started_at - submitted_at
+        self.run_seconds_total += finished_at - started_at
+    
+    def stats(self) -> dict[str, Any]:
+        """
+        Get pool metrics
+        
+        Returns:
+            Dict of gauges and counters
+        """
+        return {
+            "workers": self.max_workers,
+            "capacity": self.capacity,
+            "in_flight": self.in_flight,
+            "queued": max(self.in_flight - self.max_workers, 0),
+            "submitted": self.submitted,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "timed_out": self.timed_out,
+            "wait_seconds_total": self.wait_seconds_total,
+            "run_seconds_total": self.run_seconds_total,
+        }
+    
+    def shutdown(self) -> None:
+        """Stop accepting jobs and wait for running ones"""
+        self._executor.shutdown(wait=True, cancel_futures=True)
@@ -1,51 +1,154 @@
 """
 Logging configuration for the application
+
+Loggers only put records on a bounded queue; a background QueueListener
+thread formats records and writes them (stdout and the rotating log file),
+so request handlers never block on a write. When the queue is full new
+records are dropped and counted rather than stalling the event loop.
 """
+import atexit
+import copy
+import json
 import logging
+import logging.handlers
+import queue
+import random
 import sys
+from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any
+from typing import Optional
 
 from app.core.config import settings
 
+# Logger for the per-request access line, sampled via LOG_SAMPLE_RATES
+ACCESS_LOGGER = "app.access"
+
+# Attributes every LogRecord has; anything else was passed with extra=
+_RECORD_ATTRS = set(vars(logging.makeLogRecord({}))) | {"message", "asctime", "taskName"}
+
+_listener: Optional["_QueueListener"] = None
+
+_traceback_formatter = logging.Formatter()
+
+
+class JsonFormatter(logging.Formatter):
+    """Format records as one JSON object per line"""
+    
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "timestamp": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRS:
+                entry[key] = value
+        if record.exc_text:
+            entry["exception"] = record.exc_text
+        elif record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+class DroppingQueueHandler(logging.handlers.QueueHandler):
+    """Queue handler that drops records instead of blocking when full"""
+    
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+    
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Merge args and render the traceback now (they may not outlive the
+        # call), but leave formatting to the sinks' formatters
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = _traceback_formatter.formatException(record.exc_info)
+            record.exc_info = None
+        return record
+    
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class _QueueListener(logging.handlers.QueueListener):
+    """Queue listener whose stop() waits for room in a full queue"""
+    
+    def enqueue_sentinel(self) -> None:
+        self.queue.put(self._sentinel)
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Keep a share of a logger's records below WARNING
+    
+    Warnings and errors always pass, so sampling only thins out routine
+    lines such as the per-request access log.
+    """
+    
+    def __init__(self, rate: float):
+        super().__init__()
+        self.rate = rate
+    
+    def filter(self, record: logging.LogRecord) -> bool:
+        return record.levelno >= logging.WARNING or random.random() < self.rate
+
+
+def _make_formatter() -> logging.Formatter:
+    if settings.LOG_FORMAT.lower() == "json":
+        return JsonFormatter()
+    return logging.Formatter(settings.LOG_FORMAT)
+
 
 def setup_logging() -> None:
     """Configure logging for the application"""
+    global _listener
     
     # Determine log level from settings
     log_level = getattr(logging, settings.LOG_LEVEL.upper(), logging.INFO)
-    
-    # Create logs directory if it doesn't exist
-    if settings.LOG_FILE_PATH:
-        log_dir = Path(settings.LOG_FILE_PATH).parent
-        log_dir.mkdir(parents=True, exist_ok=True)
-    
-    # Configure root logger
-    logging.basicConfig(
-        level=log_level,
-        format=settings.LOG_FORMAT,
-        handlers=[],
-        force=True  # Force reconfiguration
-    )
+    formatter = _make_formatter()
     
     # Console handler (stdout)
     console_handler = logging.StreamHandler(sys.stdout)
-    console_handler.setLevel(log_level)
-    console_formatter = logging.Formatter(settings.LOG_FORMAT)
-    console_handler.setFormatter(console_formatter)
+    console_handler.setFormatter(formatter)
     
-    # File handler (if enabled)
-    handlers = [console_handler]
+    # Rotating file handler (if enabled)
+    handlers: list[logging.Handler] = [console_handler]
     if settings.LOG_FILE_ENABLED and settings.LOG_FILE_PATH:
-        file_handler = logging.FileHandler(settings.LOG_FILE_PATH)
-        file_handler.setLevel(log_level)
-        file_formatter = logging.Formatter(settings.LOG_FORMAT)
-        file_handler.setFormatter(file_formatter)
+        Path(settings.LOG_FILE_PATH).parent.mkdir(parents=True, exist_ok=True)
+        file_handler = logging.handlers.RotatingFileHandler(
+            settings.LOG_FILE_PATH,
+            maxBytes=settings.LOG_FILE_MAX_BYTES,
+            backupCount=settings.LOG_FILE_BACKUP_COUNT,
+            encoding="utf-8",
+        )
+        file_handler.setFormatter(formatter)
         handlers.append(file_handler)
     
-    # Configure root logger with handlers
+    # Reconfiguring replaces the previous writer thread
+    shutdown_logging()
+    
+    # The sinks only run on the listener thread
+    log_queue: queue.Queue = queue.Queue(maxsize=settings.LOG_QUEUE_SIZE)
+    _listener = _QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+    
+    # Configure root logger with the queue as its only handler
     root_logger = logging.getLogger()
-    root_logger.handlers = handlers
+    root_logger.handlers = [DroppingQueueHandler(log_queue)]
+    root_logger.setLevel(log_level)
+    
+    # Per-logger sampling of routine records
+    for name, rate in settings.LOG_SAMPLE_RATES.items():
+        target = logging.getLogger(name)
+        target.filters = [f for f in target.filters if not isinstance(f, SamplingFilter)]
+        if rate < 1:
+            target.addFilter(SamplingFilter(rate))
     
     # Set log levels for third-party libraries
     logging.getLogger("uvicorn").setLevel(logging.WARNING)
@@ -57,6 +160,27 @@ def setup_logging() -> None:
     logger.info(f"Logging configured - Level: {settings.LOG_LEVEL}, File: {settings.LOG_FILE_ENABLED}")
 
 
+def shutdown_logging() -> None:
+    """Flush queued records and stop the writer thread"""
+    global _listener
+    
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+def dropped_records() -> int:
+    """Get the number of log records dropped because the queue was full"""
+    return sum(
+        handler.dropped
+        for handler in logging.getLogger().handlers
+        if isinstance(handler, DroppingQueueHandler)
+    )
+
+
+atexit.register(shutdown_logging)
+
+
 def get_logger(name: str) -> logging.Logger:
     """
     Get a logger instance for the given name
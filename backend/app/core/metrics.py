@@ -0,0 +1,291 @@
+"""
+In-process request metrics in the Prometheus text format
+
+Request metrics are plain ints and floats updated from the event loop
+thread without an await in between, so no locks are needed. Each worker
+process keeps its own registry; Prometheus sums the scraped workers.
+Gauges that are cheap to read (connection pools, worker pools) are
+collected when /metrics is scraped instead of being tracked per request.
+"""
+import time
+from bisect import bisect_left
+from typing import Callable, Iterable
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.database import engine, replica_router
+from app.core.db_metrics import current_stats
+from app.core.events import event_hub
+from app.core.logging_config import dropped_records
+from app.core.revocation import token_denylist
+from app.core.security import password_pool, verified_tokens
+
+# Latency buckets in seconds (the Prometheus client defaults)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+QUERY_TIME_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+
+# Route label for requests no route matched, so 404 scans stay one series
+UNMATCHED_ROUTE = "<unmatched>"
+
+Labels = tuple[tuple[str, str], ...]
+
+
+def _format_labels(labels: Labels, extra: str = "") -> str:
+    parts = [f'{name}="{value}"' for name, value in labels]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _format_value(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+class Histogram:
+    """Fixed-bucket histogram; counts are per bucket, made cumulative on render"""
+    
+    __slots__ = ("buckets", "counts", "sum", "count")
+    
+    def __init__(self, buckets: tuple[float, ...]):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # Last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+    
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+    
+    def render(self, name: str, labels: Labels) -> Iterable[str]:
+        cumulative = 0
+        for bound, count in zip(self.buckets, self.counts):
+            cumulative += count
+            le = f'le="{bound}"'
+            yield f"{name}_bucket{_format_labels(labels, le)} {cumulative}"
+        le = 'le="+Inf"'
+        yield f"{name}_bucket{_format_labels(labels, le)} {self.count}"
+        yield f"{name}_sum{_format_labels(labels)} {_format_value(self.sum)}"
+        yield f"{name}_count{_format_labels(labels)} {self.count}"
+
+
+class HistogramFamily:
+    """Histograms of one metric, one per label set"""
+    
+    def __init__(self, name: str, help_text: str, buckets: tuple[float, ...]):
+        self.name = name
+        self.help_text = help_text
+        self.buckets = buckets
+        self.series: dict[Labels, Histogram] = {}
+    
+    def observe(self, labels: Labels, value: float) -> None:
+        histogram = self.series.get(labels)
+        if histogram is None:
+            histogram = self.series[labels] = Histogram(self.buckets)
+        histogram.observe(value)
+    
+    def render(self) -> Iterable[str]:
+        yield f"# HELP {self.name} {self.help_text}"
+        yield f"# TYPE {self.name} histogram"
+        for labels, histogram in self.series.items():
+            yield from histogram.render(self.name, labels)
+
+
+class CounterFamily:
+    """Monotonic counters of one metric, one per label set"""
+    
+    def __init__(self, name: str, help_text: str):
+        self.name = name
+        self.help_text = help_text
+        self.series: dict[Labels, float] = {}
+    
+    def inc(self, labels: Labels, amount: float = 1) -> None:
+        self.series[labels] = self.series.get(labels, 0) + amount
+    
+    def render(self) -> Iterable[str]:
+        yield f"# HELP {self.name} {self.help_text}"
+        yield f"# TYPE {self.name} counter"
+        for labels, value in self.series.items():
+            yield f"{self.name}{_format_labels(labels)} {_format_value(value)}"
+
+
+# A collector returns (name, type, help, [(labels, value), ...]) at scrape time
+Sample = tuple[str, str, str, list[tuple[Labels, float]]]
+Collector = Callable[[], Iterable[Sample]]
+
+
+class MetricsRegistry:
+    """Request metrics of this process plus collectors read on scrape"""
+    
+    def __init__(self):
+        self.in_flight = 0
+        self.requests = CounterFamily(
+            "http_requests_total", "Requests by route and status code"
+        )
+        self.latency = HistogramFamily(
+            "http_request_duration_seconds", "Request latency by route", LATENCY_BUCKETS
+        )
+        self.db_queries = HistogramFamily(
+            "http_request_db_queries", "Database statements per request by route", QUERY_COUNT_BUCKETS
+        )
+        self.db_seconds = HistogramFamily(
+            "http_request_db_seconds", "Time spent in database statements per request by route", QUERY_TIME_BUCKETS
+        )
+        self._collectors: list[Collector] = []
+    
+    def add_collector(self, collector: Collector) -> None:
+        """
+        Register a function whose samples are read on every scrape
+        
+        Args:
+            collector: Callable returning (name, type, help, samples) tuples
+        """
+        self._collectors.append(collector)
+    
+    def observe_request(self, method: str, route: str, status: int, seconds: float) -> None:
+        """
+        Record a finished request
+        
+        Args:
+            method: HTTP method
+            route: Route template, e.g. /api/v1/requirements/{requirement_id}
+            status: Response status code
+            seconds: Time until the response body was sent
+        """
+        labels = (("method", method), ("route", route))
+        self.requests.inc(labels + (("status", str(status)),))
+        self.latency.observe(labels, seconds)
+        
+        stats = current_stats()
+        if stats is not None:
+            self.db_queries.observe(labels, stats.queries)
+            self.db_seconds.observe(labels, stats.query_seconds)
+    
+    def render(self) -> str:
+        """
+        Render every metric in the Prometheus text exposition format
+        
+        Returns:
+            Metrics page body
+        """
+        lines = [
+            "# HELP http_requests_in_flight Requests currently being served",
+            "# TYPE http_requests_in_flight gauge",
+            f"http_requests_in_flight {self.in_flight}",
+        ]
+        for family in (self.requests, self.latency, self.db_queries, self.db_seconds):
+            lines.extend(family.render())
+        
+        for collector in self._collectors:
+            for name, metric_type, help_text, samples in collector():
+                lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} {metric_type}")
+                for labels, value in samples:
+                    lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+        
+        lines.append("")
+        return "\n".join(lines)
+
+
+def collect_db_pools() -> Iterable[Sample]:
+    """Connection pool gauges of the primary and every replica"""
+    pools = [((("database", "primary"),), engine.pool)]
+    pools += [
+        ((("database", f"replica{i}"),), replica.engine.pool)
+        for i, replica in enumerate(replica_router.replicas)
+    ]
+    
+    for name, help_text, read in (
+        ("db_pool_size", "Configured connection pool size", lambda pool: pool.size()),
+        ("db_pool_checked_out", "Connections currently in use", lambda pool: pool.checkedout()),
+        ("db_pool_checked_in", "Idle connections in the pool", lambda pool: pool.checkedin()),
+        ("db_pool_overflow", "Connections open beyond the pool size", lambda pool: max(pool.overflow(), 0)),
+    ):
+        yield name, "gauge", help_text, [(labels, read(pool)) for labels, pool in pools]
+
+
+def collect_worker_pools() -> Iterable[Sample]:
+    """Gauges and counters of the bounded worker pools"""
+    labels = (("pool", password_pool.name),)
+    stats = password_pool.stats()
+    for key in ("workers", "capacity", "in_flight", "queued"):
+        yield f"worker_pool_{key}", "gauge", f"Worker pool {key.replace('_', ' ')}", [(labels, stats[key])]
+    for key in ("submitted", "completed", "rejected", "timed_out", "wait_seconds_total", "run_seconds_total"):
+        name = key if key.endswith("_total") else f"{key}_total"
+        yield f"worker_pool_{name}", "counter", f"Worker pool {key.replace('_', ' ')}", [(labels, stats[key])]
+
+
+def collect_logging() -> Iterable[Sample]:
+    """Log records lost to a full logging queue"""
+    yield "log_records_dropped_total", "counter", "Log records dropped because the queue was full", [((), dropped_records())]
+
+
+def collect_event_streams() -> Iterable[Sample]:
+    """Open Server-Sent Event streams and events handed to them"""
+    yield "event_streams_open", "gauge", "Open Server-Sent Event streams", [((), event_hub.subscribers)]
+    yield "events_delivered_total", "counter", "Events queued to streams", [((), event_hub.delivered)]
+
+
+def collect_denylist() -> Iterable[Sample]:
+    """Revoked token and family IDs held in memory"""
+    yield "revoked_tokens_cached", "gauge", "Unexpired revoked token IDs in the denylist", [((), len(token_denylist))]
+
+
+def collect_token_cache() -> Iterable[Sample]:
+    """Verified access token cache size and lookups"""
+    stats = verified_tokens.stats()
+    yield "verified_tokens_cached", "gauge", "Verified tokens cached until they expire", [((), stats["size"])]
+    yield "verified_token_cache_hits_total", "counter", "Token verifications answered from the cache", [((), stats["hits"])]
+    yield "verified_token_cache_misses_total", "counter", "Token verifications that decoded the token", [((), stats["misses"])]
+
+
+metrics = MetricsRegistry()
+metrics.add_collector(collect_db_pools)
+metrics.add_collector(collect_worker_pools)
+metrics.add_collector(collect_logging)
+metrics.add_collector(collect_event_streams)
+metrics.add_collector(collect_denylist)
+metrics.add_collector(collect_token_cache)
+
+
+class MetricsMiddleware:
+    """
+    Record latency, status and database work of every HTTP request
+    
+    Must run inside DatabaseRoundTripMiddleware so the request's database
+    stats are available when the request finishes.
+    """
+    
+    def __init__(self, app: ASGIApp, registry: MetricsRegistry = metrics):
+        self.app = app
+        self.registry = registry
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        status_code = 500  # Reported if the app fails before responding
+        
+        async def send_with_status(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+        
+        self.registry.in_flight += 1
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            self.registry.in_flight -= 1
+            # The router stores the matched route in the scope; its path is
+            # the template, which keeps label cardinality bounded
+            route = scope.get("route")
+            self.registry.observe_request(
+                scope["method"],
+                getattr(route, "path", UNMATCHED_ROUTE),
+                status_code,
+                time.perf_counter() - start,
+            )
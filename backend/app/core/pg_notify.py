@@ -0,0 +1,145 @@
+"""
+Postgres LISTEN/NOTIFY fan-out across worker processes
+
+Each worker keeps one dedicated asyncpg connection (outside the SQLAlchemy
+pool) listening on the subscribed channels. If that connection drops it is
+re-established with backoff, and every handler is called with a None
+payload because notifications sent in the meantime were lost.
+"""
+import asyncio
+import inspect
+import logging
+from collections import defaultdict
+from typing import Any, Awaitable, Callable, Optional, Union
+
+import asyncpg
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+NotifyHandler = Callable[[Optional[str]], Union[None, Awaitable[None]]]
+
+RECONNECT_MAX_DELAY_SECONDS = 30.0
+
+
+def _asyncpg_dsn(database_url: str) -> str:
+    """Strip the SQLAlchemy driver suffix from a database URL"""
+    return database_url.replace("postgresql+asyncpg://", "postgresql://", 1)
+
+
+async def notify(db: AsyncSession, channel: str, payload: str = "") -> None:
+    """
+    Queue a notification on the session's transaction
+    
+    Postgres delivers it when the transaction commits, and drops it on rollback.
+    
+    Args:
+        db: Database session
+        channel: Channel name
+        payload: Notification payload (under 8000 bytes)
+    """
+    await db.execute(
+        text("SELECT pg_notify(:channel, :payload)"),
+        {"channel": channel, "payload": payload},
+    )
+
+
+class PgNotifyListener:
+    """Dispatches notifications from a dedicated connection to handlers"""
+    
+    def __init__(self, dsn: str):
+        self._dsn = dsn
+        self._handlers: dict[str, list[NotifyHandler]] = defaultdict(list)
+        self._connection: Optional[asyncpg.Connection] = None
+        self._reconnect_task: Optional[asyncio.Task] = None
+        self._dispatch_tasks: set[asyncio.Task] = set()
+        self._stopping = False
+    
+    def subscribe(self, channel: str, handler: NotifyHandler) -> None:
+        """
+        Register a handler for a channel
+        
+        Subscribe before start(); the handler receives the payload, or None
+        after a reconnect when notifications may have been missed.
+        
+        Args:
+            channel: Channel name
+            handler: Sync or async callable
+        """
+        self._handlers[channel].append(handler)
+    
+    async def start(self) -> None:
+        """Connect and start listening; retries in the background on failure"""
+        self._stopping = False
+        try:
+            await self._connect()
+        except (OSError, asyncpg.PostgresError) as e:
+            logger.warning(f"LISTEN connection failed, retrying in background: {e}")
+            self._schedule_reconnect()
+    
+    async def stop(self) -> None:
+        """Stop listening and close the connection"""
+        self._stopping = True
+        if self._reconnect_task:
+            self._reconnect_task.cancel()
+            self._reconnect_task = None
+        if self._connection and not self._connection.is_closed():
+            await self._connection.close()
+        self._connection = None
+    
+    async def _connect(self) -> None:
+        """Open the listening connection and LISTEN on every channel"""
+        connection = await asyncpg.connect(self._dsn)
+        connection.add_termination_listener(self._on_terminated)
+        for channel in self._handlers:
+            await connection.add_listener(channel, self._on_notification)
+        self._connection = connection
+    
+    def _on_terminated(self, connection: asyncpg.Connection) -> None:
+        """Reconnect after the server or network closed the connection"""
+        if not self._stopping:
+            logger.warning("LISTEN connection lost, reconnecting")
+            self._schedule_reconnect()
+    
+    def _schedule_reconnect(self) -> None:
+        if self._reconnect_task is None or self._reconnect_task.done():
+            self._reconnect_task = asyncio.create_task(self._reconnect())
+    
+    async def _reconnect(self) -> None:
+        """Retry with exponential backoff, then tell handlers to resync"""
+        delay = 1.0
+        while not self._stopping:
+            try:
+                await self._connect()
+                break
+            except (OSError, asyncpg.PostgresError) as e:
+                logger.warning(f"LISTEN reconnect failed, retrying in {delay:.0f}s: {e}")
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, RECONNECT_MAX_DELAY_SECONDS)
+        
+        if self._stopping:
+            return
+        for channel in self._handlers:
+            await self._dispatch(channel, None)
+    
+    def _on_notification(self, connection: Any, pid: int, channel: str, payload: str) -> None:
+        # Keep a reference so the task is not garbage collected mid-run
+        task = asyncio.create_task(self._dispatch(channel, payload))
+        self._dispatch_tasks.add(task)
+        task.add_done_callback(self._dispatch_tasks.discard)
+    
+    async def _dispatch(self, channel: str, payload: Optional[str]) -> None:
+        """Run every handler of a channel, isolating their failures"""
+        for handler in self._handlers.get(channel, []):
+            try:
+                result = handler(payload)
+                if inspect.isawaitable(result):
+                    await result
+            except Exception:
+                logger.exception(f"Handler for '{channel}' notification failed")
+
+
+pg_listener = PgNotifyListener(_asyncpg_dsn(settings.DATABASE_URL))
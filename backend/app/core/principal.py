@@ -0,0 +1,101 @@
+"""
+Authenticated principal snapshot and its process-local cache
+
+Account and role changes are announced on PRINCIPALS_CHANNEL, so every
+worker drops the user's cached principal when the change commits.
+"""
+from dataclasses import dataclass
+from typing import Optional
+from uuid import UUID
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.pg_notify import notify
+
+# Channel principal invalidations are announced on
+PRINCIPALS_CHANNEL = "principals_changed"
+
+
+@dataclass(frozen=True, slots=True)
+class Principal:
+    """
+    Immutable snapshot of the authenticated user
+    
+    Holds just enough to authorize a request, so endpoints can use it
+    without a database session.
+    """
+    
+    id: UUID
+    is_active: bool
+    is_superuser: bool
+    roles: frozenset[str]
+    
+    @classmethod
+    def from_user(cls, user) -> "Principal":
+        """
+        Build a snapshot from a User loaded with its roles
+        
+        Args:
+            user: User instance with roles eagerly loaded
+            
+        Returns:
+            Principal snapshot
+        """
+        return cls(
+            id=user.id,
+            is_active=user.is_active,
+            is_superuser=user.is_superuser,
+            roles=frozenset(role.name for role in user.roles),
+        )
+    
+    def has_role(self, role_name: str) -> bool:
+        """Check if the principal has the given role"""
+        return role_name in self.roles
+
+
+# Principals keyed by user ID (as string, matching the JWT "sub" claim)
+principal_cache: TTLCache[str, Principal] = TTLCache(
+    maxsize=settings.PRINCIPAL_CACHE_MAX_SIZE,
+    ttl=settings.PRINCIPAL_CACHE_TTL_SECONDS,
+)
+
+
+def invalidate_principal(user_id: str | UUID) -> None:
+    """
+    Drop the cached principal for a user after its account or roles change
+    
+    Args:
+        user_id: User UUID
+    """
+    principal_cache.pop(str(user_id))
+
+
+async def notify_principal_changed(db: AsyncSession, user_id: str | UUID) -> None:
+    """
+    Announce a user's account or role change to every worker
+    
+    Queued on the session's transaction, so workers drop the principal
+    only once the change commits. Call before committing, and
+    invalidate_principal() after it for this worker.
+    
+    Args:
+        db: Database session holding the change
+        user_id: User UUID
+    """
+    await notify(db, PRINCIPALS_CHANNEL, str(user_id))
+
+
+def on_principal_changed(payload: Optional[str]) -> None:
+    """
+    Drop a principal announced by any worker
+    
+    Args:
+        payload: User ID, or None after a reconnect, when every cached
+            principal is dropped since announcements may have been lost
+    """
+    if payload is None:
+        principal_cache.clear()
+    else:
+        principal_cache.pop(payload)
@@ -0,0 +1,210 @@
+"""
+Token revocation checked in memory
+
+Revoked token IDs (jti) and token family IDs are stored in
+revoked_tokens and mirrored in every worker's TokenDenylist, so checking
+a token costs a dict lookup instead of a query. A revocation NOTIFYs the
+other workers in the revoking transaction; after a lost LISTEN
+connection the denylist is reloaded from the table.
+
+Entries are filed in buckets by expiry time and dropped a bucket at a
+time once the tokens they cover have expired, so the denylist only ever
+holds revocations of still-valid tokens.
+"""
+import logging
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Awaitable, Optional
+from uuid import UUID
+
+from sqlalchemy import column, delete, func, select, table
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.database import async_session_maker
+from app.core.pg_notify import notify
+
+logger = logging.getLogger(__name__)
+
+# Channel revocations are announced on
+REVOKED_TOKENS_CHANNEL = "tokens_revoked"
+
+# Expiry bucket width; expired entries linger at most this long
+BUCKET_SECONDS = 300
+
+# Why a token or family was revoked (revoked_tokens.reason)
+REASON_LOGOUT = "logout"
+REASON_ROTATED = "rotated"
+REASON_REUSED = "reuse_detected"
+
+revoked_tokens = table(
+    "revoked_tokens",
+    column("token_id"),
+    column("expires_at"),
+    column("user_id"),
+    column("reason"),
+    column("revoked_at"),
+)
+
+
+class TokenDenylist:
+    """Revoked IDs with their expiry, swept per expiry bucket"""
+    
+    def __init__(self, bucket_seconds: int = BUCKET_SECONDS):
+        self._bucket_seconds = bucket_seconds
+        self._expiry: dict[str, float] = {}
+        self._buckets: dict[int, list[str]] = {}
+        self._next_sweep = 0.0
+    
+    def __len__(self) -> int:
+        return len(self._expiry)
+    
+    def add(self, token_id: str, expires_at: float) -> None:
+        """
+        Deny an ID until an expiry time
+        
+        Args:
+            token_id: Token ID or token family ID
+            expires_at: Unix time after which no token it covers is valid
+        """
+        if expires_at <= time.time() or self._expiry.get(token_id, 0.0) >= expires_at:
+            return
+        self._expiry[token_id] = expires_at
+        self._buckets.setdefault(int(expires_at // self._bucket_seconds), []).append(token_id)
+    
+    def is_revoked(self, *token_ids: Optional[str]) -> bool:
+        """
+        Check token claims against the denylist
+        
+        Args:
+            token_ids: The token's jti and fam claims (None entries are skipped)
+            
+        Returns:
+            True if any of them was revoked
+        """
+        now = time.time()
+        if now >= self._next_sweep:
+            self._sweep(now)
+        return any(token_id in self._expiry for token_id in token_ids if token_id is not None)
+    
+    def update(self, entries: list[tuple[str, float]]) -> None:
+        """
+        Add entries, e.g. after reloading from the table
+        
+        Revocations are never lifted, so merging keeps any that arrived
+        while the reload ran.
+        """
+        for token_id, expires_at in entries:
+            self.add(token_id, expires_at)
+    
+    def _sweep(self, now: float) -> None:
+        """Drop buckets that lie entirely in the past"""
+        current = int(now // self._bucket_seconds)
+        cutoff = current * self._bucket_seconds
+        for bucket in [bucket for bucket in self._buckets if bucket < current]:
+            for token_id in self._buckets.pop(bucket):
+                # Skip IDs re-added later with a longer expiry
+                if self._expiry.get(token_id, cutoff) < cutoff:
+                    del self._expiry[token_id]
+        self._next_sweep = (current + 1) * self._bucket_seconds
+
+
+token_denylist = TokenDenylist()
+
+
+def family_expires_at() -> datetime:
+    """Latest expiry of any token a family revoked now could still have"""
+    return datetime.now(timezone.utc) + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
+
+
+async def revoke(
+    db: AsyncSession,
+    token_id: str,
+    expires_at: datetime,
+    reason: str,
+    user_id: Optional[UUID | str] = None,
+) -> bool:
+    """
+    Revoke a token ID or token family ID
+    
+    The row and the notification to every worker take effect when the
+    caller commits.
+    
+    Args:
+        db: Database session
+        token_id: jti or fam claim
+        expires_at: When the tokens it covers expire
+        reason: REASON_* constant
+        user_id: Owner of the tokens
+        
+    Returns:
+        False if the ID was already revoked
+    """
+    inserted = await db.scalar(
+        insert(revoked_tokens)
+        .values(token_id=token_id, expires_at=expires_at, user_id=user_id, reason=reason)
+        .on_conflict_do_nothing(index_elements=["token_id"])
+        .returning(revoked_tokens.c.token_id)
+    )
+    if inserted is None:
+        return False
+    
+    await notify(db, REVOKED_TOKENS_CHANNEL, f"{token_id} {expires_at.timestamp():.0f}")
+    return True
+
+
+async def rotated_within(db: AsyncSession, token_id: str, seconds: int) -> bool:
+    """
+    Check if a refresh token was rotated in the last few seconds
+    
+    Clients that refresh from several requests at once present the same
+    token more than once; that is not reuse by someone else.
+    
+    Args:
+        db: Database session
+        token_id: jti claim of the refresh token
+        seconds: Grace window
+        
+    Returns:
+        True if the token was exchanged within the window
+    """
+    rotated = await db.scalar(
+        select(revoked_tokens.c.token_id).where(
+            revoked_tokens.c.token_id == token_id,
+            revoked_tokens.c.reason == REASON_ROTATED,
+            revoked_tokens.c.revoked_at > func.now() - timedelta(seconds=seconds),
+        )
+    )
+    return rotated is not None
+
+
+async def load_denylist() -> None:
+    """Purge expired revocations and load the rest into the denylist"""
+    async with async_session_maker() as session:
+        await session.execute(delete(revoked_tokens).where(revoked_tokens.c.expires_at < func.now()))
+        rows = await session.execute(select(revoked_tokens.c.token_id, revoked_tokens.c.expires_at))
+        entries = [(str(token_id), expires_at.timestamp()) for token_id, expires_at in rows]
+        await session.commit()
+    
+    token_denylist.update(entries)
+    logger.info(f"Token denylist loaded ({len(token_denylist)} revoked)")
+
+
+def on_revocation(payload: Optional[str]) -> Optional[Awaitable[None]]:
+    """
+    Apply a revocation announced by any worker
+    
+    Args:
+        payload: "<token id> <expiry unix time>", or None after a
+            reconnect, when the denylist is reloaded instead
+    """
+    if payload is None:
+        return load_denylist()
+    
+    try:
+        token_id, expires_at = payload.split(" ")
+        token_denylist.add(token_id, float(expires_at))
+    except ValueError:
+        logger.warning(f"Ignoring malformed revocation payload: {payload!r}")
+    return None
@@ -3,23 +3,45 @@ Security utilities for authentication and authorization
 """
 from datetime import datetime, timedelta, timezone
 from typing import Any, Optional
+from uuid import uuid4
 
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 
+from app.core.cache import TTLCache
 from app.core.config import settings
+from app.core.executor import BoundedExecutor
 
 # Password hashing context
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+# bcrypt takes ~250 ms of CPU per call; run it on a small dedicated pool so
+# a login burst queues (and eventually sheds) there instead of on the loop
+password_pool = BoundedExecutor(
+    name="password-hash",
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    max_queue=settings.PASSWORD_HASH_QUEUE_SIZE,
+    timeout=settings.PASSWORD_HASH_TIMEOUT_SECONDS,
+)
 
-def create_access_token(subject: str, expires_delta: Optional[timedelta] = None) -> str:
+
+def new_token_id() -> str:
+    """Generate a token ID (jti) or token family ID (fam)"""
+    return str(uuid4())
+
+
+def create_access_token(
+    subject: str,
+    expires_delta: Optional[timedelta] = None,
+    family: Optional[str] = None,
+) -> str:
     """
     Create a JWT access token
     
     Args:
         subject: Subject identifier (usually user ID)
         expires_delta: Optional custom expiration time
+        family: Token family (login session) the token belongs to
         
     Returns:
         Encoded JWT token string
@@ -29,19 +51,29 @@ def create_access_token(subject: str, expires_delta: Optional[timedelta] = None)
     else:
         expire = datetime.now(timezone.utc) + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     
-    to_encode = {"exp": expire, "sub": subject, "type": "access"}
+    to_encode = {"exp": expire, "sub": subject, "type": "access", "jti": new_token_id()}
+    if family:
+        to_encode["fam"] = family
     encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
     
     return encoded_jwt
 
 
-def create_refresh_token(subject: str, expires_delta: Optional[timedelta] = None) -> str:
+def create_refresh_token(
+    subject: str,
+    expires_delta: Optional[timedelta] = None,
+    family: Optional[str] = None,
+) -> str:
     """
     Create a JWT refresh token
     
+    Refresh tokens rotate: each one is exchanged once for a new token of
+    the same family, and revoking the family ends the login session.
+    
     Args:
         subject: Subject identifier (usually user ID)
         expires_delta: Optional custom expiration time
+        family: Token family to continue (a new family when omitted)
         
     Returns:
         Encoded JWT refresh token string
@@ -51,7 +83,13 @@ def create_refresh_token(subject: str, expires_delta: Optional[timedelta] = None
     else:
         expire = datetime.now(timezone.utc) + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
     
-    to_encode = {"exp": expire, "sub": subject, "type": "refresh"}
+    to_encode = {
+        "exp": expire,
+        "sub": subject,
+        "type": "refresh",
+        "jti": new_token_id(),
+        "fam": family or new_token_id(),
+    }
     encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
     
     return encoded_jwt
@@ -74,21 +112,93 @@ def decode_token(token: str) -> dict[str, Any]:
     return payload
 
 
+class VerifiedTokenCache:
+    """
+    Claims of already verified tokens, keyed by their signature
+    
+    A client sends the same token many times during its lifetime; after
+    the first full decode, later calls are a dict lookup. A hit still has
+    to match the cached header and payload exactly, entries expire with
+    the token's exp, and the cache empties itself when SECRET_KEY or
+    ALGORITHM change.
+    """
+    
+    def __init__(self, maxsize: int):
+        self._cache: TTLCache[str, tuple[str, dict[str, Any]]] = TTLCache(maxsize=maxsize, ttl=0)
+        self._key = (settings.SECRET_KEY, settings.ALGORITHM)
+    
+    def get(self, token: str) -> Optional[dict[str, Any]]:
+        """
+        Get the claims of a token verified before
+        
+        Args:
+            token: JWT token string
+            
+        Returns:
+            Copy of the decoded claims, or None on a miss
+        """
+        if self._key != (settings.SECRET_KEY, settings.ALGORITHM):
+            self.flush()
+        
+        signing_input, _, signature = token.rpartition(".")
+        entry = self._cache.get(signature)
+        if entry is None or entry[0] != signing_input:
+            return None
+        return dict(entry[1])
+    
+    def set(self, token: str, claims: dict[str, Any]) -> None:
+        """
+        Remember a verified token until it expires
+        
+        Args:
+            token: JWT token string
+            claims: Its decoded claims
+        """
+        exp = claims.get("exp")
+        if not isinstance(exp, (int, float)):
+            return
+        ttl = exp - datetime.now(timezone.utc).timestamp()
+        if ttl <= 0:
+            return
+        signing_input, _, signature = token.rpartition(".")
+        self._cache.set(signature, (signing_input, dict(claims)), ttl=ttl)
+    
+    def flush(self) -> None:
+        """Forget every token, e.g. after the signing key rotated"""
+        self._cache.clear()
+        self._key = (settings.SECRET_KEY, settings.ALGORITHM)
+    
+    def stats(self) -> dict[str, int]:
+        return {"size": len(self._cache), "hits": self._cache.hits, "misses": self._cache.misses}
+
+
+verified_tokens = VerifiedTokenCache(settings.TOKEN_CACHE_MAX_SIZE)
+
+
 def verify_token(token: str) -> Optional[dict[str, Any]]:
     """
     Verify and decode a JWT token
     
+    Tokens verified before are answered from verified_tokens without
+    decoding or checking the signature again.
+    
     Args:
         token: JWT token string
         
     Returns:
         Decoded token payload or None if invalid
     """
+    payload = verified_tokens.get(token)
+    if payload is not None:
+        return payload
+    
     try:
         payload = decode_token(token)
-        return payload
     except JWTError:
         return None
+    
+    verified_tokens.set(token, payload)
+    return payload
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
@@ -121,6 +231,39 @@ def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
 
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """
+    Verify a password on the password hashing pool
+    
+    Args:
+        plain_password: Plain text password
+        hashed_password: Hashed password
+        
+    Returns:
+        True if password matches, False otherwise
+        
+    Raises:
+        PoolSaturatedError: If the pool is full or the wait times out
+    """
+    return await password_pool.run(verify_password, plain_password, hashed_password)
+
+
+async def get_password_hash_async(password: str) -> str:
+    """
+    Hash a password on the password hashing pool
+    
+    Args:
+        password: Plain text password
+        
+    Returns:
+        Hashed password string
+        
+    Raises:
+        PoolSaturatedError: If the pool is full or the wait times out
+    """
+    return await password_pool.run(get_password_hash, password)
+
+
 def validate_password_strength(password: str) -> tuple[bool, Optional[str]]:
     """
     Validate password against security policy
@@ -7,15 +7,29 @@ from contextlib import asynccontextmanager
 
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse
 
 from app.api.v1 import api_router
 from app.core.config import settings
-from app.core.logging_config import setup_logging
+from app.core.database import close_db
+from app.core.db_metrics import DatabaseRoundTripMiddleware
+from app.core.events import EVENTS_CHANNEL, event_hub
+from app.core.executor import PoolSaturatedError
+from app.core.logging_config import ACCESS_LOGGER, setup_logging, shutdown_logging
+from app.core.metrics import MetricsMiddleware, metrics
+from app.core.pg_notify import pg_listener
+from app.core.principal import PRINCIPALS_CHANNEL, on_principal_changed
+from app.core.revocation import REVOKED_TOKENS_CHANNEL, load_denylist, on_revocation
+from app.core.security import password_pool
+from app.services.approval_workflow import APPROVAL_RULES_CHANNEL, approval_workflow
+from app.services.posting_service import POSTINGS_CHANNEL, invalidate_posting_caches
+from app.services.reference_data import REFERENCE_DATA_CHANNEL, reference_data_cache
+from app.services.skill_matching import skill_index
 
 # Setup logging
 setup_logging()
 logger = logging.getLogger(__name__)
+access_logger = logging.getLogger(ACCESS_LOGGER)
 
 
 @asynccontextmanager
@@ -29,10 +43,34 @@ async def lifespan(app: FastAPI):
     logger.info(f"API Docs: http://localhost:8000/docs")
     logger.info(f"CORS Origins: {settings.BACKEND_CORS_ORIGINS}")
     
+    # Warm the reference data cache and approval rules; a failure here is retried on first use
+    try:
+        await reference_data_cache.load()
+        await approval_workflow.load()
+    except Exception as e:
+        logger.warning(f"Cache preload failed: {e}")
+    
+    # Revoked tokens are checked in memory only, so they must be loaded before serving
+    await load_denylist()
+    
+    # Invalidations from other workers and database triggers
+    pg_listener.subscribe(REFERENCE_DATA_CHANNEL, reference_data_cache.invalidate)
+    pg_listener.subscribe(APPROVAL_RULES_CHANNEL, approval_workflow.invalidate)
+    pg_listener.subscribe(POSTINGS_CHANNEL, invalidate_posting_caches)
+    pg_listener.subscribe(EVENTS_CHANNEL, event_hub.dispatch)
+    pg_listener.subscribe(EVENTS_CHANNEL, skill_index.on_event)
+    pg_listener.subscribe(REVOKED_TOKENS_CHANNEL, on_revocation)
+    pg_listener.subscribe(PRINCIPALS_CHANNEL, on_principal_changed)
+    await pg_listener.start()
+    
     yield
     
     # Shutdown
     logger.info(f"Shutting down {settings.APP_NAME}")
+    await pg_listener.stop()
+    await close_db()
+    password_pool.shutdown()
+    shutdown_logging()
 
 
 # Create FastAPI application
@@ -55,22 +93,36 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Per-route request metrics; added first so it runs inside the database
+# stats middleware and sees the request's full query count
+app.add_middleware(MetricsMiddleware)
+
+# Count database work per request (X-DB-Round-Trips and X-DB-Queries headers)
+app.add_middleware(DatabaseRoundTripMiddleware)
+
 
 # Request logging middleware
 @app.middleware("http")
 async def log_requests(request: Request, call_next):
-    """Log all HTTP requests"""
-    start_time = time.time()
-    
-    # Log request
-    logger.debug(f"→ {request.method} {request.url.path} - Client: {request.client.host if request.client else 'unknown'}")
+    """Log all HTTP requests (sampled via LOG_SAMPLE_RATES["app.access"])"""
+    start_time = time.perf_counter()
     
     # Process request
     response = await call_next(request)
     
     # Log response
-    process_time = time.time() - start_time
-    logger.info(f"← {request.method} {request.url.path} - Status: {response.status_code} - Time: {process_time:.3f}s")
+    process_time = time.perf_counter() - start_time
+    if access_logger.isEnabledFor(logging.INFO):
+        access_logger.info(
+            f"{request.method} {request.url.path} - Status: {response.status_code} - Time: {process_time:.3f}s",
+            extra={
+                "method": request.method,
+                "path": request.url.path,
+                "status": response.status_code,
+                "duration_ms": round(process_time * 1000, 1),
+                "client": request.client.host if request.client else None,
+            },
+        )
     
     return response
 
@@ -96,13 +148,39 @@ async def health_check():
         "app": settings.APP_NAME,
         "version": settings.APP_VERSION,
         "environment": settings.ENVIRONMENT,
+        "password_pool": password_pool.stats(),
     }
 
 
+# Prometheus scrape endpoint
+@app.get("/metrics", tags=["Health"], include_in_schema=False)
+async def get_metrics():
+    """Request, database pool and worker pool metrics of this process"""
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
+
 # Include API router
 app.include_router(api_router, prefix=settings.API_V1_PREFIX)
 
 
+@app.exception_handler(PoolSaturatedError)
+async def pool_saturated_handler(request, exc):
+    """Shed load when a bounded worker pool is full"""
+    logger.warning(f"{request.method} {request.url.path} rejected: {exc}")
+    return JSONResponse(
+        status_code=503,
+        headers={"Retry-After": "1"},
+        content={
+            "success": False,
+            "error": {
+                "code": "SERVICE_BUSY",
+                "message": "Server is busy, please retry shortly",
+                "detail": None,
+            },
+        },
+    )
+
+
 # Global exception handler
 @app.exception_handler(Exception)
 async def global_exception_handler(request, exc):
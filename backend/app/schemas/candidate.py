@@ -63,7 +63,24 @@ class CandidateResponse(CandidateBase):
 class CandidateListResponse(BaseModel):
     """Schema for paginated candidate list."""
     items: list[CandidateResponse]
-    total: int
+    total: Optional[int]
+    total_is_estimate: bool = False
     page: int
     page_size: int
-    total_pages: int
+    total_pages: Optional[int]
+    next_cursor: Optional[str] = None
+
+
+class CandidateImportRowError(BaseModel):
+    """Schema for the errors of one imported row."""
+    row: int
+    errors: list[str]
+
+
+class CandidateImportResponse(BaseModel):
+    """Schema for a bulk candidate import report."""
+    total_rows: int
+    imported: int
+    failed: int
+    errors: list[CandidateImportRowError]
+    errors_truncated: bool = False
@@ -84,10 +84,12 @@ class RequirementResponse(RequirementBase):
 class RequirementListResponse(BaseModel):
     """Schema for paginated requirement list."""
     items: List[RequirementResponse]
-    total: int
+    total: Optional[int]
+    total_is_estimate: bool = False
     page: int
     page_size: int
-    total_pages: int
+    total_pages: Optional[int]
+    next_cursor: Optional[str] = None
 
 
 # Job Posting Schemas (Simplified Approach - Option B)
@@ -148,4 +150,25 @@ class JobPostingResponse(BaseModel):
 class PublicJobListResponse(BaseModel):
     """Schema for public job listings."""
     items: List[JobPostingResponse]
-    total: int
+    total: Optional[int]
+    total_is_estimate: bool = False
+
+
+class CandidateMatch(BaseModel):
+    """Schema for a candidate ranked against a requirement's skills."""
+    candidate_id: UUID
+    first_name: str
+    last_name: str
+    email: str
+    status: str
+    current_title: Optional[str] = None
+    score: float = Field(..., description="Share of the IDF-weighted required skills the candidate has (0-1)")
+    matched_skills: List[str]
+    missing_skills: List[str]
+
+
+class CandidateMatchListResponse(BaseModel):
+    """Schema for requirement skill matches."""
+    requirement_id: UUID
+    required_skills: List[str]
+    items: List[CandidateMatch]
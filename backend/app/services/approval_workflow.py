@@ -0,0 +1,500 @@
+"""
+Multi-stage approval workflow driven by approval_stage_rules
+
+A rule says a stage applies to requirements of a department, job level,
+currency and/or from a salary, and which role (or user) approves it.
+The active rules are compiled into per-(department, job level, currency,
+salary band) plans kept in memory; a database trigger NOTIFYs on any
+change so every worker recompiles on next use. Stages run in
+ApprovalStage order and only the current stage has an approval row.
+
+Deciding is a single conditional UPDATE ... FROM requirements that only
+matches a pending approval of a still-submitted requirement and returns
+what the next step needs, so other approvals are never reloaded.
+"""
+import asyncio
+import logging
+from bisect import bisect_right
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from decimal import Decimal
+from typing import Any, Optional
+from uuid import UUID
+
+from sqlalchemy import column, insert, select, table, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.database import read_only_session_maker
+from app.core.events import Event, event, publish
+from app.models.approval import Approval, ApprovalStage, ApprovalStatus
+from app.models.requirement import Requirement, RequirementStatus
+from app.models.role import Role, user_roles
+from app.models.user import User
+
+logger = logging.getLogger(__name__)
+
+# Channel the approval_stage_rules trigger notifies on (see the migration)
+APPROVAL_RULES_CHANNEL = "approval_rules_changed"
+
+STAGE_ORDER = list(ApprovalStage)
+
+approval_stage_rules = table(
+    "approval_stage_rules",
+    column("id"),
+    column("stage"),
+    column("department_id"),
+    column("job_level_id"),
+    column("currency"),
+    column("salary_from"),
+    column("approver_role"),
+    column("approver_id"),
+    column("is_active"),
+)
+
+
+class WorkflowError(Exception):
+    """Raised when a requirement cannot be routed to an approver"""
+
+
+@dataclass(frozen=True)
+class StageRule:
+    """A compiled rule; unset filters match any requirement"""
+    stage: ApprovalStage
+    approver_role: str
+    department_id: Optional[UUID] = None
+    job_level_id: Optional[UUID] = None
+    currency: Optional[str] = None  # Currency salary_from is in
+    salary_from: Optional[Decimal] = None
+    approver_id: Optional[UUID] = None  # Overrides the role when set
+    
+    @property
+    def specificity(self) -> int:
+        return sum(
+            f is not None
+            for f in (self.department_id, self.job_level_id, self.currency, self.salary_from)
+        )
+    
+    def matches(
+        self, department_id: Any, job_level_id: Any, currency: Any, salary: Optional[Decimal]
+    ) -> bool:
+        if self.department_id is not None and self.department_id != department_id:
+            return False
+        if self.job_level_id is not None and self.job_level_id != job_level_id:
+            return False
+        if self.currency is not None and self.currency != currency:
+            return False
+        if self.salary_from is not None and (salary is None or salary < self.salary_from):
+            return False
+        return True
+
+
+# Routing when no rule applies (the original single-stage flow)
+DEFAULT_RULE = StageRule(stage=ApprovalStage.DEPARTMENT_HEAD, approver_role="approver")
+
+
+@dataclass
+class Decision:
+    """Outcome of deciding one requirement's current approval"""
+    requirement_id: UUID
+    approval: Approval
+    next_stage: Optional[ApprovalStage] = None  # Set when another stage was opened
+    requirement_status: Optional[RequirementStatus] = None  # Set when the requirement finished
+
+
+class CompiledWorkflow:
+    """Rules grouped by stage, with plans memoized per salary band"""
+    
+    def __init__(self, rules: list[StageRule]):
+        # Most specific rule first (ties in rule order), so it decides the approver
+        self._rules = {
+            stage: sorted((r for r in rules if r.stage == stage), key=lambda r: -r.specificity)
+            for stage in STAGE_ORDER
+        }
+        # Every salary between two consecutive thresholds matches the same rules
+        self._thresholds = sorted({r.salary_from for r in rules if r.salary_from is not None})
+        self._plans: dict[tuple[Any, Any, Any, int], tuple[StageRule, ...]] = {}
+    
+    def plan(
+        self, department_id: Any, job_level_id: Any, currency: Any, salary: Any
+    ) -> tuple[StageRule, ...]:
+        """
+        Get the stages a requirement goes through
+        
+        Args:
+            department_id: Requirement department
+            job_level_id: Requirement job level
+            currency: Requirement salary currency
+            salary: Top of the requirement's salary range (None if unset)
+            
+        Returns:
+            The deciding rule of each applicable stage, in stage order
+        """
+        band = 0 if salary is None else bisect_right(self._thresholds, Decimal(str(salary)))
+        key = (department_id, job_level_id, currency, band)
+        
+        plan = self._plans.get(key)
+        if plan is None:
+            # The band's lowest salary matches exactly the rules any salary in it does
+            floor = self._thresholds[band - 1] if band else None
+            plan = self._build(department_id, job_level_id, currency, floor)
+            self._plans[key] = plan
+        return plan
+    
+    def _build(
+        self, department_id: Any, job_level_id: Any, currency: Any, salary: Optional[Decimal]
+    ) -> tuple[StageRule, ...]:
+        plan = []
+        for stage in STAGE_ORDER:
+            rule = next(
+                (
+                    r for r in self._rules[stage]
+                    if r.matches(department_id, job_level_id, currency, salary)
+                ),
+                None,
+            )
+            if rule:
+                plan.append(rule)
+        # With no applicable rule, keep the single department head sign-off
+        return tuple(plan) or (DEFAULT_RULE,)
+    
+    def next_rule(
+        self,
+        stage: ApprovalStage,
+        department_id: Any,
+        job_level_id: Any,
+        currency: Any,
+        salary: Any,
+    ) -> Optional[StageRule]:
+        """Get the rule of the stage after the given one, None if it was the last"""
+        position = STAGE_ORDER.index(stage)
+        for rule in self.plan(department_id, job_level_id, currency, salary):
+            if STAGE_ORDER.index(rule.stage) > position:
+                return rule
+        return None
+
+
+async def _load_rules(db: AsyncSession) -> list[StageRule]:
+    """Query the active rules"""
+    rows = await db.execute(
+        select(approval_stage_rules)
+        .where(approval_stage_rules.c.is_active == True)
+        .order_by(approval_stage_rules.c.id)
+    )
+    rules = []
+    for row in rows:
+        if row.stage not in ApprovalStage.__members__:
+            logger.warning(f"Ignoring approval stage rule with unknown stage {row.stage!r}")
+            continue
+        rules.append(StageRule(
+            stage=ApprovalStage[row.stage],
+            approver_role=row.approver_role,
+            department_id=row.department_id,
+            job_level_id=row.job_level_id,
+            currency=row.currency,
+            salary_from=row.salary_from,
+            approver_id=row.approver_id,
+        ))
+    return rules
+
+
+class ApprovalWorkflow:
+    """
+    Routes requirements through their approval stages
+    
+    The compiled rules follow ReferenceDataCache: invalidate() bumps the
+    version and a compile started against an older version is discarded.
+    """
+    
+    def __init__(self):
+        self.version = 0
+        self._compiled: Optional[CompiledWorkflow] = None
+        self._lock = asyncio.Lock()
+    
+    async def load(self) -> None:
+        """Compile the active rules and replace the cached workflow"""
+        version = self.version
+        async with read_only_session_maker() as session:
+            rules = await _load_rules(session)
+        
+        if version != self.version:
+            return
+        
+        self._compiled = CompiledWorkflow(rules)
+        logger.info(f"Approval workflow compiled from {len(rules)} rules (version {version})")
+    
+    async def get(self) -> CompiledWorkflow:
+        """Get the compiled workflow, recompiling after an invalidation"""
+        compiled = self._compiled
+        if compiled:
+            return compiled
+        
+        async with self._lock:
+            if self._compiled is None:
+                await self.load()
+            compiled = self._compiled
+        
+        if compiled is None:
+            # Invalidated again while loading; use this compile uncached
+            async with read_only_session_maker() as session:
+                compiled = CompiledWorkflow(await _load_rules(session))
+        
+        return compiled
+    
+    def invalidate(self, payload: Optional[str] = None) -> None:
+        """
+        Drop the compiled rules
+        
+        Args:
+            payload: Notification payload (the changed table), unused
+        """
+        self.version += 1
+        self._compiled = None
+    
+    async def resolve_approvers(
+        self,
+        db: AsyncSession,
+        routes: dict[UUID, StageRule],
+    ) -> dict[UUID, UUID]:
+        """
+        Pick an approver for each requirement's stage
+        
+        Members of all needed roles come from one query over the
+        (role_id, user_id) index; requirements are spread over a role's
+        members by ID so the same requirement always lands on the same
+        person. Active superusers are the fallback.
+        
+        Args:
+            db: Database session
+            routes: Stage rule per requirement ID
+            
+        Returns:
+            Approver user ID per requirement ID
+            
+        Raises:
+            WorkflowError: No active user can approve a stage
+        """
+        roles = {rule.approver_role for rule in routes.values() if rule.approver_id is None}
+        members: dict[str, list[UUID]] = {role: [] for role in roles}
+        if roles:
+            rows = await db.execute(
+                select(Role.name, user_roles.c.user_id)
+                .join(user_roles, user_roles.c.role_id == Role.id)
+                .join(User, User.id == user_roles.c.user_id)
+                .where(Role.name.in_(roles), User.is_active == True)
+                .order_by(user_roles.c.user_id)
+            )
+            for role, user_id in rows:
+                members[role].append(user_id)
+        
+        fallback: Optional[list[UUID]] = None
+        approvers = {}
+        for requirement_id, rule in routes.items():
+            if rule.approver_id is not None:
+                approvers[requirement_id] = rule.approver_id
+                continue
+            
+            candidates = members[rule.approver_role]
+            if not candidates:
+                if fallback is None:
+                    fallback = list(await db.scalars(
+                        select(User.id)
+                        .where(User.is_superuser == True, User.is_active == True)
+                        .order_by(User.id)
+                    ))
+                candidates = fallback
+            if not candidates:
+                raise WorkflowError(
+                    f"No approver found for the {rule.stage.value} stage. "
+                    "Please contact administrator."
+                )
+            approvers[requirement_id] = candidates[requirement_id.int % len(candidates)]
+        
+        return approvers
+    
+    async def submit(self, db: AsyncSession, requirement: Requirement) -> Approval:
+        """
+        Open the first stage of a requirement and mark it submitted
+        
+        Args:
+            db: Database session (the caller commits)
+            requirement: Draft requirement
+            
+        Returns:
+            The pending approval of the first stage
+            
+        Raises:
+            WorkflowError: No approver for the first stage
+        """
+        compiled = await self.get()
+        rule = compiled.plan(
+            requirement.department_id,
+            requirement.job_level_id,
+            requirement.currency,
+            requirement.max_salary,
+        )[0]
+        approvers = await self.resolve_approvers(db, {requirement.id: rule})
+        
+        now = datetime.now(timezone.utc)
+        approval = Approval(
+            requirement_id=requirement.id,
+            approver_id=approvers[requirement.id],
+            approval_stage=rule.stage,
+            status=ApprovalStatus.PENDING,
+            submitted_at=now,
+        )
+        requirement.status = RequirementStatus.SUBMITTED
+        requirement.submitted_at = now
+        db.add(approval)
+        
+        await publish(db, [event(
+            "requirement.submitted",
+            {
+                "requirement_id": requirement.id,
+                "requirement_number": requirement.requirement_number,
+                "status": RequirementStatus.SUBMITTED.value,
+                "approval_stage": rule.stage.value,
+            },
+            user_ids=(approval.approver_id, requirement.hiring_manager_id),
+        )])
+        return approval
+    
+    async def decide(
+        self,
+        db: AsyncSession,
+        requirement_ids: list[UUID],
+        approver_id: UUID,
+        approve: bool,
+        comments: Optional[str] = None,
+    ) -> dict[UUID, Decision]:
+        """
+        Approve or reject the approver's current stage of requirements
+        
+        Args:
+            db: Database session (the caller commits)
+            requirement_ids: Requirements to decide
+            approver_id: Deciding user
+            approve: True to approve, False to reject
+            comments: Reviewer comments
+            
+        Returns:
+            Decision per requirement that had a pending approval for the
+            user; others are left out
+            
+        Raises:
+            WorkflowError: No approver for a next stage
+        """
+        now = datetime.now(timezone.utc)
+        rows = (await db.execute(
+            update(Approval)
+            .where(
+                Approval.requirement_id.in_(requirement_ids),
+                Approval.approver_id == approver_id,
+                Approval.status == ApprovalStatus.PENDING,
+                Requirement.id == Approval.requirement_id,
+                Requirement.status == RequirementStatus.SUBMITTED,
+                Requirement.deleted_at.is_(None),
+            )
+            .values(
+                status=ApprovalStatus.APPROVED if approve else ApprovalStatus.REJECTED,
+                reviewed_at=now,
+                comments=comments,
+            )
+            .returning(
+                Approval,
+                Requirement.department_id,
+                Requirement.job_level_id,
+                Requirement.currency,
+                Requirement.max_salary,
+                Requirement.requirement_number,
+                Requirement.hiring_manager_id,
+            )
+            .execution_options(synchronize_session=False)
+        )).all()
+        decisions = {
+            row.Approval.requirement_id: Decision(row.Approval.requirement_id, row.Approval)
+            for row in rows
+        }
+        if not decisions:
+            return decisions
+        
+        routes: dict[UUID, StageRule] = {}
+        if approve:
+            compiled = await self.get()
+            for row in rows:
+                rule = compiled.next_rule(
+                    row.Approval.approval_stage,
+                    row.department_id,
+                    row.job_level_id,
+                    row.currency,
+                    row.max_salary,
+                )
+                if rule:
+                    routes[row.Approval.requirement_id] = rule
+        
+        finished = [rid for rid in decisions if rid not in routes]
+        final_status = RequirementStatus.APPROVED if approve else RequirementStatus.REJECTED
+        if finished:
+            if approve:
+                await self._finish(db, finished, status=final_status, approved_at=now)
+            else:
+                await self._finish(db, finished, status=final_status)
+            for rid in finished:
+                decisions[rid].requirement_status = final_status
+        
+        approvers: dict[UUID, UUID] = {}
+        if routes:
+            approvers = await self.resolve_approvers(db, routes)
+            await db.execute(insert(Approval), [
+                {
+                    "requirement_id": rid,
+                    "approver_id": approvers[rid],
+                    "approval_stage": rule.stage,
+                    "status": ApprovalStatus.PENDING,
+                    "submitted_at": now,
+                }
+                for rid, rule in routes.items()
+            ])
+            for rid, rule in routes.items():
+                decisions[rid].next_stage = rule.stage
+        
+        await publish(db, [
+            _requirement_event(
+                decisions[row.Approval.requirement_id],
+                row,
+                approvers.get(row.Approval.requirement_id),
+            )
+            for row in rows
+        ])
+        
+        return decisions
+    
+    async def _finish(self, db: AsyncSession, requirement_ids: list[UUID], **values: Any) -> None:
+        # Default session sync, so requirements the caller loaded see the change
+        await db.execute(
+            update(Requirement).where(Requirement.id.in_(requirement_ids)).values(**values)
+        )
+
+
+def _requirement_event(decision: Decision, row: Any, next_approver_id: Optional[UUID]) -> Event:
+    """Describe a decision for the hiring manager and whoever acts next"""
+    data = {
+        "requirement_id": decision.requirement_id,
+        "requirement_number": row.requirement_number,
+        "approval_stage": decision.approval.approval_stage.value,
+    }
+    if decision.next_stage:
+        data.update(status=RequirementStatus.SUBMITTED.value, next_stage=decision.next_stage.value)
+        return event(
+            "requirement.stage_advanced", data, user_ids=(row.hiring_manager_id, next_approver_id)
+        )
+    
+    data["status"] = decision.requirement_status.value
+    if decision.requirement_status == RequirementStatus.APPROVED:
+        # Recruiters pick approved requirements up for posting
+        return event(
+            "requirement.approved", data, roles=("recruiter",), user_ids=(row.hiring_manager_id,)
+        )
+    return event("requirement.rejected", data, user_ids=(row.hiring_manager_id,))
+
+
+approval_workflow = ApprovalWorkflow()
@@ -0,0 +1,322 @@
+"""
+Bulk candidate import from streamed CSV or JSONL uploads
+
+The request body is decoded and parsed incrementally, validated and
+inserted a chunk at a time, so memory stays flat however large the file is.
+Each chunk is one multi-row INSERT ... RETURNING and one commit.
+"""
+import codecs
+import csv
+import json
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Any, AsyncIterator, Optional
+
+from pydantic import ValidationError
+from sqlalchemy import insert, select
+from sqlalchemy.exc import DataError, IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models.candidate import Candidate
+from app.models.requirement import Requirement
+from app.schemas.candidate import CandidateCreate
+
+# A CSV record whose quotes are still open after this many characters is
+# treated as malformed, and a longer line fails the upload, instead of
+# buffering the rest of the upload
+MAX_RECORD_CHARS = 1_000_000
+
+# CSV columns holding lists, written as semicolon-separated values; a cell
+# holding a JSON object (e.g. skills with levels, as exports write it) is
+# read as that object
+CSV_LIST_COLUMNS = {"skills"}
+
+REQUIRED_COLUMNS = {name for name, info in CandidateCreate.model_fields.items() if info.is_required()}
+
+
+class ImportFormat(str, Enum):
+    """Supported upload formats"""
+    CSV = "csv"
+    JSONL = "jsonl"
+
+
+CONTENT_TYPE_FORMATS = {
+    "text/csv": ImportFormat.CSV,
+    "application/csv": ImportFormat.CSV,
+    "application/jsonl": ImportFormat.JSONL,
+    "application/x-ndjson": ImportFormat.JSONL,
+    "application/jsonlines": ImportFormat.JSONL,
+}
+
+
+class CandidateImportError(Exception):
+    """Raised when an upload cannot be parsed at all"""
+
+
+def detect_format(content_type: Optional[str]) -> Optional[ImportFormat]:
+    """
+    Pick the import format from a Content-Type header
+    
+    Args:
+        content_type: Content-Type header value
+        
+    Returns:
+        Import format, or None if the type is not supported
+    """
+    if not content_type:
+        return None
+    return CONTENT_TYPE_FORMATS.get(content_type.split(";")[0].strip().lower())
+
+
+@dataclass
+class ParsedRow:
+    """One record of the upload, or the reason it could not be read"""
+    row: int
+    data: Optional[dict[str, Any]] = None
+    error: Optional[str] = None
+
+
+@dataclass
+class ImportReport:
+    """Outcome of an import with per-row errors"""
+    total_rows: int = 0
+    imported: int = 0
+    failed: int = 0
+    errors: list[dict[str, Any]] = field(default_factory=list)
+    errors_truncated: bool = False
+    
+    def add_error(self, row: int, messages: list[str]) -> None:
+        """Record a failed row, keeping at most CANDIDATE_IMPORT_MAX_ERRORS details"""
+        self.failed += 1
+        if len(self.errors) < settings.CANDIDATE_IMPORT_MAX_ERRORS:
+            self.errors.append({"row": row, "errors": messages})
+        else:
+            self.errors_truncated = True
+
+
+async def _iter_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    """
+    Decode a byte stream as UTF-8 and yield lines with their newline
+    
+    Only newly decoded text is split; the unfinished line is kept as
+    pieces and joined once its newline arrives.
+    
+    Raises:
+        CandidateImportError: If the upload is not UTF-8 or a line exceeds MAX_RECORD_CHARS
+    """
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    partial: list[str] = []
+    partial_chars = 0
+    try:
+        async for chunk in chunks:
+            *lines, tail = decoder.decode(chunk).split("\n")
+            if lines:
+                lines[0] = "".join(partial) + lines[0]
+                partial, partial_chars = [], 0
+                for line in lines:
+                    yield line + "\n"
+            partial.append(tail)
+            partial_chars += len(tail)
+            if partial_chars > MAX_RECORD_CHARS:
+                raise CandidateImportError(f"Upload has a line longer than {MAX_RECORD_CHARS} characters")
+        partial.append(decoder.decode(b"", final=True))
+    except UnicodeDecodeError as exc:
+        raise CandidateImportError(f"Upload is not valid UTF-8: {exc.reason}")
+    last = "".join(partial)
+    if last:
+        yield last
+
+
+def _csv_record(header: list[str], fields: list[str]) -> dict[str, Any]:
+    """Map CSV fields to candidate attributes, leaving blank cells unset"""
+    record: dict[str, Any] = {}
+    for name, value in zip(header, fields):
+        value = value.strip()
+        if not value:
+            continue
+        if name in CSV_LIST_COLUMNS and value.startswith("{"):
+            try:
+                record[name] = json.loads(value)
+            except json.JSONDecodeError:
+                # Left as text, so validation reports the row
+                record[name] = value
+        elif name in CSV_LIST_COLUMNS:
+            record[name] = [item.strip() for item in value.split(";") if item.strip()]
+        else:
+            record[name] = value
+    return record
+
+
+async def _parse_csv(lines: AsyncIterator[str]) -> AsyncIterator[ParsedRow]:
+    """Yield CSV records after the header row, one per (possibly multi-line) record"""
+    header: Optional[list[str]] = None
+    pending: list[str] = []
+    pending_chars = 0
+    quotes = 0
+    row = 0
+    
+    async for line in lines:
+        pending.append(line)
+        pending_chars += len(line)
+        quotes += line.count('"')
+        # An odd number of quotes means a quoted field continues on the next line
+        if quotes % 2 and pending_chars < MAX_RECORD_CHARS:
+            continue
+        
+        text = "".join(pending)
+        unterminated = quotes % 2 == 1
+        pending, pending_chars, quotes = [], 0, 0
+        if not text.strip():
+            continue
+        
+        if header is None:
+            header = [name.strip() for name in next(csv.reader([text]))]
+            missing = REQUIRED_COLUMNS - set(header)
+            if missing:
+                raise CandidateImportError(f"CSV header is missing columns: {', '.join(sorted(missing))}")
+            continue
+        
+        row += 1
+        if unterminated:
+            yield ParsedRow(row, error="Unterminated quoted field")
+            continue
+        
+        fields = next(csv.reader([text]))
+        if len(fields) != len(header):
+            yield ParsedRow(row, error=f"Expected {len(header)} columns, got {len(fields)}")
+        else:
+            yield ParsedRow(row, data=_csv_record(header, fields))
+    
+    if header is None:
+        raise CandidateImportError("CSV upload has no header row")
+    if pending and "".join(pending).strip():
+        yield ParsedRow(row + 1, error="Unterminated quoted field")
+
+
+async def _parse_jsonl(lines: AsyncIterator[str]) -> AsyncIterator[ParsedRow]:
+    """Yield one record per non-blank JSONL line"""
+    row = 0
+    async for line in lines:
+        if not line.strip():
+            continue
+        
+        row += 1
+        try:
+            data = json.loads(line)
+        except json.JSONDecodeError as exc:
+            yield ParsedRow(row, error=f"Invalid JSON: {exc.msg}")
+            continue
+        
+        if isinstance(data, dict):
+            yield ParsedRow(row, data=data)
+        else:
+            yield ParsedRow(row, error="Expected a JSON object")
+
+
+def _validation_messages(exc: ValidationError) -> list[str]:
+    """Flatten pydantic errors into 'field: message' strings"""
+    return [
+        f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}"
+        for error in exc.errors()
+    ]
+
+
+class CandidateImportService:
+    """Service class for bulk candidate imports"""
+    
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        self.report = ImportReport()
+    
+    async def run(self, chunks: AsyncIterator[bytes], import_format: ImportFormat) -> ImportReport:
+        """
+        Import candidates from an upload stream
+        
+        Chunks are committed as they complete, so rows imported before a
+        fatal error stay imported.
+        
+        Args:
+            chunks: Raw upload body
+            import_format: Format of the upload
+            
+        Returns:
+            Import report with counts and per-row errors
+            
+        Raises:
+            CandidateImportError: If the upload cannot be decoded or has no usable header
+        """
+        parse = _parse_csv if import_format == ImportFormat.CSV else _parse_jsonl
+        chunk: list[ParsedRow] = []
+        
+        async for parsed in parse(_iter_lines(chunks)):
+            self.report.total_rows += 1
+            chunk.append(parsed)
+            if len(chunk) >= settings.CANDIDATE_IMPORT_CHUNK_SIZE:
+                await self._import_chunk(chunk)
+                chunk = []
+        
+        if chunk:
+            await self._import_chunk(chunk)
+        
+        return self.report
+    
+    async def _import_chunk(self, chunk: list[ParsedRow]) -> None:
+        """Validate a chunk, drop rows pointing at unknown requirements and insert the rest"""
+        valid: list[tuple[int, dict[str, Any]]] = []
+        for parsed in chunk:
+            if parsed.error:
+                self.report.add_error(parsed.row, [parsed.error])
+                continue
+            try:
+                candidate = CandidateCreate.model_validate(parsed.data)
+            except ValidationError as exc:
+                self.report.add_error(parsed.row, _validation_messages(exc))
+                continue
+            valid.append((parsed.row, candidate.model_dump()))
+        
+        if not valid:
+            return
+        
+        # One lookup per chunk instead of a foreign key failure per row
+        requirement_ids = {data["requirement_id"] for _, data in valid}
+        existing = set(
+            await self.db.scalars(
+                select(Requirement.id).where(
+                    Requirement.id.in_(requirement_ids),
+                    Requirement.deleted_at.is_(None)
+                )
+            )
+        )
+        rows = []
+        for row, data in valid:
+            if data["requirement_id"] in existing:
+                rows.append((row, data))
+            else:
+                self.report.add_error(row, ["requirement_id: Requirement not found"])
+        
+        if rows:
+            await self._insert(rows)
+    
+    async def _insert(self, rows: list[tuple[int, dict[str, Any]]]) -> None:
+        """Insert rows in one statement, falling back to row by row to isolate failures"""
+        try:
+            result = await self.db.execute(
+                insert(Candidate).returning(Candidate.id),
+                [data for _, data in rows],
+            )
+            imported = len(result.all())
+            await self.db.commit()
+            self.report.imported += imported
+            return
+        except (IntegrityError, DataError):
+            await self.db.rollback()
+        
+        for row, data in rows:
+            try:
+                async with self.db.begin_nested():
+                    await self.db.execute(insert(Candidate), [data])
+                self.report.imported += 1
+            except (IntegrityError, DataError) as exc:
+                self.report.add_error(row, [str(exc.orig)])
+        await self.db.commit()
@@ -0,0 +1,109 @@
+"""
+Pre-rendered snapshots of the public careers page
+
+Public job listings are read far more often than postings change, so each
+filter combination is serialized to JSON once and served as bytes with a
+strong ETag until a posting changes.
+"""
+import hashlib
+from dataclasses import dataclass
+from typing import Hashable, Optional
+
+from fastapi import Request, Response, status
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+
+
+@dataclass(frozen=True)
+class SnapshotEntry:
+    """Serialized response body and its strong ETag"""
+    body: bytes
+    etag: str
+
+
+def make_snapshot_entry(body: bytes) -> SnapshotEntry:
+    """Wrap a serialized body with its strong ETag"""
+    return SnapshotEntry(body=body, etag=f'"{hashlib.sha256(body).hexdigest()[:32]}"')
+
+
+class CareersSnapshot:
+    """
+    Versioned cache of serialized careers-page responses
+    
+    The version is bumped whenever a posting changes; entries rendered
+    against an older version are never stored.
+    """
+    
+    def __init__(self, maxsize: int, ttl: float):
+        self.version = 0
+        self._entries: TTLCache[Hashable, SnapshotEntry] = TTLCache(maxsize=maxsize, ttl=ttl)
+    
+    def get(self, key: Hashable) -> Optional[SnapshotEntry]:
+        """Get the snapshot for a request key"""
+        return self._entries.get(key)
+    
+    def put(self, key: Hashable, body: bytes, version: int) -> SnapshotEntry:
+        """
+        Store a rendered body
+        
+        Args:
+            key: Request key (endpoint and filter values)
+            body: Serialized JSON body
+            version: Snapshot version read before the body was rendered
+            
+        Returns:
+            Snapshot entry with its ETag
+        """
+        entry = make_snapshot_entry(body)
+        
+        # Skip storing if a posting changed while this body was rendered
+        if version == self.version:
+            self._entries.set(key, entry)
+        
+        return entry
+    
+    def invalidate(self) -> None:
+        """Drop all snapshots after a posting changes"""
+        self.version += 1
+        self._entries.clear()
+
+
+careers_snapshot = CareersSnapshot(
+    maxsize=settings.CAREERS_SNAPSHOT_MAX_ENTRIES,
+    ttl=settings.CAREERS_SNAPSHOT_TTL_SECONDS,
+)
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    """Check an If-None-Match header value against an ETag"""
+    if if_none_match.strip() == "*":
+        return True
+    candidates = (tag.strip().removeprefix("W/") for tag in if_none_match.split(","))
+    return etag in candidates
+
+
+def snapshot_response(request: Request, entry: SnapshotEntry, max_age: Optional[int] = None) -> Response:
+    """
+    Serve a snapshot, answering conditional requests with 304
+    
+    Args:
+        request: Incoming request
+        entry: Snapshot to serve
+        max_age: Cache-Control max-age, defaults to CAREERS_CACHE_MAX_AGE_SECONDS
+        
+    Returns:
+        200 response with the body, or 304 if the client copy is current
+    """
+    if max_age is None:
+        max_age = settings.CAREERS_CACHE_MAX_AGE_SECONDS
+    headers = {
+        "ETag": entry.etag,
+        "Cache-Control": f"public, max-age={max_age}",
+    }
+    
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and _etag_matches(if_none_match, entry.etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    
+    return Response(content=entry.body, media_type="application/json", headers=headers)
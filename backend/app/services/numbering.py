@@ -0,0 +1,72 @@
+"""
+Gapless document number allocation
+
+Numbers come from a row per counter in number_counters, advanced with a
+single UPDATE ... RETURNING. The row lock is held until the caller's
+transaction ends, so concurrent creators never see the same value, and a
+rolled-back transaction hands its numbers back instead of leaving a gap.
+"""
+from sqlalchemy import column, table
+from sqlalchemy.ext.asyncio import AsyncSession
+
+REQUIREMENT_NUMBER_COUNTER = "requirement_number"
+
+number_counters = table(
+    "number_counters",
+    column("name"),
+    column("last_value"),
+)
+
+
+async def allocate_numbers(db: AsyncSession, counter: str, count: int = 1) -> range:
+    """
+    Reserve a contiguous block of numbers from a counter
+    
+    Call inside the transaction that stores the numbered rows, and commit
+    promptly: other allocators on the same counter wait for it.
+    
+    Args:
+        db: Database session
+        counter: Counter name
+        count: How many numbers to reserve
+        
+    Returns:
+        Range of the reserved numbers
+        
+    Raises:
+        ValueError: If count is not positive
+        LookupError: If the counter does not exist
+    """
+    if count < 1:
+        raise ValueError("count must be positive")
+    
+    last_value = await db.scalar(
+        number_counters.update()
+        .where(number_counters.c.name == counter)
+        .values(last_value=number_counters.c.last_value + count)
+        .returning(number_counters.c.last_value)
+    )
+    if last_value is None:
+        raise LookupError(f"Number counter '{counter}' does not exist")
+    
+    return range(last_value - count + 1, last_value + 1)
+
+
+def format_requirement_number(value: int) -> str:
+    """Format a counter value as a requirement number (e.g. REQ-00042)"""
+    return f"REQ-{value:05d}"
+
+
+async def next_requirement_numbers(db: AsyncSession, count: int = 1) -> list[str]:
+    """
+    Reserve requirement numbers
+    
+    Args:
+        db: Database session
+        count: How many numbers to reserve (more than one for bulk imports)
+        
+    Returns:
+        Requirement numbers in ascending order
+    """
+    block = await allocate_numbers(db, REQUIREMENT_NUMBER_COUNTER, count)
+    return [format_requirement_number(value) for value in block]
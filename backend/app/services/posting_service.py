@@ -0,0 +1,169 @@
+"""
+Job posting service for read models derived from posted requirements
+"""
+from typing import Any, Optional
+
+from sqlalchemy import Row, Select, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.database import read_only_session_maker
+from app.core.pg_notify import notify
+from app.services.careers_snapshot import careers_snapshot
+from app.models.organization import Department, Location
+from app.models.requirement import PostingStatus, Requirement
+
+_STATS_KEY = "stats"
+
+# Channel posting changes are announced on, so every worker drops its caches
+POSTINGS_CHANNEL = "postings_changed"
+
+# Posting counts change rarely compared to how often the Job Postings page
+# reads them, so they are served from a short-lived process-local cache that
+# every worker drops when a posting change is announced
+posting_stats_cache: TTLCache[str, dict[str, int]] = TTLCache(
+    maxsize=1,
+    ttl=settings.POSTING_STATS_CACHE_TTL_SECONDS,
+)
+_stats_version = 0
+
+
+def posting_projection() -> Select:
+    """
+    Select exactly the columns a JobPostingResponse is built from
+    
+    Department and location names come from outer joins in the same
+    statement, so no ORM entities are hydrated and no relationship is
+    lazy-loaded per row.
+    
+    Returns:
+        Select statement over requirements joined to departments and locations
+    """
+    return (
+        select(
+            Requirement.id,
+            Requirement.requirement_number,
+            Requirement.position_title,
+            Department.name.label("department_name"),
+            Location.name.label("location_name"),
+            Requirement.employment_type,
+            Requirement.work_mode,
+            Requirement.job_description,
+            Requirement.required_qualifications,
+            Requirement.required_skills,
+            Requirement.min_salary,
+            Requirement.max_salary,
+            Requirement.currency,
+            Requirement.is_posted,
+            Requirement.posting_status,
+            Requirement.posting_channels,
+            Requirement.job_posting_url,
+            Requirement.posted_at,
+            Requirement.posting_details,
+        )
+        .outerjoin(Department, Department.id == Requirement.department_id)
+        .outerjoin(Location, Location.id == Requirement.location_id)
+    )
+
+
+def build_job_posting(row: Row) -> dict[str, Any]:
+    """
+    Build a JobPostingResponse body from a posting_projection() row
+    
+    Args:
+        row: Result row of posting_projection()
+        
+    Returns:
+        Job posting dict
+    """
+    posting_details = row.posting_details or {}
+    
+    return {
+        "id": row.id,
+        "requirement_number": row.requirement_number,
+        "position_title": row.position_title,
+        "department_name": row.department_name or "N/A",
+        "location_name": row.location_name or "N/A",
+        "employment_type": row.employment_type.value,
+        "work_mode": row.work_mode.value,
+        "job_description": posting_details.get("custom_description") or row.job_description,
+        "required_qualifications": row.required_qualifications,
+        "required_skills": row.required_skills or [],
+        "min_salary": float(row.min_salary) if row.min_salary else None,
+        "max_salary": float(row.max_salary) if row.max_salary else None,
+        "currency": row.currency,
+        "is_posted": row.is_posted,
+        "posting_status": row.posting_status.value,
+        "posting_channels": row.posting_channels or [],
+        "job_posting_url": row.job_posting_url,
+        "posted_at": row.posted_at,
+        "benefits": posting_details.get("benefits"),
+        "application_instructions": posting_details.get("application_instructions"),
+    }
+
+
+async def load_posting_stats() -> dict[str, int]:
+    """
+    Get posting counts by posting status
+    
+    Counted on the primary: a cache refilled right after an invalidation
+    from a replica that has not replayed the change would keep the old
+    counts for the whole TTL.
+    
+    Returns:
+        Dict with total_posted and a count per posting status
+    """
+    stats = posting_stats_cache.get(_STATS_KEY)
+    if stats is not None:
+        return stats
+        
+    version = _stats_version
+        
+    # One grouped aggregate instead of a COUNT per status
+    async with read_only_session_maker() as session:
+        result = await session.execute(
+            select(Requirement.posting_status, func.count())
+            .where(
+                Requirement.deleted_at.is_(None),
+                Requirement.is_posted == True  # noqa: E712
+            )
+            .group_by(Requirement.posting_status)
+        )
+        counts = {posting_status: count for posting_status, count in result.all()}
+        
+    stats = {
+        "total_posted": sum(counts.values()),
+        "active": counts.get(PostingStatus.ACTIVE, 0),
+        "paused": counts.get(PostingStatus.PAUSED, 0),
+        "closed": counts.get(PostingStatus.CLOSED, 0),
+        "draft": counts.get(PostingStatus.DRAFT, 0),
+    }
+    # Skip storing if a posting changed while counting
+    if version == _stats_version:
+        posting_stats_cache.set(_STATS_KEY, stats)
+        
+    return stats
+
+
+async def notify_posting_changed(db: AsyncSession) -> None:
+    """
+    Announce a posting change to every worker
+    
+    Queued on the session's transaction, so workers drop their posting
+    caches only once the change commits. Call before committing, and
+    invalidate_posting_caches() after it so this worker's next read does
+    not wait for its own notification.
+    
+    Args:
+        db: Database session holding the change
+    """
+    await notify(db, POSTINGS_CHANNEL)
+
+
+def invalidate_posting_caches(payload: Optional[str] = None) -> None:
+    """Drop derived posting data (also the POSTINGS_CHANNEL handler)"""
+    global _stats_version
+    _stats_version += 1
+    posting_stats_cache.clear()
+    careers_snapshot.invalidate()
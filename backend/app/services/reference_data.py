@@ -0,0 +1,126 @@
+"""
+Process-local cache of reference data (departments, job levels, locations)
+
+The lists are loaded at startup and kept as serialized JSON with strong
+ETags. A database trigger NOTIFYs on any change to the tables, so every
+worker drops its copy and reloads on the next request.
+"""
+import asyncio
+import json
+import logging
+from typing import Any, Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.database import read_only_session_maker
+from app.models.organization import Department, JobLevel, Location
+from app.services.careers_snapshot import SnapshotEntry, make_snapshot_entry
+
+logger = logging.getLogger(__name__)
+
+# Channel the reference data triggers notify on (see the migration)
+REFERENCE_DATA_CHANNEL = "reference_data_changed"
+
+DEPARTMENTS = "departments"
+JOB_LEVELS = "job_levels"
+LOCATIONS = "locations"
+
+
+async def _load_lists(db: AsyncSession) -> dict[str, list[dict[str, Any]]]:
+    """Query the active rows of every reference table"""
+    departments = await db.scalars(
+        select(Department).where(Department.is_active == True).order_by(Department.name)
+    )
+    levels = await db.scalars(
+        select(JobLevel).where(JobLevel.is_active == True).order_by(JobLevel.level_order)
+    )
+    locations = await db.scalars(
+        select(Location).where(Location.is_active == True).order_by(Location.country, Location.city)
+    )
+    
+    return {
+        DEPARTMENTS: [
+            {"id": str(dept.id), "name": dept.name, "code": dept.code}
+            for dept in departments
+        ],
+        JOB_LEVELS: [
+            {"id": str(level.id), "name": level.name, "code": level.code, "level_order": level.level_order}
+            for level in levels
+        ],
+        LOCATIONS: [
+            {"id": str(loc.id), "name": loc.name, "city": loc.city, "country": loc.country}
+            for loc in locations
+        ],
+    }
+
+
+class ReferenceDataCache:
+    """
+    Versioned cache of the serialized reference data lists
+    
+    invalidate() bumps the version; a load that started against an older
+    version is discarded so a stale read never overwrites a newer one.
+    """
+    
+    def __init__(self):
+        self.version = 0
+        self._entries: dict[str, SnapshotEntry] = {}
+        self._lock = asyncio.Lock()
+    
+    async def load(self) -> None:
+        """Load every list from the database and replace the cached copies"""
+        version = self.version
+        async with read_only_session_maker() as session:
+            lists = await _load_lists(session)
+        
+        if version != self.version:
+            return
+        
+        self._entries = {
+            name: make_snapshot_entry(json.dumps(items, separators=(",", ":")).encode())
+            for name, items in lists.items()
+        }
+        logger.info(f"Reference data loaded (version {version})")
+    
+    async def get(self, name: str) -> SnapshotEntry:
+        """
+        Get a serialized list, reloading after an invalidation
+        
+        Args:
+            name: DEPARTMENTS, JOB_LEVELS or LOCATIONS
+            
+        Returns:
+            Snapshot entry with the JSON body and ETag
+        """
+        entry = self._entries.get(name)
+        if entry:
+            return entry
+        
+        # One reload serves every request that missed at the same time
+        async with self._lock:
+            entry = self._entries.get(name)
+            if entry is None:
+                await self.load()
+                entry = self._entries.get(name)
+        
+        if entry is None:
+            # Invalidated again while loading; serve this read uncached
+            async with read_only_session_maker() as session:
+                lists = await _load_lists(session)
+            entry = make_snapshot_entry(json.dumps(lists[name], separators=(",", ":")).encode())
+        
+        return entry
+    
+    def invalidate(self, payload: Optional[str] = None) -> None:
+        """
+        Drop the cached lists
+        
+        Args:
+            payload: Notification payload (the changed table), unused
+        """
+        self.version += 1
+        self._entries = {}
+
+
+reference_data_cache = ReferenceDataCache()
@@ -0,0 +1,131 @@
+"""
+Full-text and substring search shared by the list endpoints
+
+Each searchable table has a weighted tsvector document backed by a GIN
+expression index, plus pg_trgm GIN indexes on identifier columns (numbers,
+emails) where users type fragments rather than words. The expressions built
+here must stay identical to the ones indexed in the search migration, or
+Postgres falls back to sequential scans.
+"""
+import re
+from dataclasses import dataclass
+from typing import Any, Optional
+
+from sqlalchemy import ColumnElement, Select, false, func, literal_column, or_
+
+from app.models.candidate import Candidate
+from app.models.requirement import Requirement
+
+# Longer inputs are truncated; each extra term only narrows the match
+MAX_SEARCH_TERMS = 8
+
+_WORD = re.compile(r"\w+", re.UNICODE)
+
+
+@dataclass(frozen=True)
+class SearchSpec:
+    """
+    What a table is searched on
+    
+    Attributes:
+        config: Text search configuration of the document
+        weighted_columns: (column, weight A-D) pairs making up the document
+        substring_columns: Columns matched by case-insensitive substring
+    """
+    config: str
+    weighted_columns: tuple[tuple[Any, str], ...]
+    substring_columns: tuple[Any, ...] = ()
+    
+    def document(self) -> ColumnElement:
+        """Build the weighted tsvector expression of this spec"""
+        # Config and weights are rendered inline: the planner only matches
+        # the expression index against constants, never bound parameters
+        config = literal_column(f"'{self.config}'::regconfig")
+        parts = [
+            func.setweight(
+                func.to_tsvector(config, func.coalesce(column, literal_column("''"))),
+                literal_column(f"'{weight}'"),
+            )
+            for column, weight in self.weighted_columns
+        ]
+        document = parts[0]
+        for part in parts[1:]:
+            document = document.op("||")(part)
+        return document
+
+
+REQUIREMENT_SEARCH = SearchSpec(
+    config="english",
+    weighted_columns=(
+        (Requirement.position_title, "A"),
+        (Requirement.job_description, "C"),
+    ),
+    substring_columns=(Requirement.requirement_number,),
+)
+
+CANDIDATE_SEARCH = SearchSpec(
+    config="simple",
+    weighted_columns=(
+        (Candidate.first_name, "A"),
+        (Candidate.last_name, "A"),
+    ),
+    substring_columns=(Candidate.email,),
+)
+
+
+def prefix_tsquery(term: str) -> Optional[str]:
+    """
+    Turn free text into a tsquery matching every word as a prefix
+    
+    Args:
+        term: User search input
+        
+    Returns:
+        tsquery text such as 'senior:* & engin:*', or None if term has no words
+    """
+    words = _WORD.findall(term.lower())[:MAX_SEARCH_TERMS]
+    if not words:
+        return None
+    return " & ".join(f"{word}:*" for word in words)
+
+
+def _like_pattern(term: str) -> str:
+    """Escape LIKE wildcards and wrap the term for a substring match"""
+    escaped = term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+
+def apply_search(query: Select, spec: SearchSpec, term: str) -> tuple[Select, Optional[ColumnElement]]:
+    """
+    Filter a query to rows matching a search term
+    
+    Rows match if the document contains every word (as a prefix) or any
+    substring column contains the whole term.
+    
+    Args:
+        query: Select statement to filter
+        spec: Search spec of the queried table
+        term: User search input
+        
+    Returns:
+        Tuple of (filtered query, rank expression or None if term has no words).
+        A blank term leaves the query unfiltered.
+    """
+    term = term.strip()
+    if not term:
+        return query, None
+    
+    conditions = []
+    rank = None
+    
+    tsquery_text = prefix_tsquery(term)
+    if tsquery_text:
+        document = spec.document()
+        tsquery = func.to_tsquery(literal_column(f"'{spec.config}'::regconfig"), tsquery_text)
+        conditions.append(document.op("@@")(tsquery))
+        rank = func.ts_rank_cd(document, tsquery)
+    
+    pattern = _like_pattern(term)
+    conditions.extend(column.ilike(pattern, escape="\\") for column in spec.substring_columns)
+    
+    return query.where(or_(*conditions) if conditions else false()), rank
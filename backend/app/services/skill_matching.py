@@ -0,0 +1,322 @@
+"""
+Candidate-to-requirement skill matching
+
+Skill names are normalized and mapped to integer IDs. Every candidate's
+skills are one row of a CSR matrix (NumPy index and offset arrays), so
+scoring all candidates against a requirement is a single weighted
+bincount over the matrix: each required skill weighs its IDF, and a
+candidate's score is the share of the requirement's total weight it
+covers (0 to 1).
+
+The index is per worker and loaded on first use. This worker's
+candidate changes are applied as they happen; changes made by other
+workers arrive as candidate events on the events channel and are
+re-read from the primary before the next match (a replica may not have
+the change yet when the event arrives).
+"""
+import asyncio
+import logging
+import math
+from dataclasses import dataclass
+from typing import Any, Iterable, Optional
+from uuid import UUID
+
+import numpy as np
+from sqlalchemy import select
+
+from app.core.database import read_only_session_maker
+from app.core.events import Event
+from app.models.candidate import Candidate
+
+logger = logging.getLogger(__name__)
+
+# Rebuild the matrix without replaced and removed rows past this share
+MAX_DEAD_ROW_RATIO = 0.25
+
+
+def normalize_skill(name: str) -> str:
+    """Case-fold and collapse whitespace, so 'Machine  Learning' == 'machine learning'"""
+    return " ".join(name.casefold().split())
+
+
+def skill_names(skills: Any) -> list[str]:
+    """
+    Get the normalized skill names of a skills value
+    
+    Args:
+        skills: List of names, or dict keyed by name (e.g. name -> level)
+        
+    Returns:
+        Distinct normalized names
+    """
+    if isinstance(skills, dict):
+        names: Iterable[Any] = skills.keys()
+    elif isinstance(skills, (list, tuple)):
+        names = skills
+    else:
+        return []
+    return list(dict.fromkeys(
+        normalized for name in names if isinstance(name, str) and (normalized := normalize_skill(name))
+    ))
+
+
+@dataclass
+class SkillMatch:
+    """A candidate's score against a requirement"""
+    candidate_id: UUID
+    score: float
+    matched_skills: list[str]
+    missing_skills: list[str]
+
+
+class SkillMatchIndex:
+    """
+    Candidate skill vectors as a CSR matrix over a skill vocabulary
+    
+    Updated rows are appended and the old row is marked dead; dead rows
+    are dropped when they pass MAX_DEAD_ROW_RATIO. Mutations are plain
+    synchronous code on the event loop thread, so they need no lock.
+    """
+    
+    def __init__(self):
+        self.version = 0
+        self.loaded = False
+        self._lock = asyncio.Lock()
+        self._stale: set[UUID] = set()
+        self._reset()
+    
+    def _reset(self) -> None:
+        self._vocab: dict[str, int] = {}
+        self._names: list[str] = []
+        self._candidate_ids: list[UUID] = []
+        self._row_of: dict[UUID, int] = {}
+        self._indptr = np.zeros(1, dtype=np.int64)
+        self._indices = np.zeros(0, dtype=np.int32)
+        self._entry_rows = np.zeros(0, dtype=np.int32)
+        self._live = np.zeros(0, dtype=bool)
+        self._pending: dict[UUID, np.ndarray] = {}
+        self._df: Optional[np.ndarray] = None
+    
+    @property
+    def size(self) -> int:
+        """Candidates with at least one skill"""
+        return len(self._row_of) + len(self._pending)
+    
+    def _encode(self, skills: Any) -> np.ndarray:
+        """Map skills to sorted vocabulary IDs, adding unseen names"""
+        ids = []
+        for name in skill_names(skills):
+            skill_id = self._vocab.get(name)
+            if skill_id is None:
+                skill_id = self._vocab[name] = len(self._names)
+                self._names.append(name)
+            ids.append(skill_id)
+        return np.unique(np.array(ids, dtype=np.int32))
+    
+    def update(self, candidate_id: UUID, skills: Any) -> None:
+        """
+        Set a candidate's skills
+        
+        Args:
+            candidate_id: Candidate ID
+            skills: Candidate.skills value (list or dict)
+        """
+        if not self.loaded:
+            # A load may be reading the table right now; re-read after it
+            self._stale.add(candidate_id)
+            return
+        self.remove(candidate_id)
+        ids = self._encode(skills)
+        if ids.size:
+            self._pending[candidate_id] = ids
+    
+    def remove(self, candidate_id: UUID) -> None:
+        """Drop a candidate (deleted, or no skills left)"""
+        if not self.loaded:
+            self._stale.add(candidate_id)
+            return
+        self._pending.pop(candidate_id, None)
+        row = self._row_of.pop(candidate_id, None)
+        if row is not None:
+            self._live[row] = False
+            self._df = None
+    
+    def mark_stale(self, candidate_ids: Iterable[UUID]) -> None:
+        """Re-read candidates from the database before the next match"""
+        self._stale.update(candidate_ids)
+    
+    def invalidate(self, payload: Optional[str] = None) -> None:
+        """Drop the whole index; it reloads on next use"""
+        self.version += 1
+        self.loaded = False
+        self._stale.clear()
+        self._reset()
+    
+    def on_event(self, payload: Optional[str]) -> None:
+        """
+        Follow candidate events published by any worker
+        
+        Args:
+            payload: Event payload on the events channel, or None after
+                a reconnect when events may have been lost
+        """
+        if payload is None:
+            self.invalidate()
+            return
+        try:
+            item = Event.from_payload(payload)
+        except (ValueError, KeyError, TypeError):
+            return
+        if item.type == "candidates.imported":
+            self.invalidate()
+        elif item.is_local:
+            # Already applied by the endpoint that made the change
+            return
+        elif item.type in ("candidate.created", "candidate.deleted") or (
+            item.type == "candidate.updated" and "skills" in item.data.get("changed", ())
+        ):
+            self.mark_stale([UUID(item.data["candidate_id"])])
+    
+    async def load(self) -> None:
+        """Read every live candidate's skills and rebuild the matrix"""
+        version = self.version
+        async with read_only_session_maker() as session:
+            rows = (await session.execute(
+                select(Candidate.id, Candidate.skills).where(Candidate.deleted_at.is_(None))
+            )).all()
+        
+        if version != self.version:
+            return
+        
+        self._reset()
+        self.loaded = True
+        for candidate_id, skills in rows:
+            ids = self._encode(skills)
+            if ids.size:
+                self._pending[candidate_id] = ids
+        self._compact(force=True)
+        logger.info(f"Skill index loaded: {self.size} candidates, {len(self._names)} skills")
+    
+    async def _refresh_stale(self) -> None:
+        """Re-read candidates changed by other workers in one query on the primary"""
+        stale, self._stale = self._stale, set()
+        async with read_only_session_maker() as session:
+            rows = (await session.execute(
+                select(Candidate.id, Candidate.skills).where(
+                    Candidate.id.in_(stale),
+                    Candidate.deleted_at.is_(None),
+                )
+            )).all()
+        found = set()
+        for candidate_id, skills in rows:
+            found.add(candidate_id)
+            self.update(candidate_id, skills)
+        for candidate_id in stale - found:
+            self.remove(candidate_id)
+    
+    def _compact(self, force: bool = False) -> None:
+        """Fold pending rows into the matrix, dropping dead rows when there are many"""
+        dead = len(self._candidate_ids) - len(self._row_of)
+        if not force and not self._pending and dead <= MAX_DEAD_ROW_RATIO * max(len(self._candidate_ids), 1):
+            return
+        
+        if force or dead > MAX_DEAD_ROW_RATIO * max(len(self._candidate_ids), 1):
+            # Rebuild from live rows only
+            rows = [
+                (candidate_id, self._indices[self._indptr[row]:self._indptr[row + 1]])
+                for candidate_id, row in self._row_of.items()
+            ]
+            self._candidate_ids, self._row_of = [], {}
+            self._indptr = np.zeros(1, dtype=np.int64)
+            self._indices = np.zeros(0, dtype=np.int32)
+            self._live = np.zeros(0, dtype=bool)
+        else:
+            rows = []
+        rows.extend(self._pending.items())
+        self._pending = {}
+        
+        if rows:
+            start = len(self._candidate_ids)
+            lengths = np.fromiter((ids.size for _, ids in rows), dtype=np.int64, count=len(rows))
+            self._indptr = np.concatenate([self._indptr, self._indptr[-1] + np.cumsum(lengths)])
+            self._indices = np.concatenate([self._indices, *(ids for _, ids in rows)])
+            self._live = np.concatenate([self._live, np.ones(len(rows), dtype=bool)])
+            for offset, (candidate_id, _) in enumerate(rows):
+                self._row_of[candidate_id] = start + offset
+                self._candidate_ids.append(candidate_id)
+        
+        self._entry_rows = np.repeat(
+            np.arange(len(self._candidate_ids), dtype=np.int32), np.diff(self._indptr)
+        )
+        self._df = None
+    
+    async def ensure_loaded(self) -> None:
+        """Load the index once; concurrent callers wait for the same load"""
+        if self.loaded:
+            return
+        async with self._lock:
+            # An invalidation during the load discards it; load again
+            while not self.loaded:
+                await self.load()
+    
+    async def match(self, required_skills: Any, top_k: int) -> list[SkillMatch]:
+        """
+        Rank candidates against a requirement's skills
+        
+        Args:
+            required_skills: Requirement.required_skills
+            top_k: Number of best matches to return
+            
+        Returns:
+            Best matches with a score above zero, best first
+        """
+        await self.ensure_loaded()
+        if self._stale:
+            await self._refresh_stale()
+        self._compact()
+        
+        required = skill_names(required_skills)
+        if not required or not self._candidate_ids:
+            return []
+        
+        if self._df is None:
+            self._df = np.bincount(
+                self._indices[self._live[self._entry_rows]], minlength=len(self._names)
+            )
+        live_rows = len(self._row_of)
+        
+        # Smooth IDF: skills few candidates have weigh more; unknown skills weigh most
+        weights = np.zeros(len(self._names), dtype=np.float64)
+        total = 0.0
+        for name in required:
+            skill_id = self._vocab.get(name)
+            df = int(self._df[skill_id]) if skill_id is not None and skill_id < len(self._df) else 0
+            idf = math.log((live_rows + 1) / (df + 1)) + 1.0
+            total += idf
+            if skill_id is not None:
+                weights[skill_id] = idf
+        
+        scores = np.bincount(
+            self._entry_rows, weights=weights[self._indices], minlength=len(self._candidate_ids)
+        ) / total
+        scores[~self._live] = 0.0
+        
+        k = min(top_k, int(np.count_nonzero(scores)))
+        if k == 0:
+            return []
+        best = np.argpartition(-scores, k - 1)[:k]
+        best = best[np.argsort(-scores[best], kind="stable")]
+        
+        matches = []
+        for row in best:
+            have = {self._names[i] for i in self._indices[self._indptr[row]:self._indptr[row + 1]]}
+            matches.append(SkillMatch(
+                candidate_id=self._candidate_ids[row],
+                score=round(float(scores[row]), 4),
+                matched_skills=[name for name in required if name in have],
+                missing_skills=[name for name in required if name not in have],
+            ))
+        return matches
+
+
+skill_index = SkillMatchIndex()
@@ -9,7 +9,8 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
-from app.core.security import get_password_hash, verify_password
+from app.core.principal import invalidate_principal, notify_principal_changed
+from app.core.security import get_password_hash_async, verify_password_async
 from app.models.user import User
 from app.schemas.user import UserCreate, UserUpdate
 
@@ -94,7 +95,7 @@ class UserService:
         if not user:
             return None
         
-        if not verify_password(password, user.password_hash):
+        if not await verify_password_async(password, user.password_hash):
             return None
         
         if not user.is_active:
@@ -112,7 +113,7 @@ class UserService:
         Returns:
             Created user instance
         """
-        password_hash = get_password_hash(user_data.password)
+        password_hash = await get_password_hash_async(user_data.password)
         
         user = User(
             email=user_data.email,
@@ -128,11 +129,11 @@ class UserService:
             is_superuser=False,
             email_verified=False,
             phone_verified=False,
+            roles=[],  # Loaded (empty) collection, so serializing needs no query
         )
         
         self.db.add(user)
         await self.db.commit()
-        await self.db.refresh(user)
         
         return user
     
@@ -163,8 +164,9 @@ class UserService:
             if hasattr(user, key):
                 setattr(user, key, value)
         
+        await notify_principal_changed(self.db, user.id)
         await self.db.commit()
-        await self.db.refresh(user)
+        invalidate_principal(user.id)
         
         return user
     
@@ -181,11 +183,10 @@ class UserService:
         """
         from datetime import datetime
         
-        user.password_hash = get_password_hash(new_password)
+        user.password_hash = await get_password_hash_async(new_password)
         user.password_changed_at = datetime.utcnow()
         
         await self.db.commit()
-        await self.db.refresh(user)
         
         return user
     
@@ -202,7 +203,8 @@ class UserService:
         user.soft_delete()
         user.is_active = False
         
+        await notify_principal_changed(self.db, user.id)
         await self.db.commit()
-        await self.db.refresh(user)
+        invalidate_principal(user.id)
         
         return user
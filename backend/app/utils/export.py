@@ -0,0 +1,113 @@
+"""
+Streaming CSV/NDJSON exports
+
+Rows are read through a server-side cursor on a session owned by the
+response body and serialized one partition at a time, so an export holds
+at most EXPORT_BATCH_SIZE rows in memory however many it returns.
+"""
+import csv
+import io
+import json
+from datetime import datetime, timezone
+from enum import Enum
+from typing import Any, AsyncIterator
+
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+from sqlalchemy import Select
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.core.config import settings
+
+
+class ExportFormat(str, Enum):
+    """Supported export formats"""
+    CSV = "csv"
+    NDJSON = "ndjson"
+
+
+MEDIA_TYPES = {
+    ExportFormat.CSV: "text/csv; charset=utf-8",
+    ExportFormat.NDJSON: "application/x-ndjson",
+}
+
+
+def _csv_value(value: Any) -> Any:
+    """Flatten a JSON-mode value into a CSV cell"""
+    if value is None:
+        return ""
+    # Lists as semicolon-separated values and dicts as JSON objects, both of
+    # which the bulk import reads back (e.g. candidate skills)
+    if isinstance(value, list):
+        return ";".join(str(item) for item in value)
+    if isinstance(value, dict):
+        return json.dumps(value, separators=(",", ":"))
+    return value
+
+
+async def _stream_rows(
+    session_maker: async_sessionmaker,
+    query: Select,
+    schema: type[BaseModel],
+    export_format: ExportFormat,
+) -> AsyncIterator[str]:
+    """Yield the serialized export one partition at a time"""
+    columns = list(schema.model_fields)
+    
+    # The request's session may be closed before the body is fully sent,
+    # so the export opens its own for the lifetime of the stream
+    async with session_maker() as session:
+        result = await session.stream_scalars(
+            query.execution_options(yield_per=settings.EXPORT_BATCH_SIZE)
+        )
+        
+        buffer = io.StringIO()
+        writer = csv.DictWriter(buffer, fieldnames=columns, extrasaction="ignore")
+        if export_format == ExportFormat.CSV:
+            writer.writeheader()
+        
+        async for partition in result.partitions():
+            for obj in partition:
+                row = schema.model_validate(obj).model_dump(mode="json")
+                if export_format == ExportFormat.CSV:
+                    writer.writerow({key: _csv_value(value) for key, value in row.items()})
+                else:
+                    buffer.write(json.dumps(row, separators=(",", ":")))
+                    buffer.write("\n")
+            
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+        
+        if buffer.tell():
+            yield buffer.getvalue()
+
+
+def export_response(
+    session_maker: async_sessionmaker,
+    query: Select,
+    schema: type[BaseModel],
+    export_format: ExportFormat,
+    name: str,
+) -> StreamingResponse:
+    """
+    Stream the rows of a query as a CSV or NDJSON download
+    
+    Args:
+        session_maker: Session factory to read with (primary or replica)
+        query: Filtered and ordered select of ORM entities
+        schema: Response schema each entity is serialized with
+        export_format: Output format
+        name: File name prefix (e.g. 'requirements')
+        
+    Returns:
+        Streaming response with a Content-Disposition attachment header
+    """
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    filename = f"{name}-{stamp}.{export_format.value}"
+    
+    return StreamingResponse(
+        _stream_rows(session_maker, query, schema, export_format),
+        media_type=MEDIA_TYPES[export_format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
@@ -0,0 +1,289 @@
+"""
+Pagination helpers
+
+Pages are fetched together with their total in a single statement using a
+window count. Callers can instead ask for a planner estimate or no total
+at all, which avoids scanning every matching row on large tables.
+
+Cursors are opaque, URL-safe tokens encoding the sort value and ID of the
+last row of a page. Continuing from a cursor is an index range scan on a
+composite (sort column, id) index, so deep pages cost the same as the first.
+Ranked search results are ordered by relevance and page by offset only.
+"""
+import base64
+import json
+from dataclasses import dataclass
+from datetime import datetime
+from enum import Enum
+from typing import Any, Optional, Sequence
+from uuid import UUID
+
+from fastapi import HTTPException, status
+from sqlalchemy import Select, func, select, text, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.expression import ClauseElement, Executable
+
+TOTAL_COLUMN = "total_count"
+
+
+class CountMode(str, Enum):
+    """How the total number of matching rows is computed"""
+    EXACT = "exact"
+    ESTIMATE = "estimate"
+    NONE = "none"
+
+
+@dataclass
+class Page:
+    """A page of results with its (possibly estimated) total"""
+    items: list[Any]
+    total: Optional[int]
+    total_is_estimate: bool
+    next_cursor: Optional[str]
+    
+    def to_response(self, skip: int, limit: int) -> dict[str, Any]:
+        """
+        Build the body of a paginated list response
+        
+        Args:
+            skip: Offset that was requested
+            limit: Page size that was requested
+            
+        Returns:
+            Dict matching the *ListResponse schemas
+        """
+        return {
+            "items": self.items,
+            "total": self.total,
+            "total_is_estimate": self.total_is_estimate,
+            "page": skip // limit + 1,
+            "page_size": limit,
+            "total_pages": (self.total + limit - 1) // limit if self.total is not None else None,
+            "next_cursor": self.next_cursor,
+        }
+
+
+def encode_cursor(sort_value: datetime, row_id: UUID) -> str:
+    """
+    Encode a keyset position as an opaque cursor
+    
+    Args:
+        sort_value: Value of the sort column for the last row of a page
+        row_id: ID of the last row of a page
+        
+    Returns:
+        URL-safe cursor string
+    """
+    raw = json.dumps([sort_value.isoformat(), str(row_id)], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, UUID]:
+    """
+    Decode a cursor produced by encode_cursor
+    
+    Args:
+        cursor: Cursor string
+        
+    Returns:
+        Tuple of (sort value, row ID)
+        
+    Raises:
+        HTTPException: If the cursor is malformed
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        sort_value, row_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return datetime.fromisoformat(sort_value), UUID(row_id)
+    except (ValueError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid pagination cursor",
+        )
+
+
+def apply_keyset(query: Select, sort_column: Any, id_column: Any, cursor: Optional[str]) -> Select:
+    """
+    Order a query newest first and continue after a cursor
+    
+    Args:
+        query: Filtered select statement
+        sort_column: Timestamp column to order by (e.g. created_at)
+        id_column: Primary key column used as tie-breaker
+        cursor: Optional cursor from a previous page
+        
+    Returns:
+        Ordered (and, with a cursor, range-restricted) select statement
+    """
+    if cursor:
+        sort_value, row_id = decode_cursor(cursor)
+        query = query.where(tuple_(sort_column, id_column) < tuple_(sort_value, row_id))
+    
+    return query.order_by(sort_column.desc(), id_column.desc())
+
+
+def next_cursor(
+    items: Sequence[Any],
+    sort_attr: str,
+    limit: int,
+    id_attr: str = "id",
+) -> Optional[str]:
+    """
+    Build the cursor for the page following items
+    
+    Args:
+        items: Rows of the current page
+        sort_attr: Attribute name of the sort column on each row
+        limit: Page size that was requested
+        id_attr: Attribute name of the ID column on each row
+        
+    Returns:
+        Cursor string, or None if this is the last page
+    """
+    if len(items) < limit:
+        return None
+    
+    last = items[-1]
+    sort_value = getattr(last, sort_attr)
+    if sort_value is None:
+        return None
+    
+    return encode_cursor(sort_value, getattr(last, id_attr))
+
+
+class _Explain(Executable, ClauseElement):
+    """EXPLAIN (FORMAT JSON) of a select, executed with the select's bound parameters"""
+    
+    inherit_cache = False
+    
+    def __init__(self, query: Select):
+        self.query = query
+
+
+@compiles(_Explain)
+def _compile_explain(element: _Explain, compiler: Any, **kw: Any) -> str:
+    # Compile the select as a nested statement so its columns are not taken
+    # as the result columns; EXPLAIN returns a single plan column
+    compiler.stack.append({"correlate_froms": set(), "asfrom_froms": set(), "selectable": element})
+    try:
+        return f"EXPLAIN (FORMAT JSON) {compiler.process(element.query, **kw)}"
+    finally:
+        compiler.stack.pop()
+
+
+async def estimate_count(db: AsyncSession, query: Select, table_name: Optional[str] = None) -> Optional[int]:
+    """
+    Estimate the number of rows a query returns without running it
+    
+    Uses pg_class.reltuples when the query is a plain scan of table_name,
+    otherwise the planner's row estimate from EXPLAIN.
+    
+    Args:
+        db: Database session
+        query: Filtered select statement (without ordering or limits)
+        table_name: Table to read the row estimate of, for unfiltered queries
+        
+    Returns:
+        Estimated row count, or None if no estimate is available
+    """
+    if table_name:
+        reltuples = await db.scalar(
+            text("SELECT reltuples::bigint FROM pg_class WHERE oid = CAST(:table AS regclass)"),
+            {"table": table_name},
+        )
+        # reltuples is -1 until the table has been vacuumed or analyzed
+        if reltuples is not None and reltuples >= 0:
+            return int(reltuples)
+    
+    # Filter values (search input included) are sent as bound parameters
+    result = await db.execute(_Explain(query))
+    plan = result.scalar_one()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+async def fetch_page(
+    db: AsyncSession,
+    query: Select,
+    *,
+    sort_column: Any,
+    id_column: Any,
+    limit: int,
+    skip: int = 0,
+    cursor: Optional[str] = None,
+    count: CountMode = CountMode.EXACT,
+    estimate_table: Optional[str] = None,
+    rank: Optional[Any] = None,
+) -> Page:
+    """
+    Fetch one page of a filtered query together with its total
+    
+    In offset mode with an exact count, the total is a window count over
+    the page query, so page and total cost one statement and one scan.
+    
+    Args:
+        db: Database session
+        query: Filtered select statement (without ordering or limits)
+        sort_column: Timestamp column to order by, newest first
+        id_column: Primary key column used as tie-breaker
+        limit: Page size
+        skip: Offset, ignored when a cursor is given
+        cursor: Optional cursor from a previous page
+        count: How to compute the total
+        estimate_table: Table whose reltuples estimates an unfiltered query
+        rank: Optional relevance expression to order by before the sort column
+        
+    Returns:
+        Page of items. Single-entity queries yield entities, others yield rows.
+        
+    Raises:
+        HTTPException: If a cursor is combined with a rank
+    """
+    if rank is not None and cursor:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Cursor pagination is not available for search results",
+        )
+    
+    single_entity = len(query.column_descriptions) == 1
+    page_query = apply_keyset(query, sort_column, id_column, cursor)
+    if rank is not None:
+        page_query = page_query.order_by(None).order_by(
+            rank.desc(), sort_column.desc(), id_column.desc()
+        )
+    if not cursor:
+        page_query = page_query.offset(skip)
+    
+    # A window count is only the total when no cursor narrows the rows
+    window_count = count == CountMode.EXACT and not cursor
+    if window_count:
+        page_query = page_query.add_columns(func.count().over().label(TOTAL_COLUMN))
+    
+    result = await db.execute(page_query.limit(limit))
+    rows = result.all()
+    items = [row[0] for row in rows] if single_entity else list(rows)
+    
+    total: Optional[int] = None
+    total_is_estimate = False
+    if window_count and rows:
+        total = rows[0]._mapping[TOTAL_COLUMN]
+    elif count == CountMode.EXACT:
+        if not cursor and skip == 0:
+            total = 0
+        else:
+            total = await db.scalar(select(func.count()).select_from(query.subquery()))
+    elif count == CountMode.ESTIMATE:
+        total = await estimate_count(db, query, estimate_table)
+        total_is_estimate = total is not None
+    
+    cursor_rows = items if single_entity else rows
+    return Page(
+        items=items,
+        total=total,
+        total_is_estimate=total_is_estimate,
+        next_cursor=None if rank is not None else next_cursor(
+            cursor_rows, sort_column.key, limit, id_attr=id_column.key
+        ),
+    )
@@ -0,0 +1,92 @@
+"""
+Query-count benchmark for the public careers endpoints
+
+Drives the app in-process and counts the SQL statements each page of
+/public/jobs issues. The count must stay the same whatever the page size,
+i.e. no per-row lazy loads of department or location.
+
+Run from backend/ against a database with posted requirements:
+    python -m benchmarks.bench_public_jobs --pages 5 --limit 50
+"""
+import argparse
+import asyncio
+import sys
+import time
+
+import httpx
+from sqlalchemy import event
+
+from app.core.config import settings
+from app.core.database import engine
+from app.main import app
+
+
+class QueryCounter:
+    """Count statements executed on the application engine"""
+    
+    def __init__(self):
+        self.count = 0
+    
+    def _on_execute(self, *args) -> None:
+        self.count += 1
+    
+    def __enter__(self) -> "QueryCounter":
+        self.count = 0
+        event.listen(engine.sync_engine, "before_cursor_execute", self._on_execute)
+        return self
+    
+    def __exit__(self, *exc) -> None:
+        event.remove(engine.sync_engine, "before_cursor_execute", self._on_execute)
+
+
+async def run(pages: int, limit: int) -> bool:
+    """
+    Fetch consecutive pages and report query counts
+    
+    Args:
+        pages: Number of pages to fetch
+        limit: Page size
+        
+    Returns:
+        True if every non-empty page issued the same number of queries
+    """
+    counts = set()
+    transport = httpx.ASGITransport(app=app)
+    
+    async with httpx.AsyncClient(transport=transport, base_url="http://benchmark") as client:
+        for page in range(pages):
+            with QueryCounter() as counter:
+                start = time.perf_counter()
+                response = await client.get(
+                    f"{settings.API_V1_PREFIX}/public/jobs",
+                    params={"skip": page * limit, "limit": limit},
+                )
+                elapsed_ms = (time.perf_counter() - start) * 1000
+            
+            response.raise_for_status()
+            items = response.json()["items"]
+            print(f"page {page + 1}: {len(items):>3} jobs  {counter.count} queries  {elapsed_ms:7.1f} ms")
+            
+            if not items:
+                break
+            counts.add(counter.count)
+    
+    await engine.dispose()
+    
+    constant = len(counts) <= 1
+    print("query count per page:", "constant" if constant else f"varies {sorted(counts)}")
+    return constant
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--pages", type=int, default=5, help="Number of pages to fetch")
+    parser.add_argument("--limit", type=int, default=50, help="Page size (max 100)")
+    args = parser.parse_args()
+    
+    ok = asyncio.run(run(args.pages, args.limit))
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
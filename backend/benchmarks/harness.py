@@ -0,0 +1,219 @@
+"""
+Load driver and result bookkeeping shared by the benchmark runners
+
+A scenario is one endpoint call. run_scenario() sends it a fixed number
+of times from concurrent workers and summarizes latency percentiles,
+throughput and the database work reported in the X-DB-Queries and
+X-DB-Round-Trips response headers.
+"""
+import asyncio
+import json
+import math
+import platform
+import statistics
+import subprocess
+import time
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+import httpx
+
+from app.core.db_metrics import QUERIES_HEADER, ROUND_TRIPS_HEADER
+
+
+@dataclass
+class Scenario:
+    """One endpoint call to benchmark"""
+    
+    name: str
+    method: str
+    path: str  # Full path including the API prefix
+    headers: dict[str, str] = field(default_factory=dict)
+    params: Optional[Callable[[int], dict[str, Any]]] = None  # Query params for the n-th call
+    expected_status: int = 200
+
+
+@dataclass
+class ScenarioResult:
+    """Summary of one scenario run"""
+    
+    name: str
+    method: str
+    path: str
+    requests: int
+    errors: int
+    concurrency: int
+    throughput_rps: float
+    latency_ms: dict[str, float]
+    db_queries: dict[str, float]
+    db_round_trips: dict[str, float]
+
+
+def percentile(ordered: list[float], q: float) -> float:
+    """
+    Nearest-rank percentile of an ascending list
+    
+    Args:
+        ordered: Sorted samples
+        q: Percentile between 0 and 100
+        
+    Returns:
+        Sample at that rank, 0 for no samples
+    """
+    if not ordered:
+        return 0.0
+    rank = max(math.ceil(q / 100 * len(ordered)), 1)
+    return ordered[rank - 1]
+
+
+def _summary(samples: list[float]) -> dict[str, float]:
+    ordered = sorted(samples)
+    return {
+        "min": round(ordered[0], 3) if ordered else 0.0,
+        "p50": round(percentile(ordered, 50), 3),
+        "p95": round(percentile(ordered, 95), 3),
+        "p99": round(percentile(ordered, 99), 3),
+        "max": round(ordered[-1], 3) if ordered else 0.0,
+        "mean": round(statistics.fmean(ordered), 3) if ordered else 0.0,
+    }
+
+
+async def run_scenario(
+    client: httpx.AsyncClient,
+    scenario: Scenario,
+    requests: int,
+    concurrency: int,
+    warmup: int = 0,
+) -> ScenarioResult:
+    """
+    Send a scenario repeatedly and summarize the responses
+    
+    Args:
+        client: Client bound to the app (in-process or over HTTP)
+        scenario: Endpoint call to send
+        requests: Measured calls
+        concurrency: Calls in flight at once
+        warmup: Unmeasured calls sent first (connection pools, caches)
+        
+    Returns:
+        Latency, throughput and database work of the measured calls
+    """
+    async def send(n: int) -> httpx.Response:
+        params = scenario.params(n) if scenario.params else None
+        return await client.request(scenario.method, scenario.path, params=params, headers=scenario.headers)
+    
+    for n in range(warmup):
+        await send(n)
+    
+    latencies: list[float] = []
+    queries: list[float] = []
+    round_trips: list[float] = []
+    errors = 0
+    next_call = iter(range(requests))
+    
+    async def worker() -> None:
+        nonlocal errors
+        for n in next_call:
+            start = time.perf_counter()
+            try:
+                response = await send(n)
+                await response.aread()
+            except httpx.HTTPError:
+                errors += 1
+                continue
+            latencies.append((time.perf_counter() - start) * 1000)
+            if response.status_code != scenario.expected_status:
+                errors += 1
+            if QUERIES_HEADER in response.headers:
+                queries.append(float(response.headers[QUERIES_HEADER]))
+                round_trips.append(float(response.headers[ROUND_TRIPS_HEADER]))
+    
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    
+    return ScenarioResult(
+        name=scenario.name,
+        method=scenario.method,
+        path=scenario.path,
+        requests=requests,
+        errors=errors,
+        concurrency=concurrency,
+        throughput_rps=round(requests / elapsed, 2) if elapsed else 0.0,
+        latency_ms=_summary(latencies),
+        db_queries=_summary(queries),
+        db_round_trips=_summary(round_trips),
+    )
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def build_report(results: list[ScenarioResult], config: dict[str, Any]) -> dict[str, Any]:
+    """
+    Bundle results with enough context to compare runs later
+    
+    Args:
+        results: Scenario results
+        config: Runner settings (mode, volumes, concurrency, ...)
+        
+    Returns:
+        JSON-serializable report
+    """
+    return {
+        "commit": _git_commit(),
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "config": config,
+        "scenarios": {result.name: asdict(result) for result in results},
+    }
+
+
+def save_report(report: dict[str, Any], path: Path) -> None:
+    """Write a report as indented JSON, creating parent directories"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(report, indent=2) + "\n")
+
+
+def compare_reports(baseline: dict[str, Any], current: dict[str, Any], threshold: float) -> list[str]:
+    """
+    Print per-scenario changes against a baseline report
+    
+    Args:
+        baseline: Earlier report
+        current: Report of this run
+        threshold: Allowed p95 latency increase, in percent
+        
+    Returns:
+        Names of scenarios whose p95 latency or query count regressed
+    """
+    regressions = []
+    print(f"\nvs {baseline.get('commit') or 'baseline'} ({baseline.get('created_at', '?')})")
+    print(f"{'scenario':<28} {'p95 ms':>18} {'rps':>18} {'queries p50':>14}")
+    for name, result in current["scenarios"].items():
+        before = baseline.get("scenarios", {}).get(name)
+        if before is None:
+            print(f"{name:<28} {'(new)':>18}")
+            continue
+        
+        p95_before, p95_now = before["latency_ms"]["p95"], result["latency_ms"]["p95"]
+        change = (p95_now - p95_before) / p95_before * 100 if p95_before else 0.0
+        queries_before, queries_now = before["db_queries"]["p50"], result["db_queries"]["p50"]
+        print(
+            f"{name:<28} {p95_before:>7.1f} -> {p95_now:>7.1f}"
+            f" {before['throughput_rps']:>7.1f} -> {result['throughput_rps']:>7.1f}"
+            f" {queries_before:>5.0f} -> {queries_now:>5.0f}"
+            f"  {change:+.1f}%"
+        )
+        if change > threshold or queries_now > queries_before:
+            regressions.append(name)
+    
+    return regressions
@@ -0,0 +1,222 @@
+"""
+Endpoint latency and throughput benchmark
+
+Drives the main read endpoints with concurrent requests and reports
+p50/p95/p99 latency, throughput and database queries per request. The
+app runs in-process through httpx's ASGI transport unless --base-url
+points at a running server (e.g. uvicorn with several workers); tokens
+are minted locally, so the server must share this SECRET_KEY.
+
+Results are written as JSON; pass an earlier file as --compare to print
+the changes and exit non-zero on a regression.
+
+Run from backend/ after seeding (python -m benchmarks.seed):
+    python -m benchmarks.run --requests 500 --concurrency 20
+    python -m benchmarks.run --base-url http://localhost:8000 --compare benchmarks/results/abc1234.json
+"""
+import argparse
+import asyncio
+import json
+import sys
+from pathlib import Path
+from typing import Any, Optional
+
+import httpx
+from sqlalchemy import select
+
+from app.core.config import settings
+from app.core.database import async_session_maker, engine
+from app.core.security import create_access_token
+from app.models.approval import Approval, ApprovalStatus
+from app.models.candidate import Candidate
+from app.models.requirement import Requirement
+from app.models.role import Role, user_roles
+from app.models.user import User
+from benchmarks.harness import Scenario, build_report, compare_reports, run_scenario, save_report
+from benchmarks.seed import BENCH_EMAIL_DOMAIN, BENCH_NUMBER_PREFIX
+
+RESULTS_DIR = Path(__file__).parent / "results"
+
+SEARCH_TERMS = ["engineer", "data", "platform", "python", "manager"]
+
+
+async def _user_with_role(db: Any, role: str) -> Optional[Any]:
+    """Get a benchmark user holding a role, preferring one with pending approvals"""
+    query = (
+        select(User.id)
+        .join(user_roles, user_roles.c.user_id == User.id)
+        .join(Role, Role.id == user_roles.c.role_id)
+        .where(Role.name == role, User.email.like(f"%@{BENCH_EMAIL_DOMAIN}"))
+    )
+    if role == "approver":
+        query = query.join(Approval, Approval.approver_id == User.id).where(
+            Approval.status == ApprovalStatus.PENDING
+        )
+    return await db.scalar(query.limit(1))
+
+
+async def discover() -> dict[str, Any]:
+    """
+    Look up seeded IDs the scenarios need
+    
+    Returns:
+        Users by role, requirement IDs and a posted requirement's slug
+    """
+    async with async_session_maker() as db:
+        users = {role: await _user_with_role(db, role) for role in ("admin", "approver", "recruiter")}
+        requirement_ids = list(await db.scalars(
+            select(Requirement.id)
+            .where(Requirement.requirement_number.like(f"{BENCH_NUMBER_PREFIX}%"))
+            .order_by(Requirement.requirement_number)
+            .limit(200)
+        ))
+        candidate_requirement = await db.scalar(
+            select(Candidate.requirement_id)
+            .where(Candidate.email.like(f"%@{BENCH_EMAIL_DOMAIN}"))
+            .limit(1)
+        )
+        posted_number = await db.scalar(
+            select(Requirement.requirement_number)
+            .where(
+                Requirement.requirement_number.like(f"{BENCH_NUMBER_PREFIX}%"),
+                Requirement.is_posted == True,
+            )
+            .limit(1)
+        )
+    
+    if not users["admin"] or not requirement_ids:
+        raise SystemExit("No benchmark data found; run python -m benchmarks.seed first")
+    
+    return {
+        "users": users,
+        "requirement_ids": requirement_ids,
+        "candidate_requirement": candidate_requirement,
+        "posted_slug": posted_number.lower() if posted_number else None,
+    }
+
+
+def build_scenarios(context: dict[str, Any], page_size: int) -> list[Scenario]:
+    """Create the scenario list from discovered IDs"""
+    api = settings.API_V1_PREFIX
+    users = context["users"]
+    requirement_ids = context["requirement_ids"]
+    
+    def auth(user_id: Any) -> dict[str, str]:
+        return {"Authorization": f"Bearer {create_access_token(str(user_id))}"}
+    
+    admin = auth(users["admin"])
+    scenarios = [
+        Scenario("requirements.list", "GET", f"{api}/requirements", admin,
+                 lambda n: {"limit": page_size, "count": "estimate"}),
+        Scenario("requirements.list_exact", "GET", f"{api}/requirements", admin,
+                 lambda n: {"limit": page_size}),
+        Scenario("requirements.search", "GET", f"{api}/requirements", admin,
+                 lambda n: {"limit": page_size, "search": SEARCH_TERMS[n % len(SEARCH_TERMS)]}),
+        Scenario("requirements.get", "GET", f"{api}/requirements/{requirement_ids[0]}", admin),
+        Scenario("postings.list", "GET", f"{api}/postings", admin, lambda n: {"limit": page_size}),
+        Scenario("postings.stats", "GET", f"{api}/postings/stats", admin),
+        Scenario("public.jobs", "GET", f"{api}/public/jobs", params=lambda n: {"limit": page_size}),
+        Scenario("reference.departments", "GET", f"{api}/reference-data/departments"),
+        Scenario("users.list", "GET", f"{api}/users", admin),
+    ]
+    
+    if context["posted_slug"]:
+        scenarios.append(Scenario("public.job_detail", "GET", f"{api}/public/jobs/{context['posted_slug']}"))
+    if context["candidate_requirement"]:
+        scenarios.append(Scenario(
+            "candidates.by_requirement", "GET", f"{api}/candidates", admin,
+            lambda n: {"requirement_id": str(context["candidate_requirement"]), "limit": page_size},
+        ))
+    if users["approver"]:
+        approver = auth(users["approver"])
+        scenarios.append(Scenario("approvals.pending", "GET", f"{api}/approvals/pending", approver))
+        scenarios.append(Scenario("approvals.pending_count", "GET", f"{api}/approvals/pending/count", approver))
+        scenarios.append(Scenario("approvals.inbox", "GET", f"{api}/approvals/inbox", approver,
+                                  lambda n: {"limit": page_size}))
+    
+    return scenarios
+
+
+async def run(args: argparse.Namespace) -> int:
+    context = await discover()
+    scenarios = build_scenarios(context, args.page_size)
+    if args.only:
+        scenarios = [s for s in scenarios if any(s.name.startswith(prefix) for prefix in args.only)]
+    
+    if args.base_url:
+        client = httpx.AsyncClient(base_url=args.base_url, timeout=60)
+    else:
+        from app.main import app
+        transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+        client = httpx.AsyncClient(transport=transport, base_url="http://benchmark", timeout=60)
+    
+    results = []
+    async with client:
+        # A scenario that cannot succeed would only measure its error path
+        broken = []
+        for scenario in scenarios:
+            response = await client.request(
+                scenario.method,
+                scenario.path,
+                params=scenario.params(0) if scenario.params else None,
+                headers=scenario.headers,
+            )
+            if response.status_code != scenario.expected_status:
+                broken.append(f"{scenario.name} ({response.status_code})")
+        if broken:
+            print(f"Scenarios not returning their expected status: {', '.join(broken)}")
+            print("Reseed with python -m benchmarks.seed --reset")
+            await engine.dispose()
+            return 1
+        
+        print(f"{'scenario':<28} {'p50':>8} {'p95':>8} {'p99':>8} {'rps':>9} {'queries':>8} {'errors':>7}")
+        for scenario in scenarios:
+            result = await run_scenario(client, scenario, args.requests, args.concurrency, args.warmup)
+            results.append(result)
+            print(
+                f"{result.name:<28} {result.latency_ms['p50']:>8.1f} {result.latency_ms['p95']:>8.1f}"
+                f" {result.latency_ms['p99']:>8.1f} {result.throughput_rps:>9.1f}"
+                f" {result.db_queries['p50']:>8.0f} {result.errors:>7}"
+            )
+    await engine.dispose()
+    
+    report = build_report(results, {
+        "mode": args.base_url or "in-process",
+        "requests": args.requests,
+        "concurrency": args.concurrency,
+        "warmup": args.warmup,
+        "page_size": args.page_size,
+    })
+    output = args.output or RESULTS_DIR / f"{report['commit'] or 'results'}.json"
+    save_report(report, output)
+    print(f"\nSaved {output}")
+    
+    failed = any(result.errors for result in results)
+    if args.compare:
+        baseline = json.loads(args.compare.read_text())
+        regressions = compare_reports(baseline, report, args.threshold)
+        if regressions:
+            print(f"Regressed: {', '.join(regressions)}")
+            failed = True
+    
+    return 1 if failed else 0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=200, help="Measured requests per scenario")
+    parser.add_argument("--concurrency", type=int, default=10, help="Requests in flight at once")
+    parser.add_argument("--warmup", type=int, default=10, help="Unmeasured requests per scenario")
+    parser.add_argument("--page-size", type=int, default=50, help="limit for list endpoints (max 100)")
+    parser.add_argument("--only", nargs="*", help="Run scenarios whose name starts with one of these")
+    parser.add_argument("--base-url", help="Benchmark a running server instead of the in-process app")
+    parser.add_argument("--output", type=Path, help="Report path (default benchmarks/results/<commit>.json)")
+    parser.add_argument("--compare", type=Path, help="Earlier report to compare against")
+    parser.add_argument("--threshold", type=float, default=10.0, help="Allowed p95 increase in percent")
+    args = parser.parse_args()
+    
+    sys.exit(asyncio.run(run(args)))
+
+
+if __name__ == "__main__":
+    main()
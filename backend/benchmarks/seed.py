@@ -0,0 +1,318 @@
+"""
+Synthetic data generator for benchmarks
+
+Seeds users, roles, reference data, requirements, approvals and
+candidates with multi-row INSERTs in large batches. Every generated row
+is tagged ("[bench] " names, REQ-BENCH- numbers, @bench.hiringhare.test
+emails), so --reset removes only benchmark data and the generator can be
+re-run against a development database. The same --seed gives the same
+data, IDs included.
+
+Run from backend/ after applying migrations:
+    python -m benchmarks.seed --users 200 --requirements 5000 --candidates 50000
+    python -m benchmarks.seed --reset
+"""
+import argparse
+import asyncio
+import random
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any
+from uuid import UUID, uuid4
+
+from sqlalchemy import Table, delete, insert, select
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from app.core.database import engine
+from app.core.security import get_password_hash
+from app.models.approval import Approval, ApprovalStage, ApprovalStatus
+from app.models.candidate import Candidate
+from app.models.organization import Department, JobLevel, Location
+from app.models.requirement import PostingStatus, Requirement, RequirementStatus
+from app.models.role import Role, user_roles
+from app.models.user import User
+
+BENCH_EMAIL_DOMAIN = "bench.hiringhare.test"
+BENCH_NAME_PREFIX = "[bench] "
+BENCH_CODE_PREFIX = "BENCH"
+# Careers URLs resolve "req-..." slugs to REQ- numbers, so posted
+# benchmark requirements must use that form to be reachable
+BENCH_NUMBER_PREFIX = "REQ-BENCH-"
+BENCH_PASSWORD = "Bench@2024"
+
+# Roles the API checks (see scripts/assign_user_roles.py)
+ROLE_NAMES = ["admin", "hiring_manager", "approver", "recruiter", "interviewer", "viewer"]
+
+# Share of generated users holding each role (users may hold several)
+ROLE_SHARES = {
+    "hiring_manager": 0.3,
+    "approver": 0.15,
+    "recruiter": 0.25,
+    "interviewer": 0.2,
+    "viewer": 0.1,
+}
+
+BATCH_SIZE = 5000
+
+TITLES = [
+    "Backend Engineer", "Frontend Engineer", "Data Engineer", "Product Manager",
+    "Site Reliability Engineer", "QA Analyst", "Engineering Manager", "UX Designer",
+    "Data Scientist", "Security Engineer", "Technical Writer", "Solutions Architect",
+]
+SKILLS = [
+    "python", "fastapi", "postgresql", "react", "typescript", "aws", "kubernetes",
+    "terraform", "go", "java", "spark", "airflow", "figma", "selenium", "rust",
+]
+WORDS = [
+    "build", "scale", "platform", "services", "customers", "reliable", "data",
+    "design", "ship", "teams", "product", "quality", "cloud", "secure", "fast",
+]
+FIRST_NAMES = ["Ava", "Ben", "Chen", "Dara", "Eli", "Fatima", "Gus", "Hana", "Ivan", "Jia", "Kofi", "Lena"]
+LAST_NAMES = ["Adams", "Brown", "Cruz", "Diaz", "Evans", "Fischer", "Gupta", "Hall", "Ito", "Jones"]
+CITIES = [("Bengaluru", "India"), ("Berlin", "Germany"), ("Austin", "USA"), ("London", "UK"), ("Toronto", "Canada")]
+CANDIDATE_STATUSES = ["new", "screening", "interview", "offer", "hired", "rejected"]
+
+
+def _row(table: Table, **values: Any) -> dict[str, Any]:
+    """Keep only the values the table has columns for"""
+    return {key: value for key, value in values.items() if key in table.c}
+
+
+def _uuid(rng: random.Random) -> UUID:
+    return UUID(int=rng.getrandbits(128), version=4)
+
+
+def _text(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(words)).capitalize() + "."
+
+
+def _created_at(rng: random.Random, now: datetime) -> datetime:
+    # Naive UTC, like the models' own defaults
+    return (now - timedelta(seconds=rng.randint(0, 365 * 24 * 3600))).replace(tzinfo=None)
+
+
+async def _bulk_insert(conn: AsyncConnection, table: Table, rows: list[dict[str, Any]]) -> None:
+    """Insert rows in batches of multi-row INSERT statements"""
+    for start in range(0, len(rows), BATCH_SIZE):
+        await conn.execute(insert(table), rows[start:start + BATCH_SIZE])
+
+
+async def reset(conn: AsyncConnection) -> None:
+    """Delete every row created by the generator, children first"""
+    bench_users = select(User.id).where(User.email.like(f"%@{BENCH_EMAIL_DOMAIN}"))
+    # Created by benchmark users also catches data seeded under older number prefixes
+    bench_requirements = select(Requirement.id).where(
+        Requirement.requirement_number.like(f"{BENCH_NUMBER_PREFIX}%") | Requirement.created_by.in_(bench_users)
+    )
+    
+    await conn.execute(delete(Candidate).where(
+        Candidate.email.like(f"%@{BENCH_EMAIL_DOMAIN}") | Candidate.requirement_id.in_(bench_requirements)
+    ))
+    await conn.execute(delete(Approval).where(Approval.requirement_id.in_(bench_requirements)))
+    await conn.execute(delete(Requirement).where(Requirement.id.in_(bench_requirements)))
+    await conn.execute(delete(user_roles).where(user_roles.c.user_id.in_(bench_users)))
+    await conn.execute(delete(User).where(User.id.in_(bench_users)))
+    for model in (Department, JobLevel, Location):
+        await conn.execute(delete(model).where(model.name.like(f"{BENCH_NAME_PREFIX}%")))
+
+
+async def _ensure_roles(conn: AsyncConnection) -> dict[str, Any]:
+    """Get role IDs by name, creating any role the API expects but is missing"""
+    table = Role.__table__
+    existing = dict((await conn.execute(select(table.c.name, table.c.id))).all())
+    
+    missing = [name for name in ROLE_NAMES if name not in existing]
+    if missing:
+        await _bulk_insert(conn, table, [
+            _row(table, id=uuid4(), name=name, display_name=name.replace("_", " ").title(),
+                 description=f"{name} (benchmark)", is_active=True)
+            for name in missing
+        ])
+        existing = dict((await conn.execute(select(table.c.name, table.c.id))).all())
+    
+    return existing
+
+
+async def seed(
+    conn: AsyncConnection,
+    users: int,
+    departments: int,
+    requirements: int,
+    candidates: int,
+    approvals_per_requirement: int,
+    rng: random.Random,
+) -> dict[str, int]:
+    """
+    Generate and insert one data set
+    
+    Returns:
+        Rows inserted per table
+    """
+    now = datetime.now(timezone.utc)
+    counts: dict[str, int] = {}
+    role_ids = await _ensure_roles(conn)
+    
+    # Reference data
+    dept_table, level_table, location_table = Department.__table__, JobLevel.__table__, Location.__table__
+    dept_rows = [
+        _row(dept_table, id=_uuid(rng), name=f"{BENCH_NAME_PREFIX}Department {i}", code=f"{BENCH_CODE_PREFIX}D{i}",
+             description="Benchmark department", is_active=True)
+        for i in range(departments)
+    ]
+    level_rows = [
+        _row(level_table, id=_uuid(rng), name=f"{BENCH_NAME_PREFIX}Level {i}", code=f"{BENCH_CODE_PREFIX}L{i}",
+             level_order=100 + i, is_active=True)
+        for i in range(5)
+    ]
+    location_rows = [
+        _row(location_table, id=_uuid(rng), name=f"{BENCH_NAME_PREFIX}{city}", code=f"{BENCH_CODE_PREFIX}C{i}",
+             city=city, country=country, is_active=True)
+        for i, (city, country) in enumerate(CITIES)
+    ]
+    for table, rows in ((dept_table, dept_rows), (level_table, level_rows), (location_table, location_rows)):
+        await _bulk_insert(conn, table, rows)
+        counts[table.name] = len(rows)
+    
+    # Users share one password hash; hashing per user would dominate seeding
+    user_table = User.__table__
+    password_hash = get_password_hash(BENCH_PASSWORD)
+    user_rows, role_rows = [], []
+    users_by_role: dict[str, list[Any]] = {name: [] for name in ROLE_NAMES}
+    for i in range(users):
+        user_id = _uuid(rng)
+        created = _created_at(rng, now)
+        user_rows.append(_row(
+            user_table, id=user_id, email=f"user{i}@{BENCH_EMAIL_DOMAIN}", username=f"bench_user_{i}",
+            password_hash=password_hash, first_name=rng.choice(FIRST_NAMES), last_name=rng.choice(LAST_NAMES),
+            job_title=rng.choice(TITLES), department_id=rng.choice(dept_rows)["id"],
+            is_active=True, is_superuser=False, email_verified=True, phone_verified=False,
+            preferences={}, created_at=created, updated_at=created,
+        ))
+        # The first user is the admin; everyone else gets roles by share
+        names = ["admin"] if i == 0 else [n for n, share in ROLE_SHARES.items() if rng.random() < share]
+        for name in names or ["viewer"]:
+            users_by_role[name].append(user_id)
+            role_rows.append(_row(
+                user_roles, id=_uuid(rng), user_id=user_id, role_id=role_ids[name], assigned_at=created,
+            ))
+    await _bulk_insert(conn, user_table, user_rows)
+    await _bulk_insert(conn, user_roles, role_rows)
+    counts[user_table.name] = len(user_rows)
+    counts[user_roles.name] = len(role_rows)
+    
+    managers = users_by_role["hiring_manager"] or [user_rows[0]["id"]]
+    approvers = users_by_role["approver"] or [user_rows[0]["id"]]
+    recruiters = users_by_role["recruiter"] or [user_rows[0]["id"]]
+    
+    # Requirements across the workflow; about a third are posted
+    requirement_table = Requirement.__table__
+    statuses = [
+        (RequirementStatus.DRAFT, 0.2),
+        (RequirementStatus.SUBMITTED, 0.2),
+        (RequirementStatus.APPROVED, 0.25),
+        (RequirementStatus.ACTIVE, 0.35),
+    ]
+    requirement_rows, approval_rows = [], []
+    approval_table = Approval.__table__
+    for i in range(requirements):
+        requirement_id = _uuid(rng)
+        number = f"{BENCH_NUMBER_PREFIX}{i + 1:06d}"
+        status = rng.choices([s for s, _ in statuses], [w for _, w in statuses])[0]
+        created = _created_at(rng, now)
+        submitted = created + timedelta(days=1) if status != RequirementStatus.DRAFT else None
+        posted = status == RequirementStatus.ACTIVE
+        manager = rng.choice(managers)
+        requirement_rows.append(_row(
+            requirement_table, id=requirement_id, requirement_number=number,
+            position_title=f"{rng.choice(TITLES)} {i}", department_id=rng.choice(dept_rows)["id"],
+            job_level_id=rng.choice(level_rows)["id"], location_id=rng.choice(location_rows)["id"],
+            requirement_type="new_headcount", employment_type="full_time",
+            work_mode=rng.choice(["onsite", "hybrid", "remote"]), number_of_positions=rng.randint(1, 5),
+            priority=rng.choice(["low", "medium", "high"]), job_description=_text(rng, 60),
+            key_responsibilities=_text(rng, 20), required_qualifications=_text(rng, 15),
+            required_skills=rng.sample(SKILLS, 4), min_salary=50000, max_salary=150000, currency="USD",
+            justification=_text(rng, 10), status=status, created_by=manager, hiring_manager_id=manager,
+            assigned_recruiter_id=rng.choice(recruiters) if status != RequirementStatus.DRAFT else None,
+            submitted_at=submitted, approved_at=submitted + timedelta(days=2) if posted else None,
+            is_posted=posted, posting_status=PostingStatus.ACTIVE if posted else None,
+            posting_channels=["internal", "linkedin"] if posted else None,
+            job_posting_url=f"/careers/{number.lower()}" if posted else None,
+            posted_at=submitted + timedelta(days=3) if posted else None,
+            created_at=created, updated_at=created,
+        ))
+        
+        if status == RequirementStatus.SUBMITTED:
+            for approver in rng.sample(approvers, min(approvals_per_requirement, len(approvers))):
+                approval_rows.append(_row(
+                    approval_table, id=_uuid(rng), requirement_id=requirement_id, approver_id=approver,
+                    approval_stage=ApprovalStage.DEPARTMENT_HEAD, status=ApprovalStatus.PENDING,
+                    submitted_at=submitted, created_at=submitted, updated_at=submitted,
+                ))
+    await _bulk_insert(conn, requirement_table, requirement_rows)
+    await _bulk_insert(conn, approval_table, approval_rows)
+    counts[requirement_table.name] = len(requirement_rows)
+    counts[approval_table.name] = len(approval_rows)
+    
+    # Candidates only apply to requirements that left draft
+    candidate_table = Candidate.__table__
+    open_requirements = [
+        row["id"] for row in requirement_rows if row.get("status") != RequirementStatus.DRAFT
+    ] or [row["id"] for row in requirement_rows]
+    candidate_rows = []
+    for i in range(candidates if open_requirements else 0):
+        created = _created_at(rng, now)
+        candidate_rows.append(_row(
+            candidate_table, id=_uuid(rng), first_name=rng.choice(FIRST_NAMES), last_name=rng.choice(LAST_NAMES),
+            email=f"candidate{i}@{BENCH_EMAIL_DOMAIN}", requirement_id=rng.choice(open_requirements),
+            status=rng.choice(CANDIDATE_STATUSES), current_title=rng.choice(TITLES),
+            total_experience_years=str(rng.randint(0, 20)), skills=rng.sample(SKILLS, 3),
+            source=rng.choice(["linkedin", "referral", "careers_page"]), created_at=created, updated_at=created,
+        ))
+    await _bulk_insert(conn, candidate_table, candidate_rows)
+    counts[candidate_table.name] = len(candidate_rows)
+    
+    return counts
+
+
+async def main_async(args: argparse.Namespace) -> None:
+    start = time.perf_counter()
+    async with engine.begin() as conn:
+        await reset(conn)
+        if not args.reset:
+            counts = await seed(
+                conn,
+                users=args.users,
+                departments=args.departments,
+                requirements=args.requirements,
+                candidates=args.candidates,
+                approvals_per_requirement=args.approvals_per_requirement,
+                rng=random.Random(args.seed),
+            )
+            for table, count in counts.items():
+                print(f"{table:<16} {count:>9,}")
+    await engine.dispose()
+    
+    action = "Removed benchmark data" if args.reset else "Seeded"
+    print(f"{action} in {time.perf_counter() - start:.1f}s")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--users", type=int, default=200, help="Users to create (first one is admin)")
+    parser.add_argument("--departments", type=int, default=10, help="Departments to create")
+    parser.add_argument("--requirements", type=int, default=5000, help="Requirements to create")
+    parser.add_argument("--candidates", type=int, default=50000, help="Candidates to create")
+    parser.add_argument("--approvals-per-requirement", type=int, default=1,
+                        help="Pending approvals per submitted requirement")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed")
+    parser.add_argument("--reset", action="store_true", help="Only remove existing benchmark data")
+    args = parser.parse_args()
+    
+    if min(args.users, args.departments) < 1 or min(args.requirements, args.candidates) < 0:
+        parser.error("--users and --departments must be at least 1, other volumes not negative")
+    
+    asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+Access token verification micro-benchmark
+
+Compares verify_token throughput when every call does a full decode and
+signature check (cold: the verified token cache is flushed before each
+call) with repeated calls for the same token (warm: cache hits), the way
+an SPA reuses one access token for its whole lifetime.
+
+Needs only the settings environment (SECRET_KEY, DATABASE_URL), no
+database. Run from backend/:
+    python -m benchmarks.token_verification --iterations 50000
+"""
+import argparse
+import time
+from typing import Callable
+
+from app.core.security import create_access_token, decode_token, verified_tokens, verify_token
+
+
+def measure(call: Callable[[], object], iterations: int) -> float:
+    """
+    Time a call repeatedly
+    
+    Args:
+        call: Function to run
+        iterations: Number of calls
+        
+    Returns:
+        Calls per second
+    """
+    start = time.perf_counter()
+    for _ in range(iterations):
+        call()
+    elapsed = time.perf_counter() - start
+    return iterations / elapsed if elapsed else float("inf")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--iterations", type=int, default=20000, help="Calls per measurement")
+    args = parser.parse_args()
+    
+    token = create_access_token("00000000-0000-0000-0000-000000000001", family="benchmark")
+    assert verify_token(token) == decode_token(token)
+    
+    def cold() -> None:
+        verified_tokens.flush()
+        verify_token(token)
+    
+    results = {
+        "decode_token": measure(lambda: decode_token(token), args.iterations),
+        "verify_token (cold)": measure(cold, args.iterations),
+        "verify_token (warm)": measure(lambda: verify_token(token), args.iterations),
+    }
+    
+    baseline = results["verify_token (cold)"]
+    print(f"{'case':<22} {'calls/s':>12} {'us/call':>9} {'speedup':>8}")
+    for name, rate in results.items():
+        print(f"{name:<22} {rate:>12,.0f} {1e6 / rate:>9.2f} {rate / baseline:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
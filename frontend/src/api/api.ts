@@ -3,6 +3,8 @@ import { useAuthStore } from '../store/authStore';
 
 const api = axios.create({
   baseURL: import.meta.env.VITE_API_BASE_URL || 'http://localhost:8000',
+  // Send the API's read-your-writes cookie back (cross-origin)
+  withCredentials: true,
   headers: {
     'Content-Type': 'application/json',
   },
@@ -22,6 +24,26 @@ api.interceptors.request.use(
   }
 );
 
+// Refresh in progress, shared by every request that got a 401 meanwhile:
+// a refresh token works once, so concurrent refreshes must not each send it
+let refreshInFlight: Promise<string> | null = null;
+
+const refreshAccessToken = (refreshToken: string): Promise<string> => {
+  if (!refreshInFlight) {
+    refreshInFlight = axios
+      .post(`${api.defaults.baseURL}/api/v1/auth/refresh`, { refresh_token: refreshToken })
+      .then((response) => {
+        const { access_token, refresh_token } = response.data;
+        useAuthStore.getState().setAuth(access_token, refresh_token, null);
+        return access_token as string;
+      })
+      .finally(() => {
+        refreshInFlight = null;
+      });
+  }
+  return refreshInFlight;
+};
+
 // Response interceptor to handle token refresh
 api.interceptors.response.use(
   (response) => response,
@@ -33,20 +55,14 @@ api.interceptors.response.use(
       originalRequest._retry = true;
 
       try {
-        const { refreshToken, setAuth, clearAuth } = useAuthStore.getState();
+        const { refreshToken, clearAuth } = useAuthStore.getState();
         
         if (refreshToken) {
-          // Try to refresh the token
-          const response = await axios.post(
-            `${api.defaults.baseURL}/api/v1/auth/refresh`,
-            { refresh_token: refreshToken }
-          );
-
-          const { access_token, refresh_token } = response.data;
-          setAuth(access_token, refresh_token, null);
+          // Try to refresh the token (once for all concurrent 401s)
+          const accessToken = await refreshAccessToken(refreshToken);
 
           // Retry the original request with new token
-          originalRequest.headers.Authorization = `Bearer ${access_token}`;
+          originalRequest.headers.Authorization = `Bearer ${accessToken}`;
           return api(originalRequest);
         } else {
           // No refresh token, clear auth and redirect to login
@@ -5,6 +5,8 @@ const API_BASE_URL = import.meta.env.VITE_API_URL || 'http://localhost:8000';
 // Create axios instance
 export const api = axios.create({
   baseURL: API_BASE_URL,
+  // Send the API's read-your-writes cookie back (cross-origin)
+  withCredentials: true,
   headers: {
     'Content-Type': 'application/json',
   },
@@ -31,6 +33,37 @@ api.interceptors.request.use(
   (error) => Promise.reject(error)
 );
 
+// Refresh in progress, shared by every request that got a 401 meanwhile:
+// a refresh token works once, so concurrent refreshes must not each send it
+let refreshInFlight: Promise<string> | null = null;
+
+const refreshAccessToken = (refreshToken: string): Promise<string> => {
+  if (!refreshInFlight) {
+    refreshInFlight = axios
+      .post(`${API_BASE_URL}/api/v1/auth/refresh`, { refresh_token: refreshToken })
+      .then((response) => {
+        const { access_token, refresh_token: newRefreshToken } = response.data;
+
+        // Update Zustand storage
+        const authStorage = localStorage.getItem('auth-storage');
+        const updatedState = {
+          state: {
+            ...(authStorage ? JSON.parse(authStorage).state : {}),
+            accessToken: access_token,
+            refreshToken: newRefreshToken,
+          },
+          version: 0,
+        };
+        localStorage.setItem('auth-storage', JSON.stringify(updatedState));
+        return access_token as string;
+      })
+      .finally(() => {
+        refreshInFlight = null;
+      });
+  }
+  return refreshInFlight;
+};
+
 // Response interceptor to handle token refresh
 api.interceptors.response.use(
   (response) => response,
@@ -51,25 +84,10 @@ api.interceptors.response.use(
         }
         
         if (refreshToken) {
-          const response = await axios.post(`${API_BASE_URL}/api/v1/auth/refresh`, {
-            refresh_token: refreshToken,
-          });
-
-          const { access_token, refresh_token: newRefreshToken } = response.data;
-          
-          // Update Zustand storage
-          const updatedState = {
-            state: {
-              ...JSON.parse(authStorage).state,
-              accessToken: access_token,
-              refreshToken: newRefreshToken,
-            },
-            version: 0,
-          };
-          localStorage.setItem('auth-storage', JSON.stringify(updatedState));
+          const accessToken = await refreshAccessToken(refreshToken);
 
           // Retry original request with new token
-          originalRequest.headers.Authorization = `Bearer ${access_token}`;
+          originalRequest.headers.Authorization = `Bearer ${accessToken}`;
           return api(originalRequest);
         }
       } catch (refreshError) {
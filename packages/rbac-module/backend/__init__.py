@@ -18,6 +18,7 @@ __author__ = "Your Name"
 __license__ = "MIT"
 
 from .models import Role, Permission, UserRole, RolePermission
+from .bitmask import PermissionIndex, permission_index
 from .middleware import require_permission, require_role, require_any_permission
 from .utils import check_user_permission, check_user_role, get_user_permissions
 
@@ -26,6 +27,8 @@ __all__ = [
     "Permission",
     "UserRole",
     "RolePermission",
+    "PermissionIndex",
+    "permission_index",
     "require_permission",
     "require_role",
     "require_any_permission",
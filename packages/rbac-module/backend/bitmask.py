@@ -0,0 +1,186 @@
+"""
+Compiled Permission Bitmasks
+
+Every permission name gets a bit index, every role a bitmask of its
+permissions, and a user an effective mask (OR of their roles' masks).
+Permission checks are then single AND operations, and request handlers
+never touch role.permissions.
+
+Example:
+    from rbac_module.backend.bitmask import permission_index
+    
+    # At startup, with role.permissions eagerly loaded
+    await permission_index.compile_from_db(session, Role)
+    
+    # Later, e.g. after editing role permissions
+    permission_index.compile({"recruiter": ["view_candidates", "edit_candidates"]})
+"""
+
+from typing import Any, Iterable, Mapping
+
+ALL_PERMISSIONS = -1  # Every bit set; -1 & mask == mask for any mask
+
+_MASK_ATTR = "_rbac_permission_mask"
+
+
+class PermissionIndex:
+    """
+    Permission name to bit mapping and per-role masks
+    
+    Bit assignments only ever grow, so masks compiled by decorators at
+    import time stay valid when roles are recompiled later.
+    """
+    
+    def __init__(self, admin_role: str = "admin"):
+        self.admin_role = admin_role
+        self.version = 0
+        self._bits: dict[str, int] = {}
+        self._role_masks: dict[str, int] = {}
+    
+    def bit(self, permission: str) -> int:
+        """
+        Get the bit of a permission, assigning the next free one if new
+        
+        Args:
+            permission: Permission name
+            
+        Returns:
+            Single-bit mask
+        """
+        bit = self._bits.get(permission)
+        if bit is None:
+            bit = 1 << len(self._bits)
+            self._bits[permission] = bit
+        return bit
+    
+    def mask_of(self, permissions: Iterable[str]) -> int:
+        """
+        Combine permission names into one mask
+        
+        Args:
+            permissions: Permission names
+            
+        Returns:
+            Bitmask with a bit set per permission
+        """
+        mask = 0
+        for permission in permissions:
+            mask |= self.bit(permission)
+        return mask
+    
+    def names_of(self, mask: int) -> list[str]:
+        """
+        List the permission names set in a mask
+        
+        Args:
+            mask: Permission bitmask
+            
+        Returns:
+            Permission names, or ['*'] for the admin mask
+        """
+        if mask == ALL_PERMISSIONS:
+            return ['*']
+        return [name for name, bit in self._bits.items() if mask & bit]
+    
+    def compile(self, role_permissions: Mapping[str, Iterable[str]]) -> None:
+        """
+        Replace every role mask
+        
+        Args:
+            role_permissions: Permission names by role name
+        """
+        self._role_masks = {
+            role: self.mask_of(permissions)
+            for role, permissions in role_permissions.items()
+        }
+        self.version += 1
+    
+    async def compile_from_db(self, session: Any, role_model: Any) -> None:
+        """
+        Compile role masks from the database in one query
+        
+        Args:
+            session: SQLAlchemy AsyncSession
+            role_model: Role model with a `permissions` relationship
+        """
+        from sqlalchemy import select
+        from sqlalchemy.orm import selectinload
+        
+        result = await session.execute(
+            select(role_model).options(selectinload(role_model.permissions))
+        )
+        roles = result.scalars().all()
+        self.compile({
+            role.name: [perm.name for perm in role.permissions]
+            for role in roles
+        })
+    
+    def role_mask(self, role: Any) -> int:
+        """
+        Get the mask of a role (name or role object)
+        
+        Roles missing from the index are compiled from role.permissions the
+        first time they are seen, so an index that was never compiled still
+        works, at the cost of one read per role per process.
+        
+        Args:
+            role: Role name or object with `name` (and `permissions`)
+            
+        Returns:
+            Role bitmask
+        """
+        name = role if isinstance(role, str) else role.name
+        if name == self.admin_role:
+            return ALL_PERMISSIONS
+        
+        mask = self._role_masks.get(name)
+        if mask is None:
+            permissions = getattr(role, 'permissions', None) or []
+            mask = self.mask_of(perm.name for perm in permissions)
+            if not isinstance(role, str):
+                self._role_masks[name] = mask
+        return mask
+    
+    def user_mask(self, user: Any) -> int:
+        """
+        Get a user's effective mask, computed once per user object
+        
+        The mask is memoized on the user instance (which lives for one
+        request) and recomputed if the index has been recompiled since.
+        
+        Args:
+            user: User object with roles attribute (role objects or names)
+            
+        Returns:
+            Effective permission bitmask, 0 for no user
+        """
+        if not user or not hasattr(user, 'roles'):
+            return 0
+        
+        cached = getattr(user, _MASK_ATTR, None)
+        if cached is not None and cached[0] == self.version:
+            return cached[1]
+        
+        mask = 0
+        for role in user.roles:
+            mask |= self.role_mask(role)
+            if mask == ALL_PERMISSIONS:
+                break
+        
+        try:
+            setattr(user, _MASK_ATTR, (self.version, mask))
+        except (AttributeError, TypeError):
+            pass  # Immutable user snapshots are simply not memoized
+        return mask
+    
+    def has_any(self, user: Any, required: int) -> bool:
+        """Check that a user holds at least one permission of a mask"""
+        return bool(self.user_mask(user) & required)
+    
+    def has_all(self, user: Any, required: int) -> bool:
+        """Check that a user holds every permission of a mask"""
+        return self.user_mask(user) & required == required
+
+
+# Process-wide index used by utils and middleware
+permission_index = PermissionIndex()
@@ -18,7 +18,8 @@ Example:
 from functools import wraps
 from typing import List, Callable
 from fastapi import HTTPException, status
-from .utils import check_user_permission, check_user_role
+from .bitmask import permission_index
+from .utils import check_user_role
 
 
 def require_permission(permission: str):
@@ -34,6 +35,8 @@ def require_permission(permission: str):
         async def create_resource(current_user: User = Depends(get_current_user)):
             return resource
     """
+    required = permission_index.bit(permission)
+    
     def decorator(func: Callable):
         @wraps(func)
         async def wrapper(*args, **kwargs):
@@ -46,7 +49,7 @@ def require_permission(permission: str):
                     detail="Authentication required"
                 )
             
-            if not check_user_permission(current_user, permission):
+            if not permission_index.has_all(current_user, required):
                 raise HTTPException(
                     status_code=status.HTTP_403_FORBIDDEN,
                     detail=f"Permission denied: {permission} required"
@@ -105,6 +108,8 @@ def require_any_permission(permissions: List[str]):
         async def update_resource(id: str, current_user: User = Depends(get_current_user)):
             return updated_resource
     """
+    required = permission_index.mask_of(permissions)
+    
     def decorator(func: Callable):
         @wraps(func)
         async def wrapper(*args, **kwargs):
@@ -116,12 +121,7 @@ def require_any_permission(permissions: List[str]):
                     detail="Authentication required"
                 )
             
-            has_permission = any(
-                check_user_permission(current_user, perm) 
-                for perm in permissions
-            )
-            
-            if not has_permission:
+            if not permission_index.has_any(current_user, required):
                 raise HTTPException(
                     status_code=status.HTTP_403_FORBIDDEN,
                     detail=f"One of these permissions required: {', '.join(permissions)}"
@@ -145,6 +145,8 @@ def require_all_permissions(permissions: List[str]):
         async def delete_critical(current_user: User = Depends(get_current_user)):
             return {"deleted": True}
     """
+    required = permission_index.mask_of(permissions)
+    
     def decorator(func: Callable):
         @wraps(func)
         async def wrapper(*args, **kwargs):
@@ -156,12 +158,7 @@ def require_all_permissions(permissions: List[str]):
                     detail="Authentication required"
                 )
             
-            has_all = all(
-                check_user_permission(current_user, perm) 
-                for perm in permissions
-            )
-            
-            if not has_all:
+            if not permission_index.has_all(current_user, required):
                 raise HTTPException(
                     status_code=status.HTTP_403_FORBIDDEN,
                     detail=f"All of these permissions required: {', '.join(permissions)}"
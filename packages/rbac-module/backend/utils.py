@@ -15,6 +15,8 @@ Example:
 
 from typing import List, Optional
 
+from .bitmask import permission_index
+
 
 def check_user_permission(user, permission: str) -> bool:
     """
@@ -34,18 +36,13 @@ def check_user_permission(user, permission: str) -> bool:
     if not user or not hasattr(user, 'roles'):
         return False
     
-    # Check if user has admin role (admin has all permissions)
-    if check_user_role(user, 'admin'):
-        return True
-    
-    # Check each role for the permission
-    for role in user.roles:
-        if hasattr(role, 'permissions'):
-            for perm in role.permissions:
-                if perm.name == permission:
-                    return True
-    
-    return False
+    # Admin's mask has every bit set, so no separate role check is needed
+    return permission_index.has_all(user, permission_index.bit(permission))
+
+
+def _role_names(user) -> set:
+    """Role names of a user whose roles are role objects or plain names"""
+    return {role if isinstance(role, str) else role.name for role in user.roles}
 
 
 def check_user_role(user, role_name: str) -> bool:
@@ -67,7 +64,7 @@ def check_user_role(user, role_name: str) -> bool:
     if not user or not hasattr(user, 'roles'):
         return False
     
-    return any(role.name == role_name for role in user.roles)
+    return role_name in _role_names(user)
 
 
 def check_any_role(user, role_names: List[str]) -> bool:
@@ -84,7 +81,7 @@ def check_any_role(user, role_names: List[str]) -> bool:
     if not user or not hasattr(user, 'roles'):
         return False
     
-    return any(check_user_role(user, role) for role in role_names)
+    return not _role_names(user).isdisjoint(role_names)
 
 
 def check_all_roles(user, role_names: List[str]) -> bool:
@@ -101,7 +98,7 @@ def check_all_roles(user, role_names: List[str]) -> bool:
     if not user or not hasattr(user, 'roles'):
         return False
     
-    return all(check_user_role(user, role) for role in role_names)
+    return _role_names(user).issuperset(role_names)
 
 
 def get_user_permissions(user) -> List[str]:
@@ -121,17 +118,8 @@ def get_user_permissions(user) -> List[str]:
     if not user or not hasattr(user, 'roles'):
         return []
     
-    # Admin has all permissions
-    if check_user_role(user, 'admin'):
-        return ['*']  # Wildcard represents all permissions
-    
-    permissions = set()
-    for role in user.roles:
-        if hasattr(role, 'permissions'):
-            for perm in role.permissions:
-                permissions.add(perm.name)
-    
-    return list(permissions)
+    # Admin has all permissions ('*' wildcard)
+    return permission_index.names_of(permission_index.user_mask(user))
 
 
 def get_user_roles(user) -> List[str]:
@@ -147,7 +135,7 @@ def get_user_roles(user) -> List[str]:
     if not user or not hasattr(user, 'roles'):
         return []
     
-    return [role.name for role in user.roles]
+    return list(_role_names(user))
 
 
 def has_resource_access(user, resource, action: str = 'read') -> bool: